@@ -0,0 +1,136 @@
+"""Cold-start benchmark: from `docker run` to the first successful search.
+
+scripts/start_docker_marqo.sh only waits until `curl localhost:8882` mentions Marqo. This benchmark starts the
+Marqo container the same way (same ports and environment) and records, relative to invoking `docker run`:
+- container_started_s: `docker run` returned, i.e. the container is running
+- http_listening_s: GET / answers with the Marqo welcome message
+- index_created_s: an index with --model was created (indexes do not survive the container), retrying until the
+  backend accepts it
+- health_green_s: index.health() reports status green
+- first_embed_s: the first embed call returned, which loads the model unless it was preloaded
+- first_search_s: the first search returned
+
+Each phase is measured with and without the model in MARQO_MODELS_TO_PRELOAD ("[]" disables Marqo's default
+preloads), which shows how much of the scale-out latency preloading moves before the instance takes traffic.
+Needs docker and MARQO_IMAGE_NAME; the container is restarted with the default configuration at the end.
+
+Example:
+    python -m benchmarks.cold_start --model hf/e5-base-v2 --repeats 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+from marqo.errors import MarqoWebError
+
+from benchmarks import common
+from tests import utilities
+from tests.marqo_test import MarqoTestCase
+
+CONTAINER_NAME = "marqo"
+# The environment scripts/start_docker_marqo.sh starts Marqo with
+BASE_ENV_VARS = {"MARQO_ENABLE_BATCH_APIS": "TRUE", "MARQO_MAX_CPU_MODEL_MEMORY": "1.6"}
+PHASES = ["container_started_s", "http_listening_s", "index_created_s", "health_green_s", "first_embed_s",
+          "first_search_s"]
+
+
+def wait_until(condition: Callable[[], bool], timeout_s: float, poll_interval_s: float = 0.05) -> None:
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        try:
+            if condition():
+                return
+        except Exception:
+            # Marqo and its Vespa backend refuse requests until they are up
+            pass
+        time.sleep(poll_interval_s)
+    raise TimeoutError(f"Condition not met within {timeout_s}s")
+
+
+def start_container(image: str, env_vars: Dict[str, str]) -> None:
+    subprocess.run(["docker", "rm", "-f", CONTAINER_NAME], capture_output=True)
+    docker_args = [arg for name, value in {**BASE_ENV_VARS, **env_vars}.items() for arg in ("-e", f"{name}={value}")]
+    subprocess.run(
+        ["docker", "run", "-d", "--name", CONTAINER_NAME, "-p", "8882:8882",
+         "--add-host", "host.docker.internal:host-gateway"] + docker_args + [image],
+        check=True, capture_output=True
+    )
+
+
+def is_listening() -> bool:
+    return "Marqo" in requests.get(MarqoTestCase._MARQO_URL, timeout=1).text
+
+
+def measure_cold_start(image: str, model: str, preload: Optional[List[str]], timeout_s: float) -> Dict[str, float]:
+    env_vars = {"MARQO_MODELS_TO_PRELOAD": json.dumps(preload)} if preload is not None else {}
+    client = common.get_client()
+    index_name = "cold_start_index"
+    timestamps = {}
+
+    start = time.perf_counter()
+    start_container(image, env_vars)
+    timestamps["container_started_s"] = time.perf_counter() - start
+
+    wait_until(is_listening, timeout_s)
+    timestamps["http_listening_s"] = time.perf_counter() - start
+
+    def create_index() -> bool:
+        try:
+            MarqoTestCase.create_indexes([{"indexName": index_name, "type": "unstructured", "model": model}])
+        except MarqoWebError:
+            # An attempt that timed out on our side can still create the index, making every retry fail with
+            # "index already exists"
+            if index_name not in [index["indexName"] for index in client.get_indexes()["results"]]:
+                raise
+        return True
+
+    wait_until(create_index, timeout_s)
+    timestamps["index_created_s"] = time.perf_counter() - start
+
+    wait_until(lambda: client.index(index_name).health().get("status") == "green", timeout_s)
+    timestamps["health_green_s"] = time.perf_counter() - start
+
+    client.index(index_name).embed(content="cold start")
+    timestamps["first_embed_s"] = time.perf_counter() - start
+
+    client.index(index_name).search(q="cold start")
+    timestamps["first_search_s"] = time.perf_counter() - start
+    return timestamps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="hf/e5-base-v2")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout-s", type=float, default=600, help="timeout for each phase")
+    args = parser.parse_args()
+
+    image = os.environ["MARQO_IMAGE_NAME"]
+    variants = {"no_preload": [], "preload": [args.model]}
+    results = []
+    try:
+        for variant, preload in variants.items():
+            runs = []
+            for repeat in range(args.repeats):
+                timestamps = measure_cold_start(image, args.model, preload, args.timeout_s)
+                print({"variant": variant, "repeat": repeat, **timestamps})
+                runs.append(timestamps)
+            row = {"variant": variant, "models_to_preload": json.dumps(preload)}
+            for phase in PHASES:
+                row[f"{phase}_p50"] = utilities.percentile([run[phase] for run in runs], 50)
+                row[f"{phase}_max"] = max(run[phase] for run in runs)
+            row["runs"] = runs
+            results.append(row)
+    finally:
+        common.restart_marqo({})
+
+    common.print_results(results, ["variant"] + [f"{phase}_p50" for phase in PHASES])
+    print(f"Results written to {common.write_results('cold_start', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
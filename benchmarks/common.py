@@ -0,0 +1,169 @@
+"""Helpers shared by the benchmarks in this package.
+
+Benchmarks are run as modules from the root of this repo against a running Marqo instance, e.g.:
+
+    python -m benchmarks.ingest --help
+
+Results are written as JSON and CSV to the directory in the MARQO_BENCHMARK_RESULTS_DIR environment variable
+(`benchmark_results` by default), tagged with the Marqo image under test (MARQO_IMAGE_NAME) and the testing
+configuration (TESTING_CONFIGURATION) so runs against different images can be compared.
+"""
+import csv
+import datetime
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+from marqo import Client
+
+from tests import utilities
+from tests.marqo_test import MarqoTestCase
+
+RESULTS_DIR_ENV_VAR = "MARQO_BENCHMARK_RESULTS_DIR"
+DEFAULT_RESULTS_DIR = "benchmark_results"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Marqo environment variables the start scripts set themselves, and take overrides for from their environment
+START_SCRIPT_ENV_VARS = {"MARQO_MAX_CPU_MODEL_MEMORY", "MARQO_MAX_CUDA_MODEL_MEMORY"}
+DEFAULT_START_TIMEOUT_S = 600
+
+
+def get_client(**kwargs) -> Client:
+    return Client(url=MarqoTestCase._MARQO_URL, **kwargs)
+
+
+def restart_marqo(env_vars: Dict[str, str], docker_args: Sequence[str] = (),
+                  timeout_s: float = DEFAULT_START_TIMEOUT_S) -> None:
+    """Restarts the `marqo` docker container from MARQO_IMAGE_NAME with the given Marqo environment variables and
+    extra `docker run` arguments (e.g. ["--cpus", "2"]), using the start script of TESTING_CONFIGURATION (see
+    utilities.START_SCRIPTS), and waits until it answers. Under CPU_LOCAL_MARQO the running Vespa is kept.
+
+    Raises subprocess.CalledProcessError if Marqo does not answer within timeout_s, and
+    subprocess.TimeoutExpired if the script itself hangs.
+
+    Only for benchmarks that sweep server settings: unlike utilities.rerun_marqo_with_env_vars it replaces the
+    default container, so never call it from the test suite.
+    """
+    test_config = os.environ.get("TESTING_CONFIGURATION")
+    if test_config not in utilities.START_SCRIPTS:
+        raise RuntimeError(f"Cannot restart Marqo with TESTING_CONFIGURATION={test_config}. "
+                           f"Must be one of {tuple(utilities.START_SCRIPTS)}")
+    script_env = {**os.environ, "MARQO_REUSE_VESPA": "true", "MARQO_START_TIMEOUT": str(int(timeout_s))}
+    env_args = []
+    for name, value in env_vars.items():
+        if name in START_SCRIPT_ENV_VARS:
+            # Passing `-e` as well would leave two values for the variable in the `docker run` command
+            script_env[name] = value
+        else:
+            env_args += ["-e", f"{name}={value}"]
+    subprocess.run(
+        ["bash", os.path.join(REPO_ROOT, "scripts", utilities.START_SCRIPTS[test_config]),
+         os.environ["MARQO_IMAGE_NAME"]] + list(docker_args) + env_args,
+        # The script only bounds the wait for Marqo to answer; this also covers removing the old container and
+        # pulling the image
+        check=True, cwd=REPO_ROOT, env=script_env, timeout=2 * timeout_s
+    )
+
+
+def run_metadata() -> Dict[str, Any]:
+    return {
+        "marqo_image_name": os.environ.get("MARQO_IMAGE_NAME"),
+        "testing_configuration": os.environ.get("TESTING_CONFIGURATION"),
+        "marqo_url": MarqoTestCase._MARQO_URL,
+        "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def int_list(value: str) -> List[int]:
+    """Parses a comma separated argparse value such as `1,8,64` into a list of ints."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def float_list(value: str) -> List[float]:
+    """Parses a comma separated argparse value such as `0,0.1` into a list of floats."""
+    return [float(item) for item in value.split(",") if item]
+
+
+def str_list(value: str) -> List[str]:
+    """Parses a comma separated argparse value into a list of strings."""
+    return [item for item in value.split(",") if item]
+
+
+def run_closed_loop(operation: Callable[[int], Any], num_requests: int, concurrency: int) -> Dict[str, float]:
+    """Calls operation(0..num_requests-1) from `concurrency` threads, each thread sending its next request as soon as
+    the previous one returns.
+
+    Closed-loop load hides queueing delay, so use it for throughput and service time, and the open-loop generator
+    in benchmarks.load_generator for tail latency under a given arrival rate.
+
+    Returns:
+        requests/sec, the error rate and the latency summary of the successful requests
+    """
+    def timed(i: int):
+        start = time.perf_counter()
+        try:
+            operation(i)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(timed, range(num_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, error in outcomes if error is None]
+    errors = [error for _, error in outcomes if error is not None]
+    if errors:
+        print(f"{len(errors)}/{num_requests} requests failed, first error: {errors[0]}")
+    result = {
+        "requests_per_sec": len(latencies) / elapsed,
+        "error_rate": len(errors) / num_requests if num_requests else 0.0,
+    }
+    result.update(utilities.summarise_latencies(latencies))
+    return result
+
+
+def write_results(benchmark_name: str, parameters: Dict[str, Any], results: List[Dict[str, Any]]) -> str:
+    """Writes the results of a benchmark run as JSON (with run metadata and parameters) and as CSV.
+
+    Returns:
+        The path of the JSON file. The CSV file has the same path with a `.csv` extension.
+    """
+    results_dir = os.environ.get(RESULTS_DIR_ENV_VAR, DEFAULT_RESULTS_DIR)
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    json_path = os.path.join(results_dir, f"{benchmark_name}_{timestamp}.json")
+
+    with open(json_path, "w") as f:
+        json.dump({
+            "benchmark": benchmark_name,
+            "metadata": run_metadata(),
+            "parameters": parameters,
+            "results": results,
+        }, f, indent=2)
+
+    # Nested values such as serialised histograms are only kept in the JSON file
+    columns = []
+    for row in results:
+        columns.extend(column for column, value in row.items()
+                       if column not in columns and not isinstance(value, (dict, list)))
+    with open(os.path.splitext(json_path)[0] + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    return json_path
+
+
+def print_results(results: List[Dict[str, Any]], columns: Sequence[str]) -> None:
+    """Prints the given columns of the results as a plain text table."""
+    def fmt(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    rows = [[fmt(row.get(column, "")) for column in columns] for row in results]
+    widths = [max([len(column)] + [len(row[i]) for row in rows]) for i, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,124 @@
+"""A mergeable latency histogram in the style of HdrHistogram.
+
+Values are recorded in integer microseconds into log-linear buckets: values below 2**precision_bits are recorded
+exactly, larger values into buckets whose width is at most 1/2**(precision_bits - 1) of their value, so with the
+default precision_bits=8 every reported percentile is within ~0.8% of the true value. Buckets are stored sparsely,
+which makes histograms cheap to serialise and to merge across threads, processes and benchmark runs.
+"""
+import math
+from typing import Dict, Optional
+
+
+class LatencyHistogram:
+
+    def __init__(self, precision_bits: int = 8):
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+        self.precision_bits = precision_bits
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+        self._sum_us = 0
+
+    def _bucket_index(self, value_us: int) -> int:
+        if value_us < (1 << self.precision_bits):
+            return value_us
+        shift = value_us.bit_length() - self.precision_bits
+        half = 1 << (self.precision_bits - 1)
+        return (1 << self.precision_bits) + (shift - 1) * half + ((value_us >> shift) - half)
+
+    def _bucket_bounds(self, index: int):
+        """Returns the lowest and highest microsecond value that fall into the bucket."""
+        if index < (1 << self.precision_bits):
+            return index, index
+        half = 1 << (self.precision_bits - 1)
+        offset = index - (1 << self.precision_bits)
+        shift = offset // half + 1
+        mantissa = offset % half + half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value_s: float, count: int = 1) -> None:
+        """Records a latency in seconds."""
+        value_us = max(0, int(round(value_s * 1_000_000)))
+        index = self._bucket_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self._sum_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = value_us if self.max_us is None else max(self.max_us, value_us)
+
+    def record_corrected(self, value_s: float, expected_interval_s: float) -> None:
+        """Records a latency measured by a closed-loop client, back-filling the requests that a client sending every
+        expected_interval_s would have had to wait behind it (coordinated omission correction).
+
+        Open-loop measurements taken from the intended send time are already corrected and should use record().
+        """
+        self.record(value_s)
+        if expected_interval_s <= 0:
+            return
+        missing = value_s - expected_interval_s
+        while missing >= expected_interval_s:
+            self.record(missing)
+            missing -= expected_interval_s
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision_bits")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._sum_us += other._sum_us
+        for value in (other.min_us, other.max_us):
+            if value is not None:
+                self.min_us = value if self.min_us is None else min(self.min_us, value)
+                self.max_us = value if self.max_us is None else max(self.max_us, value)
+        return self
+
+    def percentile(self, q: float) -> float:
+        """Returns the q-th percentile (0 <= q <= 100) in seconds, or NaN if nothing was recorded."""
+        if not self.total_count:
+            return float("nan")
+        target = max(1, math.ceil(q / 100 * self.total_count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                low, high = self._bucket_bounds(index)
+                value_us = min(max((low + high) / 2, self.min_us), self.max_us)
+                return value_us / 1_000_000
+        return self.max_us / 1_000_000
+
+    def mean(self) -> float:
+        return self._sum_us / self.total_count / 1_000_000 if self.total_count else float("nan")
+
+    def summary(self) -> Dict[str, float]:
+        """Summarises the histogram like tests.utilities.summarise_latencies, plus p99.9 and max."""
+        return {
+            "count": self.total_count,
+            "mean_ms": 1000 * self.mean(),
+            "p50_ms": 1000 * self.percentile(50),
+            "p95_ms": 1000 * self.percentile(95),
+            "p99_ms": 1000 * self.percentile(99),
+            "p99_9_ms": 1000 * self.percentile(99.9),
+            "max_ms": self.max_us / 1000 if self.max_us is not None else float("nan"),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "precision_bits": self.precision_bits,
+            "counts": {str(index): count for index, count in sorted(self.counts.items())},
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "sum_us": self._sum_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(precision_bits=data["precision_bits"])
+        histogram.counts = {int(index): count for index, count in data["counts"].items()}
+        histogram.total_count = sum(histogram.counts.values())
+        histogram.min_us = data["min_us"]
+        histogram.max_us = data["max_us"]
+        histogram._sum_us = data["sum_us"]
+        return histogram
@@ -0,0 +1,199 @@
+"""Inference cache effectiveness benchmark.
+
+TestEnvVarChanges.test_multiple_env_vars only checks that a repeated query is served from the inference cache
+with MARQO_INFERENCE_CACHE_SIZE=10. Here streams of queries with controllable repetition are replayed against
+Marqo restarted with different cache sizes:
+- --unique-ratios: distinct queries available to the stream, as a fraction of its length
+- --zipf-exponents: skew of how often each distinct query is asked (0 is uniform, ~1 is typical search traffic)
+- --weighted-fractions: fraction of queries sent as a weighted `q` dict of --terms-per-dict queries, each of
+  which is embedded and cached separately
+
+For every cache size and stream it reports the measured hit rate (queries whose
+search.vector_inference_full_pipeline time is below --hit-threshold-ms, i.e. every term was served from the
+cache), the hit rates an LRU cache of that size would have (per query and per term) as a cross-check, p50/p99 of
+the inference pipeline time and of the end-to-end latency, and both p50s relative to the stream without a cache
+(size 0). Marqo is restarted for every point, so each stream starts with an empty cache, and restarted with the
+default configuration at the end. Needs docker and MARQO_IMAGE_NAME.
+
+Example:
+    python -m benchmarks.inference_cache --cache-sizes 0,100,1000 --zipf-exponents 0,1.1 --unique-ratios 0.1,0.5
+"""
+import argparse
+import itertools
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from benchmarks import common
+from tests import utilities
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool
+
+PIPELINE_TIMER = "search.vector_inference_full_pipeline"
+Query = Union[str, Dict[str, float]]
+
+
+def query_pool(corpus: Corpus, size: int) -> List[str]:
+    """Returns `size` distinct text queries."""
+    pool, seen, start = [], set(), 0
+    while len(pool) < size:
+        for query in corpus.queries(size, words_per_query=(2, 6), start=start):
+            if query not in seen and len(pool) < size:
+                seen.add(query)
+                pool.append(query)
+        start += size
+    return pool
+
+
+def query_stream(corpus: Corpus, num_queries: int, unique_ratio: float, zipf_exponent: float,
+                 weighted_fraction: float, terms_per_dict: int, seed: int) -> List[Query]:
+    """Returns num_queries queries drawn with Zipfian popularity from a pool of unique_ratio * num_queries
+    distinct queries. A weighted_fraction of them are dicts of terms_per_dict distinct pool queries with weights."""
+    pool = query_pool(corpus, max(1, round(unique_ratio * num_queries)))
+    ranks = np.arange(1, len(pool) + 1, dtype=np.float64)
+    weights = ranks ** -zipf_exponent
+    probabilities = weights / weights.sum()
+    rng = np.random.default_rng(seed)
+
+    def draw(count: int) -> List[str]:
+        # Without replacement, so a dict query has count distinct terms (at most one per pool query)
+        return [pool[i] for i in rng.choice(len(pool), size=min(count, len(pool)), replace=False, p=probabilities)]
+
+    stream = []
+    for _ in range(num_queries):
+        if rng.random() < weighted_fraction:
+            stream.append({term: round(float(rng.uniform(0.1, 1.0)), 2) for term in draw(terms_per_dict)})
+        else:
+            stream.append(draw(1)[0])
+    return stream
+
+
+def cache_keys(query: Query) -> List[str]:
+    """The texts Marqo embeds, and caches, for a query."""
+    return list(query) if isinstance(query, dict) else [query]
+
+
+def simulate_lru(stream: List[Query], cache_size: int) -> Dict[str, float]:
+    """Replays the stream against an LRU cache of cache_size entries.
+
+    Returns:
+        the fraction of queries with every term cached, the fraction of term lookups that hit, and the fraction of
+        term lookups that are for distinct terms
+    """
+    cache = OrderedDict()
+    query_hits, term_hits, lookups = 0, 0, 0
+    for query in stream:
+        keys = cache_keys(query)
+        hits = 0
+        for key in keys:
+            lookups += 1
+            if key in cache:
+                hits += 1
+                cache.move_to_end(key)
+            elif cache_size > 0:
+                cache[key] = True
+                if len(cache) > cache_size:
+                    cache.popitem(last=False)
+        term_hits += hits
+        query_hits += hits == len(keys)
+    distinct = len({key for query in stream for key in cache_keys(query)})
+    return {
+        "simulated_query_hit_rate": query_hits / len(stream),
+        "simulated_term_hit_rate": term_hits / lookups,
+        "distinct_term_fraction": distinct / lookups,
+    }
+
+
+def replay(client, index_name: str, stream: List[Query]) -> Tuple[List[float], List[float]]:
+    """Sends the stream one query at a time, so the cache sees it in order.
+
+    Returns:
+        the inference pipeline times and the end-to-end latencies, in seconds
+    """
+    pipeline_times, latencies = [], []
+    for query in stream:
+        start = time.perf_counter()
+        res = client.index(index_name).search(q=query)
+        latencies.append(time.perf_counter() - start)
+        pipeline_times.append(res["telemetry"]["timesMs"][PIPELINE_TIMER] / 1000)
+    return pipeline_times, latencies
+
+
+def load_index(pool: IndexPool, model: str, corpus: Corpus, num_docs: int) -> str:
+    """Leases an index with model from pool, adds the corpus to it and loads the model. Returns the index name."""
+    index_name, = pool.lease("inference_cache", [{"type": "unstructured", "model": model}])
+    client = common.get_client()
+    for batch in corpus.batches(num_docs, 64):
+        client.index(index_name).add_documents(batch, tensor_fields=["text"])
+    # Load the model with a query that is not part of any stream
+    client.index(index_name).search(q="inference cache warm up")
+    return index_name
+
+
+def add_relative_to_no_cache(results: List[Dict]) -> None:
+    stream_columns = ("unique_ratio", "zipf_exponent", "weighted_fraction")
+    baselines = {tuple(row[column] for column in stream_columns): row for row in results if row["cache_size"] == 0}
+    for row in results:
+        baseline = baselines.get(tuple(row[column] for column in stream_columns))
+        if baseline:
+            row["pipeline_p50_vs_no_cache"] = row["pipeline_p50_ms"] / baseline["pipeline_p50_ms"]
+            row["p50_vs_no_cache"] = row["p50_ms"] / baseline["p50_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cache-sizes", type=common.int_list, default=[0, 10, 100, 1000])
+    parser.add_argument("--unique-ratios", type=common.float_list, default=[0.05, 0.2, 0.5])
+    parser.add_argument("--zipf-exponents", type=common.float_list, default=[0.0, 1.1])
+    parser.add_argument("--weighted-fractions", type=common.float_list, default=[0.0, 0.3])
+    parser.add_argument("--terms-per-dict", type=int, default=2)
+    parser.add_argument("--num-queries", type=int, default=1000, help="queries per stream")
+    parser.add_argument("--num-docs", type=int, default=500)
+    parser.add_argument("--hit-threshold-ms", type=float, default=5.0,
+                        help="inference pipeline times below this count as cache hits")
+    parser.add_argument("--model", default="hf/e5-base-v2")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    corpus = Corpus({"text": "text"}, seed=args.seed)
+    client = common.get_client(return_telemetry=True)
+    results = []
+    try:
+        for cache_size, unique_ratio, zipf_exponent, weighted_fraction in itertools.product(
+                args.cache_sizes, args.unique_ratios, args.zipf_exponents, args.weighted_fractions):
+            stream = query_stream(corpus, args.num_queries, unique_ratio, zipf_exponent, weighted_fraction,
+                                  args.terms_per_dict, args.seed)
+            common.restart_marqo({"MARQO_INFERENCE_CACHE_SIZE": str(cache_size), "MARQO_MODELS_TO_PRELOAD": "[]"})
+            # Under CPU_LOCAL_MARQO the restarted Marqo reuses the Vespa, and with it the indexes, of the last one,
+            # so every point deletes the index it created
+            pool = IndexPool()
+            try:
+                index_name = load_index(pool, args.model, corpus, args.num_docs)
+                pipeline_times, latencies = replay(client, index_name, stream)
+            finally:
+                pool.delete_all()
+
+            row = {"cache_size": cache_size, "unique_ratio": unique_ratio, "zipf_exponent": zipf_exponent,
+                   "weighted_fraction": weighted_fraction,
+                   "measured_hit_rate": sum(1 for t in pipeline_times
+                                            if 1000 * t < args.hit_threshold_ms) / len(pipeline_times)}
+            row.update(simulate_lru(stream, cache_size))
+            row.update({f"pipeline_{key}": value for key, value in utilities.summarise_latencies(pipeline_times).items()
+                        if key != "count"})
+            row.update(utilities.summarise_latencies(latencies))
+            print(row)
+            results.append(row)
+    finally:
+        common.restart_marqo({})
+
+    add_relative_to_no_cache(results)
+    common.print_results(results, ["cache_size", "unique_ratio", "zipf_exponent", "weighted_fraction",
+                                   "measured_hit_rate", "simulated_query_hit_rate", "pipeline_p50_ms", "p50_ms",
+                                   "p99_ms", "p50_vs_no_cache"])
+    print(f"Results written to {common.write_results('inference_cache', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Ingestion throughput benchmark for add_documents.
+
+Builds on the `significant_ingestion` pattern in tests/application_tests/test_asynchronous.py: documents from the
+seeded synthetic corpus (tests/corpus.py) are added to structured and unstructured indexes, here while sweeping:
+- client_batch_size (0 disables client side batching)
+- the number of concurrent client threads
+- the number of documents per add_documents call
+- the number of words per text field
+- the number of tensor fields
+
+For every point it reports docs/sec, p50/p95/p99 latency of the add_documents calls and the document error rate.
+Documents are generated as they are sent, so --num-docs can be in the millions without holding them in memory.
+
+Example:
+    python -m benchmarks.ingest --index-types structured,unstructured --threads 1,4 --client-batch-sizes 0,16
+"""
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from benchmarks import common
+from tests import utilities
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool, MarqoTestCase
+
+
+def index_settings(index_type: str, num_tensor_fields: int, model: str) -> Dict:
+    if index_type == "structured":
+        return {
+            "type": "structured",
+            "model": model,
+            "allFields": [{"name": f"text_field_{i}", "type": "text"} for i in range(num_tensor_fields)],
+            "tensorFields": [f"text_field_{i}" for i in range(num_tensor_fields)],
+        }
+    return {"type": "unstructured", "model": model}
+
+
+def build_corpus(num_tensor_fields: int, text_length: int, seed: int) -> Corpus:
+    return Corpus({f"text_field_{i}": "text" for i in range(num_tensor_fields)}, seed=seed,
+                  text_length=(text_length, text_length))
+
+
+def count_errors(add_docs_response) -> Tuple[int, int]:
+    """Returns (number of failed documents, number of documents) of an add_documents response,
+    which is a list of responses when client side batching is used."""
+    responses = add_docs_response if isinstance(add_docs_response, list) else [add_docs_response]
+    items = [item for response in responses for item in response.get("items", [])]
+    return sum(1 for item in items if item.get("status", 200) >= 400), len(items)
+
+
+def run_point(client, index_name: str, index_type: str, batches: Iterator[List[Dict]],
+              client_batch_size: Optional[int], num_threads: int, num_tensor_fields: int) -> Dict:
+    tensor_fields = [f"text_field_{i}" for i in range(num_tensor_fields)] if index_type == "unstructured" else None
+    # Threads pull the next batch from the shared generator, so only num_threads batches exist at any time
+    batches_lock = threading.Lock()
+
+    def add_batch(batch: List[Dict]) -> Tuple[float, int, int]:
+        start = time.perf_counter()
+        try:
+            res = client.index(index_name).add_documents(
+                documents=batch, client_batch_size=client_batch_size, tensor_fields=tensor_fields
+            )
+            failed, total = count_errors(res)
+        except Exception as e:
+            print(f"add_documents call failed: {e}")
+            failed, total = len(batch), len(batch)
+        return time.perf_counter() - start, failed, total
+
+    def worker() -> List[Tuple[float, int, int]]:
+        worker_outcomes = []
+        while True:
+            with batches_lock:
+                batch = next(batches, None)
+            if batch is None:
+                return worker_outcomes
+            worker_outcomes.append(add_batch(batch))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = [executor.submit(worker) for _ in range(num_threads)]
+        outcomes = [outcome for future in futures for outcome in future.result()]
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _, _ in outcomes]
+    failed_docs = sum(failed for _, failed, _ in outcomes)
+    total_docs = sum(total for _, _, total in outcomes)
+    summary = utilities.summarise_latencies(latencies)
+    return {
+        "total_s": elapsed,
+        "docs_per_sec": (total_docs - failed_docs) / elapsed,
+        "batch_p50_ms": summary["p50_ms"],
+        "batch_p95_ms": summary["p95_ms"],
+        "batch_p99_ms": summary["p99_ms"],
+        "error_rate": failed_docs / total_docs if total_docs else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-types", type=common.str_list, default=["structured", "unstructured"])
+    parser.add_argument("--client-batch-sizes", type=common.int_list, default=[0, 16, 64])
+    parser.add_argument("--threads", type=common.int_list, default=[1, 4])
+    parser.add_argument("--docs-per-request", type=common.int_list, default=[64, 256])
+    parser.add_argument("--text-lengths", type=common.int_list, default=[10, 100],
+                        help="number of words per text field")
+    parser.add_argument("--tensor-fields", type=common.int_list, default=[1, 2])
+    parser.add_argument("--num-docs", type=int, default=1024, help="documents ingested per sweep point")
+    parser.add_argument("--model", default="hf/all-MiniLM-L6-v2")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    pool = IndexPool()
+    results = []
+    try:
+        for index_type, num_tensor_fields in itertools.product(args.index_types, args.tensor_fields):
+            index_name, = pool.lease("ingest", [index_settings(index_type, num_tensor_fields, args.model)])
+            # Load the model before timing anything
+            warm_up_batches = build_corpus(num_tensor_fields, 1, args.seed).batches(1, 1)
+            run_point(client, index_name, index_type, warm_up_batches, None, 1, num_tensor_fields)
+
+            for client_batch_size, num_threads, docs_per_request, text_length in itertools.product(
+                    args.client_batch_sizes, args.threads, args.docs_per_request, args.text_lengths):
+                MarqoTestCase.clear_indexes([index_name])
+                batches = build_corpus(num_tensor_fields, text_length, args.seed).batches(args.num_docs,
+                                                                                          docs_per_request)
+                row = {
+                    "index_type": index_type,
+                    "tensor_fields": num_tensor_fields,
+                    "client_batch_size": client_batch_size,
+                    "threads": num_threads,
+                    "docs_per_request": docs_per_request,
+                    "text_length": text_length,
+                }
+                row.update(run_point(client, index_name, index_type, batches, client_batch_size or None,
+                                     num_threads, num_tensor_fields))
+                print(row)
+                results.append(row)
+    finally:
+        pool.delete_all()
+
+    common.print_results(results, ["index_type", "tensor_fields", "client_batch_size", "threads",
+                                   "docs_per_request", "text_length", "docs_per_sec", "batch_p50_ms",
+                                   "batch_p99_ms", "error_rate"])
+    print(f"Results written to {common.write_results('ingest', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Open-loop load generator for search, add_documents and update_documents.
+
+The threaded fan-out used in the tests (e.g. test_model_eject_and_concurrency.py) is closed-loop: a client only
+sends its next request once the previous one returned, so when Marqo slows down the client slows down with it and
+the queueing delay never shows up in the measured latency (coordinated omission).
+
+Here an asyncio scheduler issues requests at a fixed or Poisson arrival rate regardless of how many are still in
+flight, and latency is measured from each request's *intended* send time. The blocking Marqo client calls run in a
+thread pool (max_in_flight threads); a request that has to wait for a free thread is still timed from its intended
+send time, so that wait is counted too. Latency and service time (time spent in the client call only) are recorded
+into mergeable LatencyHistograms, which are stored with the results so runs can be combined later.
+
+Example:
+    python -m benchmarks.load_generator --operation search --rates 10,50,100 --arrival poisson --duration 60
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from benchmarks import common
+from benchmarks.histogram import LatencyHistogram
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool
+
+INDEX_SETTINGS = {
+    "type": "structured",
+    "model": "hf/all-MiniLM-L6-v2",
+    "allFields": [
+        {"name": "text_field_1", "type": "text", "features": ["lexical_search"]},
+        {"name": "float_field_1", "type": "float", "features": ["score_modifier"]},
+    ],
+    "tensorFields": ["text_field_1"],
+}
+
+
+def interarrival_times(rate: float, arrival: str, seed: int):
+    """Yields the gaps between consecutive intended send times."""
+    rng = random.Random(seed)
+    while True:
+        yield rng.expovariate(rate) if arrival == "poisson" else 1 / rate
+
+
+async def run_open_loop(operation: Callable[[int], Any], rate: float, duration_s: float, arrival: str = "fixed",
+                        max_in_flight: int = 256, seed: int = 0) -> Dict[str, Any]:
+    """Calls operation(i) at the given arrival rate for duration_s seconds.
+
+    Returns:
+        The latency (from intended send time) and service time histograms, the number of errors and the achieved
+        request rate.
+    """
+    latency = LatencyHistogram()
+    service_time = LatencyHistogram()
+    errors = 0
+    loop = asyncio.get_running_loop()
+
+    def timed_call(i: int):
+        start = time.perf_counter()
+        try:
+            operation(i)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    async def send(i: int, intended_time: float):
+        nonlocal errors
+        elapsed, error = await loop.run_in_executor(executor, timed_call, i)
+        if error is None:
+            latency.record(time.perf_counter() - intended_time)
+            service_time.record(elapsed)
+        else:
+            errors += 1
+
+    tasks = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        start = time.perf_counter()
+        # Schedule offsets are accumulated from 0 rather than onto perf_counter(), so float rounding cannot drop
+        # the last request of a fixed-rate run
+        offset = 0.0
+        gaps = interarrival_times(rate, arrival, seed)
+        while True:
+            offset += next(gaps)
+            if offset > duration_s + 1e-9:
+                break
+            intended_time = start + offset
+            delay = intended_time - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(len(tasks), intended_time)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "sent": len(tasks),
+        "errors": errors,
+        "achieved_rate": (len(tasks) - errors) / elapsed,
+        "latency": latency,
+        "service_time": service_time,
+    }
+
+
+def build_operation(client, index_name: str, operation: str, corpus: Corpus, num_docs: int,
+                    seed: int) -> Callable[[int], Any]:
+    rng = random.Random(seed)
+    index = client.index(index_name)
+    if operation == "search":
+        return lambda i: index.search(q=next(corpus.queries(1, start=i)))
+    if operation == "add":
+        # New documents continue the corpus after the preloaded ones
+        return lambda i: index.add_documents([corpus.document(num_docs + i)])
+    if operation == "update":
+        return lambda i: index.update_documents([{"_id": str(rng.randrange(num_docs)),
+                                                  "float_field_1": rng.random()}])
+    raise ValueError(f"Unknown operation {operation}. Must be one of ('search', 'add', 'update')")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operation", choices=["search", "add", "update"], default="search")
+    parser.add_argument("--rates", type=common.int_list, default=[10, 50, 100], help="requests per second")
+    parser.add_argument("--arrival", choices=["fixed", "poisson"], default="poisson")
+    parser.add_argument("--duration", type=float, default=60, help="seconds per rate")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--num-docs", type=int, default=1000, help="documents loaded before the run")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    corpus = Corpus.for_index_settings(INDEX_SETTINGS, seed=args.seed, text_length=(20, 20))
+    pool = IndexPool()
+    results = []
+    try:
+        index_name, = pool.lease("load_generator", [INDEX_SETTINGS])
+        for batch in corpus.batches(args.num_docs, 64):
+            client.index(index_name).add_documents(batch)
+        for rate in args.rates:
+            operation = build_operation(client, index_name, args.operation, corpus, args.num_docs, args.seed)
+            outcome = asyncio.run(run_open_loop(operation, rate, args.duration, args.arrival,
+                                                args.max_in_flight, args.seed))
+            row = {"operation": args.operation, "arrival": args.arrival, "target_rate": rate,
+                   "sent": outcome["sent"], "errors": outcome["errors"], "achieved_rate": outcome["achieved_rate"]}
+            row.update({f"latency_{key}": value for key, value in outcome["latency"].summary().items()})
+            row.update({f"service_{key}": value for key, value in outcome["service_time"].summary().items()})
+            row["latency_histogram"] = outcome["latency"].to_dict()
+            row["service_time_histogram"] = outcome["service_time"].to_dict()
+            print({key: value for key, value in row.items() if not key.endswith("histogram")})
+            results.append(row)
+    finally:
+        pool.delete_all()
+
+    common.print_results(results, ["operation", "arrival", "target_rate", "achieved_rate", "errors",
+                                   "latency_p50_ms", "latency_p99_ms", "latency_p99_9_ms", "service_p99_ms"])
+    print(f"Results written to {common.write_results('load_generator', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of Marqo's media download path under controlled network conditions.
+
+Image documents pointing at the local MediaServer (tests/media_server.py) are added to an unstructured index with
+treat_urls_and_pointers_as_images, while sweeping the server's per-request latency, bandwidth cap, injected error
+rate and the image size. Every document gets a distinct URL so nothing can be served from a cache.
+
+Marqo must be able to reach this machine on MARQO_API_TESTS_MEDIA_HOST (host.docker.internal by default).
+
+Example:
+    python -m benchmarks.media_download --latencies-ms 0,100 --bandwidths-kbps 0,1000 --error-rates 0,0.1
+"""
+import argparse
+import itertools
+
+from benchmarks import common
+from benchmarks.ingest import count_errors
+from tests.marqo_test import IndexPool, MarqoTestCase
+from tests.media_server import MediaServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencies-ms", type=common.int_list, default=[0, 50, 200])
+    parser.add_argument("--bandwidths-kbps", type=common.int_list, default=[0, 1000, 10000],
+                        help="bandwidth cap in KB/s, 0 for no cap")
+    parser.add_argument("--error-rates", type=common.float_list, default=[0.0, 0.1])
+    parser.add_argument("--image-sizes", type=common.int_list, default=[224, 1024], help="square image side in px")
+    parser.add_argument("--docs-per-request", type=int, default=16)
+    parser.add_argument("--requests-per-point", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--model", default="open_clip/ViT-B-32/openai")
+    args = parser.parse_args()
+
+    client = common.get_client()
+    media_server = MediaServer(seed=0).start()
+    pool = IndexPool()
+    results = []
+    try:
+        index_name, = pool.lease("media_download", [{
+            "type": "unstructured", "model": args.model, "treatUrlsAndPointersAsImages": True
+        }])
+        image_urls = {size: media_server.generate_image(size, size) for size in args.image_sizes}
+        # Load the model before timing anything
+        client.index(index_name).add_documents([{"image": image_urls[args.image_sizes[0]]}], tensor_fields=["image"])
+
+        for latency_ms, bandwidth_kbps, error_rate, image_size in itertools.product(
+                args.latencies_ms, args.bandwidths_kbps, args.error_rates, args.image_sizes):
+            MarqoTestCase.clear_indexes([index_name])
+            media_server.latency_s = latency_ms / 1000
+            media_server.bandwidth_bytes_per_s = bandwidth_kbps * 1000 or None
+            media_server.error_rate = error_rate
+            media_server.reset_stats()
+            failed_docs = []
+
+            def add_images(i: int):
+                docs = [{"image": f"{image_urls[image_size]}?request={i}&doc={j}"}
+                        for j in range(args.docs_per_request)]
+                failed, _ = count_errors(client.index(index_name).add_documents(docs, tensor_fields=["image"]))
+                failed_docs.append(failed)
+
+            row = {"latency_ms": latency_ms, "bandwidth_kbps": bandwidth_kbps, "injected_error_rate": error_rate,
+                   "image_size": image_size}
+            row.update(common.run_closed_loop(add_images, args.requests_per_point, args.concurrency))
+            row["docs_per_sec"] = row["requests_per_sec"] * args.docs_per_request
+            row["doc_error_rate"] = sum(failed_docs) / (args.docs_per_request * args.requests_per_point)
+            row.update({f"media_{key}": value for key, value in media_server.reset_stats().items()})
+            print(row)
+            results.append(row)
+    finally:
+        pool.delete_all()
+        media_server.stop()
+
+    common.print_results(results, ["latency_ms", "bandwidth_kbps", "injected_error_rate", "image_size",
+                                   "docs_per_sec", "p50_ms", "p99_ms", "doc_error_rate"])
+    print(f"Results written to {common.write_results('media_download', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
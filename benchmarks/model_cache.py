@@ -0,0 +1,200 @@
+"""Model load, eject and cache-thrash benchmark on CPU.
+
+Builds on tests/api_tests/test_model_cache_management.py and TestModelEject.test_sequentially_search, which cycles
+through many open_clip/hf models. Every model gets an unstructured index, and two scenarios are run:
+
+- latency: per model, the cold-load time (first search after ejecting the model, minus a warm search), the
+  warm-hit search latency and the latency of the eject call. Models are downloaded in an untimed pass first, so
+  cold loads are from disk.
+- thrash: for each working set size n, searches cycle round-robin through the first n models. Once the working
+  set no longer fits into the model cache (bounded by MARQO_MAX_CPU_MODEL_MEMORY), every search evicts a model
+  and reloads its own. Reports evictions per minute (models that disappeared from GET /models between searches)
+  of time spent searching and polling GET /models, so the --pause-s between searches is left out, and the p50
+  search latency relative to a working set of one model.
+
+With --max-cpu-model-memory the Marqo container is restarted with each given cache size (needs docker,
+MARQO_IMAGE_NAME and a TESTING_CONFIGURATION with a start script, see tox -e py3-benchmarks); otherwise the running
+instance is benchmarked as is.
+
+Example:
+    python -m benchmarks.model_cache --working-sets 1,2,4,8 --max-cpu-model-memory 1.6,4
+"""
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks import common
+from tests import utilities
+from tests.marqo_test import IndexPool, MarqoTestCase, ModelManager
+
+DEFAULT_MODELS = [
+    "hf/all-MiniLM-L6-v2",
+    "hf/all_datasets_v3_MiniLM-L12",
+    "hf/e5-base-v2",
+    "open_clip/ViT-B-32/laion400m_e31",
+    "open_clip/ViT-B-32/openai",
+    "open_clip/ViT-B-16/laion400m_e32",
+    "open_clip/RN50x4/openai",
+    "open_clip/convnext_base/laion400m_s13b_b51k",
+]
+QUERY = "What is the best outfit to wear on the moon?"
+DEVICE = "cpu"
+
+
+def model_family(model: str) -> str:
+    return model.split("/", 1)[0]
+
+
+def timed_search(client, index_name: str) -> float:
+    start = time.perf_counter()
+    client.index(index_name).search(q=QUERY, device=DEVICE)
+    return time.perf_counter() - start
+
+
+def timed_eject(model: str) -> Optional[float]:
+    """Returns how long ejecting the model took, or None if it was not loaded."""
+    start = time.perf_counter()
+    r = requests.delete(f"{MarqoTestCase._MARQO_URL}/models", params={"model_name": model, "model_device": DEVICE})
+    elapsed = time.perf_counter() - start
+    return elapsed if r.status_code < 400 else None
+
+
+def loaded_models(manager: ModelManager) -> set:
+    return {model["model_name"] for model in manager.loaded_models() if model["model_device"] == DEVICE}
+
+
+def measure_model(client, model: str, index_name: str, repeats: int, warm_searches: int, pause_s: float) -> Dict:
+    cold, warm, eject = [], [], []
+    for _ in range(repeats):
+        timed_eject(model)
+        time.sleep(pause_s)
+        cold_s = timed_search(client, index_name)
+        warm_s = [timed_search(client, index_name) for _ in range(warm_searches)]
+        cold.append(cold_s - utilities.percentile(warm_s, 50))
+        warm.extend(warm_s)
+        eject_s = timed_eject(model)
+        if eject_s is not None:
+            eject.append(eject_s)
+        time.sleep(pause_s)
+    return {
+        "scenario": "latency",
+        "model": model,
+        "family": model_family(model),
+        "cold_load_p50_ms": 1000 * utilities.percentile(cold, 50),
+        "cold_load_max_ms": 1000 * max(cold),
+        "warm_hit_p50_ms": 1000 * utilities.percentile(warm, 50),
+        "warm_hit_p99_ms": 1000 * utilities.percentile(warm, 99),
+        "eject_p50_ms": 1000 * utilities.percentile(eject, 50) if eject else float("nan"),
+    }
+
+
+def run_thrash(client, manager: ModelManager, models: List[str], index_names: List[str], num_requests: int,
+               pause_s: float) -> Dict:
+    """Searches round-robin through the given models' indexes, counting the models evicted by each search.
+
+    evictions_per_min is per minute of searching and polling the loaded models, not counting the pause_s after
+    every search.
+    """
+    latencies = []
+    evictions = 0
+    errors = 0
+    busy_s = 0.0
+    before = loaded_models(manager)
+    for i in range(num_requests):
+        start = time.perf_counter()
+        try:
+            latencies.append(timed_search(client, index_names[i % len(index_names)]))
+        except Exception as e:
+            # Loading a model while the cache is full can be rejected or run out of memory
+            print(f"Search failed: {e}")
+            errors += 1
+        after = loaded_models(manager)
+        evictions += len(before - after)
+        before = after
+        busy_s += time.perf_counter() - start
+        time.sleep(pause_s)
+    elapsed_min = busy_s / 60
+
+    row = {
+        "scenario": "thrash",
+        "working_set": len(models),
+        "evictions": evictions,
+        "evictions_per_min": evictions / elapsed_min,
+        "error_rate": errors / num_requests,
+    }
+    row.update(utilities.summarise_latencies(latencies))
+    return row
+
+
+def add_thrash_penalties(results: List[Dict]) -> None:
+    baselines = {row["max_cpu_model_memory"]: row for row in results
+                 if row["scenario"] == "thrash" and row["working_set"] == 1}
+    for row in results:
+        baseline = baselines.get(row["max_cpu_model_memory"])
+        if row["scenario"] == "thrash" and baseline and baseline["p50_ms"]:
+            row["p50_penalty"] = row["p50_ms"] / baseline["p50_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=common.str_list, default=DEFAULT_MODELS)
+    parser.add_argument("--repeats", type=int, default=3, help="cold loads per model")
+    parser.add_argument("--warm-searches", type=int, default=10, help="warm searches after each cold load")
+    parser.add_argument("--working-sets", type=common.int_list, default=[1, 2, 4, 8])
+    parser.add_argument("--thrash-requests", type=int, default=40, help="searches per working set")
+    parser.add_argument("--max-cpu-model-memory", type=common.float_list, default=[],
+                        help="model cache sizes in GB to restart Marqo with. Empty to use the running instance")
+    parser.add_argument("--pause-s", type=float, default=1.0,
+                        help="pause between model loads; loading models back to back can run Marqo out of memory")
+    parser.add_argument("--skip-latency", action="store_true")
+    args = parser.parse_args()
+
+    client = common.get_client()
+    manager = ModelManager()
+    results = []
+    for cache_size_gb in args.max_cpu_model_memory or [None]:
+        if cache_size_gb is not None:
+            common.restart_marqo({"MARQO_MAX_CPU_MODEL_MEMORY": str(cache_size_gb)})
+        cache_label = cache_size_gb if cache_size_gb is not None else "server"
+        pool = IndexPool()
+        try:
+            index_names = pool.lease("model_cache", [{"type": "unstructured", "model": model}
+                                                     for model in args.models])
+            # Download every model before timing anything
+            for index_name in index_names:
+                timed_search(client, index_name)
+                time.sleep(args.pause_s)
+
+            if not args.skip_latency:
+                for model, index_name in zip(args.models, index_names):
+                    row = {"max_cpu_model_memory": cache_label}
+                    row.update(measure_model(client, model, index_name, args.repeats, args.warm_searches,
+                                             args.pause_s))
+                    print(row)
+                    results.append(row)
+
+            for working_set in args.working_sets:
+                models = args.models[:working_set]
+                manager.eject(manager.loaded_models())
+                row = {"max_cpu_model_memory": cache_label}
+                row.update(run_thrash(client, manager, models, index_names[:working_set], args.thrash_requests,
+                                      args.pause_s))
+                print(row)
+                results.append(row)
+        finally:
+            pool.delete_all()
+
+    add_thrash_penalties(results)
+    common.print_results([row for row in results if row["scenario"] == "latency"],
+                         ["max_cpu_model_memory", "family", "model", "cold_load_p50_ms", "warm_hit_p50_ms",
+                          "eject_p50_ms"])
+    common.print_results([row for row in results if row["scenario"] == "thrash"],
+                         ["max_cpu_model_memory", "working_set", "evictions_per_min", "p50_ms", "p50_penalty",
+                          "error_rate"])
+    print(f"Results written to {common.write_results('model_cache', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
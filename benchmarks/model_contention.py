@@ -0,0 +1,151 @@
+"""Model-cache contention stress benchmark with client retry policy evaluation.
+
+TestConcurrencyRequestsBlock.test_concurrent_search_without_cache checks that while one request loads a model,
+racing requests are rejected with "Request rejected, as this request attempted to update the model cache". Here
+N concurrent searches are fired at once across M cold models (all models are ejected first), as happens when
+traffic hits a freshly deployed instance, and each search is retried with one of the policies in benchmarks.retry.
+
+For every policy, number of models and concurrency it reports:
+- the rejection rate (rejected attempts / attempts) and the fraction of searches rejected at least once
+- p50/p95/p99 of the search latency including all retries, measured from the moment all searches are released
+- the mean and max time to the first successful search per model
+- the fraction of searches that gave up
+- the number of wait_on_health waits that timed out
+
+wait_on_health retries once no model load is in progress: GET /models lists the model as loaded, or the loaded
+models changed since the search last tried, i.e. the load that got it rejected finished. Waiting for the model
+itself would wait out the timeout whenever the model lost the race, as nothing else is loading it.
+
+Example:
+    python -m benchmarks.model_contention --policies none,fixed,exponential,jittered,wait_on_health --concurrency 8,32
+"""
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks import common
+from benchmarks import retry
+from tests import utilities
+from tests.marqo_test import IndexPool, ModelManager
+
+DEFAULT_MODELS = ["hf/all-MiniLM-L6-v2", "open_clip/ViT-B-32/laion400m_e31", "hf/e5-base-v2",
+                  "open_clip/ViT-B-32/openai"]
+QUERY = "what is best to wear on the moon?"
+DEVICE = "cpu"
+MODEL_CACHE_REJECTION = "Request rejected, as this request attempted to update the model cache"
+
+
+def is_model_cache_rejection(error: Exception) -> bool:
+    return MODEL_CACHE_REJECTION in str(error)
+
+
+def run_point(client, manager: ModelManager, models: List[str], index_names: List[str], concurrency: int,
+              policy_name: str, max_attempts: int, seed: int) -> Dict:
+    manager.eject(manager.loaded_models())
+    barrier = threading.Barrier(concurrency)
+    release_time = [0.0]
+
+    def cache_settled(model: str):
+        # Every model was just ejected, so nothing is loaded when the searches are first tried
+        loaded_before = [set()]
+
+        def is_ready() -> bool:
+            loaded = {loaded["model_name"] for loaded in manager.loaded_models()}
+            if model in loaded or loaded != loaded_before[0]:
+                loaded_before[0] = loaded
+                return True
+            return False
+        return is_ready
+
+    def cold_search(i: int):
+        model, index_name = models[i % len(models)], index_names[i % len(models)]
+        policy_kwargs = {} if policy_name == "none" else {"max_attempts": max_attempts}
+        if policy_name == "jittered":
+            policy_kwargs["seed"] = seed + i
+        policy = retry.build_policy(policy_name, **policy_kwargs)
+        if barrier.wait() == 0:
+            release_time[0] = time.perf_counter()
+        outcome = retry.call_with_retries(
+            lambda: client.index(index_name).search(q=QUERY, device=DEVICE), policy, is_model_cache_rejection,
+            is_ready=cache_settled(model)
+        )
+        outcome.update({"model": model, "end": time.perf_counter(), "wait_timeouts": getattr(policy, "timeouts", 0)})
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(cold_search, range(concurrency)))
+
+    released = release_time[0]
+    successes = [outcome for outcome in outcomes if outcome["error"] is None]
+    other_errors = [outcome["error"] for outcome in outcomes
+                    if outcome["error"] is not None and not is_model_cache_rejection(outcome["error"])]
+    if other_errors:
+        print(f"{len(other_errors)} searches failed with other errors, first error: {other_errors[0]}")
+    first_success = {}
+    for outcome in successes:
+        first_success[outcome["model"]] = min(first_success.get(outcome["model"], float("inf")),
+                                              outcome["end"] - released)
+    attempts = sum(outcome["attempts"] for outcome in outcomes)
+    rejections = sum(outcome["retryable_failures"] for outcome in outcomes)
+
+    row = {
+        "rejection_rate": rejections / attempts,
+        "rejected_at_least_once": sum(1 for outcome in outcomes if outcome["retryable_failures"]) / concurrency,
+        "attempts_per_search": attempts / concurrency,
+        "gave_up_rate": (concurrency - len(successes)) / concurrency,
+        "wait_timeouts": sum(outcome["wait_timeouts"] for outcome in outcomes),
+        "first_success_mean_ms": 1000 * sum(first_success.values()) / len(first_success) if first_success
+        else float("nan"),
+        "first_success_max_ms": 1000 * max(first_success.values()) if first_success else float("nan"),
+    }
+    row.update(utilities.summarise_latencies([outcome["end"] - released for outcome in successes]))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--policies", type=common.str_list, default=list(retry.POLICIES))
+    parser.add_argument("--models", type=common.str_list, default=DEFAULT_MODELS)
+    parser.add_argument("--num-models", type=common.int_list, default=[1, 2, 4],
+                        help="number of cold models the concurrent searches are spread across")
+    parser.add_argument("--concurrency", type=common.int_list, default=[4, 16, 64])
+    parser.add_argument("--max-attempts", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3, help="runs per point, averaged into one row")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    manager = ModelManager()
+    pool = IndexPool()
+    results = []
+    try:
+        index_names = pool.lease("model_contention", [{"type": "unstructured", "model": model}
+                                                      for model in args.models])
+        # Download every model before timing anything
+        for index_name in index_names:
+            client.index(index_name).search(q=QUERY, device=DEVICE)
+
+        for policy_name, num_models, concurrency in itertools.product(args.policies, args.num_models,
+                                                                      args.concurrency):
+            runs = [run_point(client, manager, args.models[:num_models], index_names[:num_models], concurrency,
+                              policy_name, args.max_attempts, args.seed + repeat)
+                    for repeat in range(args.repeats)]
+            row = {"policy": policy_name, "num_models": num_models, "concurrency": concurrency}
+            # Average the runs; percentiles of percentiles are only indicative, see the per-run rows in the JSON
+            row.update({key: sum(run[key] for run in runs) / len(runs) for key in runs[0]})
+            row["runs"] = runs
+            print({key: value for key, value in row.items() if key != "runs"})
+            results.append(row)
+    finally:
+        pool.delete_all()
+
+    common.print_results(results, ["policy", "num_models", "concurrency", "rejection_rate", "gave_up_rate",
+                                   "first_success_max_ms", "p50_ms", "p99_ms"])
+    print(f"Results written to {common.write_results('model_contention', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
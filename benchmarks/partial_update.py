@@ -0,0 +1,106 @@
+"""Partial update throughput benchmark for update_documents on score modifier fields.
+
+Builds on test_multi_threading_update_for_large_score_modifier_fields in
+tests/api_tests/structured_index/test_partial_update_document.py: structured indexes with N float fields with
+the score_modifier and filter features (the test uses 100) are loaded with --num-docs seeded documents, and
+concurrent threads update randomly chosen fields of randomly chosen documents, while sweeping:
+- the number of score modifier fields on the index
+- the number of fields updated per document
+- the number of documents per update_documents call (at most 128)
+- the number of concurrent client threads
+
+For every point it reports documents and fields updated per second, p50/p95/p99 latency of the update_documents
+calls and the error rate (a call counts as failed if any of its documents failed).
+
+Example:
+    python -m benchmarks.partial_update --index-fields 10,100,500 --updated-fields 1,10 --threads 1,8
+"""
+import argparse
+import itertools
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks import common
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool
+
+
+def index_settings(num_fields: int) -> Dict:
+    """Same shape as the large_score_modifier_index in TestStructuredUpdateDocuments, with num_fields floats."""
+    return {
+        "type": "structured",
+        "model": "random/small",
+        "allFields": [{"name": f"float_field_{i}", "type": "float", "features": ["score_modifier", "filter"]}
+                      for i in range(num_fields)] + [{"name": "text_field_tensor", "type": "text"}],
+        "tensorFields": ["text_field_tensor"],
+    }
+
+
+def update_batch(request_number: int, seed: int, num_docs: int, num_fields: int, updated_fields: int,
+                 docs_per_request: int) -> List[Dict]:
+    """The documents of update request request_number: distinct random documents, each with updated_fields
+    distinct random float fields set to new values."""
+    rng = np.random.default_rng([seed, request_number])
+    doc_ids = rng.choice(num_docs, size=min(docs_per_request, num_docs), replace=False)
+    batch = []
+    for doc_id in doc_ids:
+        doc = {"_id": str(doc_id)}
+        for field in rng.choice(num_fields, size=updated_fields, replace=False):
+            doc[f"float_field_{field}"] = round(float(rng.uniform(1, 100)), 4)
+        batch.append(doc)
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-fields", type=common.int_list, default=[10, 100, 500],
+                        help="score modifier fields on the index")
+    parser.add_argument("--updated-fields", type=common.int_list, default=[1, 10, 50],
+                        help="fields updated per document, skipped if larger than --index-fields")
+    parser.add_argument("--docs-per-request", type=common.int_list, default=[1, 16, 128])
+    parser.add_argument("--threads", type=common.int_list, default=[1, 4, 16])
+    parser.add_argument("--num-docs", type=int, default=1000, help="documents in the index")
+    parser.add_argument("--requests-per-point", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    pool = IndexPool()
+    results = []
+    try:
+        index_names = pool.lease("partial_update", [index_settings(num_fields) for num_fields in args.index_fields])
+        for num_fields, index_name in zip(args.index_fields, index_names):
+            corpus = Corpus.for_index_settings(index_settings(num_fields), seed=args.seed, text_length=(5, 5))
+            for batch in corpus.batches(args.num_docs, 64):
+                client.index(index_name).add_documents(batch)
+
+            for updated_fields, docs_per_request, num_threads in itertools.product(
+                    args.updated_fields, args.docs_per_request, args.threads):
+                if updated_fields > num_fields:
+                    continue
+
+                def update(i: int):
+                    batch = update_batch(i, args.seed, args.num_docs, num_fields, updated_fields, docs_per_request)
+                    res = client.index(index_name).update_documents(documents=batch)
+                    if res.get("errors"):
+                        raise RuntimeError(f"update_documents failed for some documents: {res['items'][:3]}")
+
+                row = {"index_fields": num_fields, "updated_fields": updated_fields,
+                       "docs_per_request": docs_per_request, "threads": num_threads}
+                row.update(common.run_closed_loop(update, args.requests_per_point, num_threads))
+                docs_per_call = min(docs_per_request, args.num_docs)
+                row["docs_per_sec"] = row["requests_per_sec"] * docs_per_call
+                row["fields_per_sec"] = row["docs_per_sec"] * updated_fields
+                print(row)
+                results.append(row)
+    finally:
+        pool.delete_all()
+
+    common.print_results(results, ["index_fields", "updated_fields", "docs_per_request", "threads", "docs_per_sec",
+                                   "fields_per_sec", "p50_ms", "p99_ms", "error_rate"])
+    print(f"Results written to {common.write_results('partial_update', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Restart recovery benchmark for SIGTERM, SIGINT and SIGKILL.
+
+Uses the RecoveryProbe from tests/recovery_probe.py, which also backs test_start_stop.py: an index with a few
+documents is created, the `marqo` container is stopped with the signal and started again, and the probe records
+for every restart how long the container took to exit, and from `docker start` the time until Marqo answers HTTP
+(time to ready), until the first search succeeds and until the first search returns the same hits as before the
+restart (time to first correct search). Needs docker.
+
+Example:
+    python -m benchmarks.recovery --signals SIGTERM,SIGKILL --restarts 5
+"""
+import argparse
+import uuid
+from typing import Dict, List
+
+from benchmarks import common
+from tests import utilities
+from tests.marqo_test import MarqoTestCase
+from tests.recovery_probe import SIGNALS, RecoveryProbe
+
+DOCUMENTS = [
+    {"Title": "The colour of plants", "_id": "fact_1"},
+    {"Title": "some frogs", "_id": "fact_2"},
+]
+QUERY = "General nature facts"
+TIMINGS = ["stop_s", "time_to_ready_s", "time_to_first_search_s", "time_to_first_correct_search_s"]
+
+
+def summarise(rows: List[Dict], sig: str) -> Dict:
+    summary = {"signal": sig, "restart": "all"}
+    for timing in TIMINGS:
+        values = [row[timing] for row in rows]
+        summary[f"{timing}_p50"] = utilities.percentile(values, 50)
+        summary[f"{timing}_max"] = max(values)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signals", type=common.str_list, default=list(SIGNALS))
+    parser.add_argument("--restarts", type=int, default=3, help="restarts per signal")
+    parser.add_argument("--timeout-s", type=float, default=400)
+    parser.add_argument("--max-poll-interval-s", type=float, default=1.0)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    index_name = "recovery_" + uuid.uuid4().hex
+    MarqoTestCase.create_indexes([{"indexName": index_name, "type": "unstructured"}])
+    results = []
+    try:
+        client.index(index_name).add_documents(DOCUMENTS, tensor_fields=["Title"])
+        expected_hits = client.index(index_name).search(q=QUERY)["hits"]
+        probe = RecoveryProbe(client, MarqoTestCase._MARQO_URL, index_name, QUERY, expected_hits=expected_hits,
+                              timeout_s=args.timeout_s, max_interval_s=args.max_poll_interval_s)
+        for sig in args.signals:
+            rows = []
+            for restart in range(args.restarts):
+                row = {"signal": sig, "restart": restart}
+                row.update(probe.run(sig))
+                print(row)
+                rows.append(row)
+            results.extend(rows)
+            results.append(summarise(rows, sig))
+    finally:
+        MarqoTestCase.delete_indexes([index_name])
+
+    common.print_results([row for row in results if row["restart"] == "all"],
+                         ["signal"] + [f"{timing}_p50" for timing in TIMINGS[1:]]
+                         + ["time_to_first_correct_search_s_max"])
+    print(f"Results written to {common.write_results('recovery', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Pluggable client retry policies, evaluated by benchmarks.model_contention.
+
+A policy decides how long to wait after a retryable failure (attempt is the number of attempts made so far):
+- none: never retry
+- fixed: wait the same delay after every attempt
+- exponential: double the delay after every attempt, up to max_delay_s
+- jittered: "full jitter" exponential backoff, a uniformly random delay between 0 and the exponential delay, so
+  clients rejected at the same time do not all come back at the same time
+- wait_on_health: poll a readiness check (e.g. "is the model loaded") and retry as soon as it passes
+"""
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class RetryPolicy:
+    """Never retries. Subclasses override delay_s, or wait for policies that are not purely time based."""
+
+    name = "none"
+
+    def __init__(self, max_attempts: int = 1):
+        self.max_attempts = max_attempts
+
+    def delay_s(self, attempt: int) -> float:
+        return 0.0
+
+    def wait(self, attempt: int, is_ready: Optional[Callable[[], bool]] = None) -> None:
+        time.sleep(self.delay_s(attempt))
+
+
+class FixedDelay(RetryPolicy):
+    name = "fixed"
+
+    def __init__(self, max_attempts: int = 20, delay_s: float = 0.5):
+        super().__init__(max_attempts)
+        self.fixed_delay_s = delay_s
+
+    def delay_s(self, attempt: int) -> float:
+        return self.fixed_delay_s
+
+
+class ExponentialBackoff(RetryPolicy):
+    name = "exponential"
+
+    def __init__(self, max_attempts: int = 20, base_delay_s: float = 0.1, multiplier: float = 2.0,
+                 max_delay_s: float = 10.0):
+        super().__init__(max_attempts)
+        self.base_delay_s = base_delay_s
+        self.multiplier = multiplier
+        self.max_delay_s = max_delay_s
+
+    def delay_s(self, attempt: int) -> float:
+        return min(self.max_delay_s, self.base_delay_s * self.multiplier ** (attempt - 1))
+
+
+class JitteredBackoff(ExponentialBackoff):
+    name = "jittered"
+
+    def __init__(self, max_attempts: int = 20, base_delay_s: float = 0.1, multiplier: float = 2.0,
+                 max_delay_s: float = 10.0, seed: Optional[int] = None):
+        super().__init__(max_attempts, base_delay_s, multiplier, max_delay_s)
+        self.rng = random.Random(seed)
+
+    def delay_s(self, attempt: int) -> float:
+        return self.rng.uniform(0, super().delay_s(attempt))
+
+
+class WaitOnHealth(RetryPolicy):
+    """Retries as soon as is_ready() returns True, polling it every poll_interval_s for at most timeout_s.
+    Without a readiness check it falls back to waiting poll_interval_s. Waits that reach timeout_s are counted in
+    timeouts."""
+
+    name = "wait_on_health"
+
+    def __init__(self, max_attempts: int = 20, poll_interval_s: float = 0.1, timeout_s: float = 60.0):
+        super().__init__(max_attempts)
+        self.poll_interval_s = poll_interval_s
+        self.timeout_s = timeout_s
+        self.timeouts = 0
+
+    def delay_s(self, attempt: int) -> float:
+        return self.poll_interval_s
+
+    def wait(self, attempt: int, is_ready: Optional[Callable[[], bool]] = None) -> None:
+        if is_ready is None:
+            time.sleep(self.poll_interval_s)
+            return
+        deadline = time.perf_counter() + self.timeout_s
+        while time.perf_counter() < deadline:
+            try:
+                if is_ready():
+                    return
+            except Exception:
+                # The readiness check itself can fail while the server is busy
+                pass
+            time.sleep(self.poll_interval_s)
+        self.timeouts += 1
+
+
+POLICIES = {policy.name: policy
+            for policy in (RetryPolicy, FixedDelay, ExponentialBackoff, JitteredBackoff, WaitOnHealth)}
+
+
+def build_policy(name: str, **kwargs) -> RetryPolicy:
+    if name not in POLICIES:
+        raise ValueError(f"Unknown retry policy {name}. Must be one of {tuple(POLICIES)}")
+    return POLICIES[name](**kwargs)
+
+
+def call_with_retries(operation: Callable[[], Any], policy: RetryPolicy, is_retryable: Callable[[Exception], bool],
+                      is_ready: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """Calls operation until it succeeds, fails with a non-retryable error or policy.max_attempts is reached.
+
+    Returns:
+        the number of attempts and retryable failures, and the error the call finally failed with (None on success)
+    """
+    if policy.max_attempts < 1:
+        raise ValueError(f"max_attempts must be at least 1, got {policy.max_attempts}")
+    retryable_failures = 0
+    for attempt in range(1, policy.max_attempts + 1):
+        try:
+            operation()
+            return {"attempts": attempt, "retryable_failures": retryable_failures, "error": None}
+        except Exception as e:
+            if not is_retryable(e):
+                return {"attempts": attempt, "retryable_failures": retryable_failures, "error": e}
+            retryable_failures += 1
+            if attempt == policy.max_attempts:
+                return {"attempts": attempt, "retryable_failures": retryable_failures, "error": e}
+            policy.wait(attempt, is_ready)
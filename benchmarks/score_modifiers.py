@@ -0,0 +1,144 @@
+"""Score modifier cost benchmark.
+
+Uses the index shapes of tests/api_tests/test_dict_score_modifiers.py (a structured index with double, long,
+map<text, float> and map<text,int> score modifier fields, and an unstructured index) and measures search latency
+and throughput while sweeping:
+- the number of score modifiers per query, alternating between multiply_score_by and add_to_score and cycling
+  through the double and long fields and the keys of both maps
+- the number of keys per map score modifier field in every document (the map cardinality), into the thousands
+- the search method
+
+Every row also reports its p50 relative to the same search without score modifiers, which is the cost of the
+modifiers alone.
+
+Example:
+    python -m benchmarks.score_modifiers --modifiers-per-query 0,1,4,16,64 --map-cardinalities 1,100,1000,5000
+"""
+import argparse
+import itertools
+from typing import Dict, List
+
+from benchmarks import common
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool, MarqoTestCase
+
+MODEL = "open_clip/ViT-B-32/laion2b_s34b_b79k"
+SCALAR_FIELDS = ["double_score_mods", "long_score_mods"]
+MAP_FIELDS = ["map_score_mods", "map_score_mods_int"]
+
+# Same shapes as the indexes in TestDictScoreModifiers
+STRUCTURED_INDEX_SETTINGS = {
+    "type": "structured",
+    "vectorNumericType": "float",
+    "model": MODEL,
+    "normalizeEmbeddings": True,
+    "textPreprocessing": {"splitLength": 2, "splitOverlap": 0, "splitMethod": "sentence"},
+    "imagePreprocessing": {"patchMethod": None},
+    "allFields": [
+        {"name": "text_field", "type": "text", "features": ["lexical_search"]},
+        {"name": "double_score_mods", "type": "double", "features": ["score_modifier"]},
+        {"name": "long_score_mods", "type": "long", "features": ["score_modifier"]},
+        {"name": "map_score_mods", "type": "map<text, float>", "features": ["score_modifier"]},
+        {"name": "map_score_mods_int", "type": "map<text,int>", "features": ["score_modifier"]},
+    ],
+    "tensorFields": ["text_field"],
+    "annParameters": {"spaceType": "prenormalized-angular", "parameters": {"efConstruction": 512, "m": 16}},
+}
+UNSTRUCTURED_INDEX_SETTINGS = {"type": "unstructured", "model": MODEL}
+
+
+def build_corpus(map_cardinality: int, seed: int) -> Corpus:
+    """Every document has all map_cardinality keys in both map fields."""
+    return Corpus({"text_field": "text", "double_score_mods": "double", "long_score_mods": "long",
+                   "map_score_mods": "map<text,float>", "map_score_mods_int": "map<text,int>"},
+                  seed=seed, text_length=(5, 20), map_size=(map_cardinality, map_cardinality),
+                  map_key_space=map_cardinality)
+
+
+def build_score_modifiers(num_modifiers: int, map_cardinality: int) -> Dict[str, List[Dict]]:
+    """Returns num_modifiers score modifiers on distinct fields, alternating between multiply_score_by and
+    add_to_score. The scalar fields come first, then map keys of both map fields in turn."""
+    field_names = list(SCALAR_FIELDS)
+    field_names += [f"{field}.key_{key}" for key in range(map_cardinality) for field in MAP_FIELDS]
+    if num_modifiers > len(field_names):
+        raise ValueError(f"{num_modifiers} score modifiers need more than the {len(field_names)} fields and map keys "
+                         f"available with a map cardinality of {map_cardinality}")
+    modifiers = {"multiply_score_by": [], "add_to_score": []}
+    for i, field_name in enumerate(field_names[:num_modifiers]):
+        # Only latency is measured, so the resulting scores do not need to be meaningful
+        if i % 2 == 0:
+            modifiers["multiply_score_by"].append({"field_name": field_name, "weight": 1.0})
+        else:
+            modifiers["add_to_score"].append({"field_name": field_name, "weight": 0.001})
+    return {operation: fields for operation, fields in modifiers.items() if fields}
+
+
+def add_relative_costs(results: List[Dict]) -> None:
+    baselines = {
+        (row["index_type"], row["search_method"], row["map_cardinality"]): row
+        for row in results if row["modifiers_per_query"] == 0
+    }
+    for row in results:
+        baseline = baselines.get((row["index_type"], row["search_method"], row["map_cardinality"]))
+        if baseline and baseline["p50_ms"]:
+            row["p50_vs_no_modifiers"] = row["p50_ms"] / baseline["p50_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-types", type=common.str_list, default=["structured", "unstructured"])
+    parser.add_argument("--search-methods", type=common.str_list, default=["TENSOR", "LEXICAL"])
+    parser.add_argument("--modifiers-per-query", type=common.int_list, default=[0, 1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--map-cardinalities", type=common.int_list, default=[1, 10, 100, 1000, 5000],
+                        help="keys per map score modifier field in every document")
+    parser.add_argument("--num-docs", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--requests-per-point", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    settings = {"structured": STRUCTURED_INDEX_SETTINGS, "unstructured": UNSTRUCTURED_INDEX_SETTINGS}
+    pool = IndexPool()
+    results = []
+    try:
+        index_names = pool.lease("score_modifiers", [settings[index_type] for index_type in args.index_types])
+        for index_type, index_name in zip(args.index_types, index_names):
+            for map_cardinality in args.map_cardinalities:
+                MarqoTestCase.clear_indexes([index_name])
+                corpus = build_corpus(map_cardinality, args.seed)
+                tensor_fields = ["text_field"] if index_type == "unstructured" else None
+                # Documents with thousands of map keys are large, so keep the batches small
+                for batch in corpus.batches(args.num_docs, 16):
+                    client.index(index_name).add_documents(batch, tensor_fields=tensor_fields)
+                queries = list(corpus.queries(args.requests_per_point))
+                # Warm the model and caches
+                client.index(index_name).search(q=queries[0])
+
+                for search_method, num_modifiers in itertools.product(args.search_methods,
+                                                                      args.modifiers_per_query):
+                    if num_modifiers > len(SCALAR_FIELDS) + len(MAP_FIELDS) * map_cardinality:
+                        continue
+                    score_modifiers = build_score_modifiers(num_modifiers, map_cardinality) or None
+
+                    def search(i: int):
+                        client.index(index_name).search(q=queries[i % len(queries)], search_method=search_method,
+                                                        limit=args.limit, score_modifiers=score_modifiers)
+
+                    row = {"index_type": index_type, "search_method": search_method,
+                           "map_cardinality": map_cardinality, "modifiers_per_query": num_modifiers}
+                    row.update(common.run_closed_loop(search, args.requests_per_point, args.concurrency))
+                    print(row)
+                    results.append(row)
+    finally:
+        pool.delete_all()
+
+    add_relative_costs(results)
+    common.print_results(results, ["index_type", "search_method", "map_cardinality", "modifiers_per_query",
+                                   "p50_ms", "p99_ms", "requests_per_sec", "error_rate", "p50_vs_no_modifiers"])
+    print(f"Results written to {common.write_results('score_modifiers', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
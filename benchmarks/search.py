@@ -0,0 +1,137 @@
+"""Search latency and throughput benchmark across search methods and hybrid variants.
+
+Loads a fixed, seeded synthetic corpus into the text index shapes used in
+tests/api_tests/structured_index/test_hybrid_search.py (a structured index with lexical/filterable text fields and
+score modifier fields, and an unstructured index) and measures TENSOR, LEXICAL and every HYBRID
+retrievalMethod/rankingMethod combination at each limit and client concurrency.
+
+Each row also reports the p50 and throughput relative to TENSOR search at the same index, limit and concurrency,
+which is the cost of switching traffic to that search method.
+
+Example:
+    python -m benchmarks.search --limits 10,100 --concurrency 1,8,64
+"""
+import argparse
+import itertools
+from typing import Dict, Iterator, List
+
+from benchmarks import common
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool
+
+TEXT_FIELDS = ["text_field_1", "text_field_2", "text_field_3"]
+
+# Same shapes as the text indexes in TestStructuredHybridSearch
+STRUCTURED_TEXT_INDEX_SETTINGS = {
+    "type": "structured",
+    "model": "sentence-transformers/all-MiniLM-L6-v2",
+    "allFields": [
+        {"name": "text_field_1", "type": "text", "features": ["filter", "lexical_search"]},
+        {"name": "text_field_2", "type": "text", "features": ["filter", "lexical_search"]},
+        {"name": "text_field_3", "type": "text", "features": ["filter", "lexical_search"]},
+        {"name": "add_field_1", "type": "float", "features": ["score_modifier"]},
+        {"name": "add_field_2", "type": "float", "features": ["score_modifier"]},
+        {"name": "mult_field_1", "type": "float", "features": ["score_modifier"]},
+        {"name": "mult_field_2", "type": "float", "features": ["score_modifier"]}
+    ],
+    "tensorFields": TEXT_FIELDS
+}
+UNSTRUCTURED_TEXT_INDEX_SETTINGS = {
+    "type": "unstructured",
+    "model": "sentence-transformers/all-MiniLM-L6-v2",
+}
+
+SEARCH_VARIANTS = {
+    "tensor": {"search_method": "TENSOR"},
+    "lexical": {"search_method": "LEXICAL"},
+    "hybrid_disjunction_rrf": {
+        "search_method": "HYBRID",
+        "hybrid_parameters": {"retrievalMethod": "disjunction", "rankingMethod": "rrf"}
+    },
+    "hybrid_tensor_tensor": {
+        "search_method": "HYBRID",
+        "hybrid_parameters": {"retrievalMethod": "tensor", "rankingMethod": "tensor"}
+    },
+    "hybrid_tensor_lexical": {
+        "search_method": "HYBRID",
+        "hybrid_parameters": {"retrievalMethod": "tensor", "rankingMethod": "lexical"}
+    },
+    "hybrid_lexical_tensor": {
+        "search_method": "HYBRID",
+        "hybrid_parameters": {"retrievalMethod": "lexical", "rankingMethod": "tensor"}
+    },
+    "hybrid_lexical_lexical": {
+        "search_method": "HYBRID",
+        "hybrid_parameters": {"retrievalMethod": "lexical", "rankingMethod": "lexical"}
+    },
+}
+
+
+def build_corpus(seed: int) -> Corpus:
+    return Corpus({field: "text" for field in TEXT_FIELDS}, seed=seed, text_length=(10, 50))
+
+
+def load_corpus(client, index_name: str, batches: Iterator[List[Dict]], unstructured: bool) -> None:
+    for batch in batches:
+        client.index(index_name).add_documents(batch, tensor_fields=TEXT_FIELDS if unstructured else None)
+
+
+def add_relative_costs(results: List[Dict]) -> None:
+    baselines = {
+        (row["index_type"], row["limit"], row["concurrency"]): row
+        for row in results if row["variant"] == "tensor"
+    }
+    for row in results:
+        baseline = baselines.get((row["index_type"], row["limit"], row["concurrency"]))
+        if baseline and baseline["p50_ms"] and baseline["requests_per_sec"]:
+            row["p50_vs_tensor"] = row["p50_ms"] / baseline["p50_ms"]
+            row["throughput_vs_tensor"] = row["requests_per_sec"] / baseline["requests_per_sec"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--index-types", type=common.str_list, default=["structured", "unstructured"])
+    parser.add_argument("--variants", type=common.str_list, default=list(SEARCH_VARIANTS))
+    parser.add_argument("--limits", type=common.int_list, default=[10, 100, 1000])
+    parser.add_argument("--concurrency", type=common.int_list, default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--num-docs", type=int, default=5000)
+    parser.add_argument("--requests-per-point", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    client = common.get_client()
+    corpus = build_corpus(args.seed)
+    queries = list(corpus.queries(args.requests_per_point))
+    settings = {"structured": STRUCTURED_TEXT_INDEX_SETTINGS, "unstructured": UNSTRUCTURED_TEXT_INDEX_SETTINGS}
+
+    pool = IndexPool()
+    results = []
+    try:
+        index_names = pool.lease("search", [settings[index_type] for index_type in args.index_types])
+        for index_type, index_name in zip(args.index_types, index_names):
+            load_corpus(client, index_name, corpus.batches(args.num_docs, 64),
+                        unstructured=index_type == "unstructured")
+            # Warm the model and caches
+            client.index(index_name).search(q=queries[0])
+
+            for variant, limit, concurrency in itertools.product(args.variants, args.limits, args.concurrency):
+                search_kwargs = SEARCH_VARIANTS[variant]
+
+                def search(i: int):
+                    client.index(index_name).search(q=queries[i % len(queries)], limit=limit, **search_kwargs)
+
+                row = {"index_type": index_type, "variant": variant, "limit": limit, "concurrency": concurrency}
+                row.update(common.run_closed_loop(search, args.requests_per_point, concurrency))
+                print(row)
+                results.append(row)
+    finally:
+        pool.delete_all()
+
+    add_relative_costs(results)
+    common.print_results(results, ["index_type", "variant", "limit", "concurrency", "requests_per_sec",
+                                   "p50_ms", "p99_ms", "error_rate", "p50_vs_tensor"])
+    print(f"Results written to {common.write_results('search', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Marqo configuration sweeper.
+
+Restarts Marqo for every point of a grid of Marqo environment variables and docker resource limits, runs one of
+the benchmarks in this package against it and collects the results into one table, so settings we tune by hand
+(MARQO_MAX_CPU_MODEL_MEMORY, MARQO_INFERENCE_CACHE_SIZE, MARQO_EF_CONSTRUCTION_MAX_VALUE, batch and concurrency
+limits, thread counts, ...) can be compared on the hardware at hand.
+
+Every --set adds a dimension to the grid and --cpus/--memory add the docker limits; the arguments after `--` are
+passed to the benchmark. Each result row of the benchmark becomes a row of the sweep, prefixed with the settings
+of its point, and the point with the best --objective is printed at the end. Keep the benchmark's own sweep small
+(e.g. a single concurrency) so rows are comparable across points. Needs docker and MARQO_IMAGE_NAME; Marqo is
+restarted with the default configuration at the end.
+
+Example:
+    python -m benchmarks.sweep --set MARQO_INFERENCE_CACHE_SIZE=0,1000 --set MARQO_MAX_CONCURRENT_SEARCH=4,16 \\
+        --cpus 2,4 --memory 8g --benchmark search --objective requests_per_sec -- \\
+        --variants tensor --limits 10 --concurrency 16
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from benchmarks import common
+
+DOCKER_LIMITS = {"cpus": "--cpus", "memory": "--memory"}
+
+
+def parse_setting(value: str) -> Tuple[str, List[str]]:
+    """Parses a --set value such as `MARQO_INFERENCE_CACHE_SIZE=0,1000` into the name and its values."""
+    name, separator, values = value.partition("=")
+    if not separator or not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE[,VALUE...], got {value}")
+    return name, common.str_list(values)
+
+
+def build_grid(settings: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """The cartesian product of the values of every setting, in the order the settings were given."""
+    names = list(settings)
+    return [dict(zip(names, values)) for values in itertools.product(*(settings[name] for name in names))]
+
+
+def split_point(point: Dict[str, str]) -> Tuple[Dict[str, str], List[str]]:
+    """Splits a grid point into Marqo environment variables and `docker run` arguments."""
+    env_vars = {name: value for name, value in point.items() if name not in DOCKER_LIMITS}
+    docker_args = [arg for name, value in point.items() if name in DOCKER_LIMITS
+                   for arg in (DOCKER_LIMITS[name], value)]
+    return env_vars, docker_args
+
+
+def run_benchmark(benchmark: str, benchmark_args: List[str]) -> List[Dict]:
+    """Runs python -m benchmarks.<benchmark> and returns the rows it wrote."""
+    with tempfile.TemporaryDirectory() as results_dir:
+        subprocess.run([sys.executable, "-m", f"benchmarks.{benchmark}"] + benchmark_args, check=True,
+                       cwd=common.REPO_ROOT, env={**os.environ, common.RESULTS_DIR_ENV_VAR: results_dir})
+        json_files = [name for name in os.listdir(results_dir) if name.endswith(".json")]
+        if len(json_files) != 1:
+            raise RuntimeError(f"Expected benchmarks.{benchmark} to write one results file, found {json_files}")
+        with open(os.path.join(results_dir, json_files[0])) as f:
+            return json.load(f)["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--set", dest="settings", type=parse_setting, action="append", default=[],
+                        metavar="NAME=VALUE[,VALUE...]", help="a Marqo environment variable and the values to sweep")
+    parser.add_argument("--cpus", type=common.str_list, help="docker --cpus limits to sweep")
+    parser.add_argument("--memory", type=common.str_list, help="docker --memory limits to sweep, e.g. 4g,8g")
+    parser.add_argument("--benchmark", default="search", help="module in this package to run at every point")
+    parser.add_argument("--objective", default="requests_per_sec", help="result column to pick the best point by")
+    parser.add_argument("--minimise", action="store_true", help="lower --objective is better, e.g. p99_ms")
+    parser.add_argument("benchmark_args", nargs=argparse.REMAINDER,
+                        help="arguments for the benchmark, after `--`")
+    args = parser.parse_args()
+    benchmark_args = args.benchmark_args[1:] if args.benchmark_args[:1] == ["--"] else args.benchmark_args
+
+    settings = dict(args.settings)
+    for limit in DOCKER_LIMITS:
+        if getattr(args, limit):
+            settings[limit] = getattr(args, limit)
+    grid = build_grid(settings)
+    print(f"Sweeping {len(grid)} configurations of {list(settings)} with benchmarks.{args.benchmark}")
+
+    results = []
+    try:
+        for point in grid:
+            env_vars, docker_args = split_point(point)
+            print(f"Restarting Marqo with {point}")
+            try:
+                common.restart_marqo(env_vars, docker_args)
+                rows = run_benchmark(args.benchmark, benchmark_args)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, RuntimeError) as e:
+                # A configuration Marqo cannot run with (e.g. too little memory) is a result, not a reason to stop
+                print(f"Restarting Marqo or running benchmarks.{args.benchmark} failed with {point}: {e}")
+                rows = [{"error": str(e)}]
+            results.extend({**point, **row} for row in rows)
+    finally:
+        common.restart_marqo({})
+
+    scored = [row for row in results if isinstance(row.get(args.objective), (int, float))]
+    if scored:
+        best = (min if args.minimise else max)(scored, key=lambda row: row[args.objective])
+        print(f"Best configuration by {args.objective}: {({name: best[name] for name in settings})} "
+              f"with {args.objective}={best[args.objective]}")
+    common.print_results(results, list(settings) + [args.objective, "p50_ms", "p99_ms", "error_rate"])
+    print(f"Results written to {common.write_results('sweep', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
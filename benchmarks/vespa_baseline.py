@@ -0,0 +1,164 @@
+"""Vespa-only feed and search baseline, compared with the same workload through Marqo.
+
+scripts/start_vespa.py deploys a `test_vespa_client` schema (id, title and contents fields with a bm25 rank
+profile). This benchmark feeds the seeded synthetic corpus into it through Vespa's /document/v1 API and queries it
+with bm25 through /search/, sweeping client concurrency. With --compare-marqo the same documents are added to a
+structured Marqo index with lexical title and contents fields and no tensor fields (so no inference is involved)
+and the same queries are sent as LEXICAL searches, and every Marqo row reports its p50 latency and throughput
+relative to Vespa: the overhead Marqo itself adds.
+
+Needs a Vespa started with scripts/start_vespa.py, reachable on VESPA_DOCUMENT_URL and VESPA_QUERY_URL
+(http://localhost:8080 by default). The fed documents are removed at the end.
+
+Example:
+    python -m benchmarks.vespa_baseline --num-docs 10000 --concurrency 1,8,32 --compare-marqo
+"""
+import argparse
+import os
+import threading
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks import common
+from tests.corpus import Corpus
+from tests.marqo_test import IndexPool
+
+VESPA_DOCUMENT_URL = os.environ.get("VESPA_DOCUMENT_URL", "http://localhost:8080")
+VESPA_QUERY_URL = os.environ.get("VESPA_QUERY_URL", "http://localhost:8080")
+NAMESPACE = "benchmark"
+DOCUMENT_TYPE = "test_vespa_client"
+CONTENT_CLUSTER = "content_default"
+TEXT_FIELDS = ["title", "contents"]
+
+MARQO_INDEX_SETTINGS = {
+    "type": "structured",
+    "allFields": [{"name": field, "type": "text", "features": ["lexical_search"]} for field in TEXT_FIELDS],
+    "tensorFields": [],
+}
+
+
+class VespaClient:
+    """A minimal document/v1 and /search/ client with one HTTP session per thread."""
+
+    def __init__(self, document_url: str = VESPA_DOCUMENT_URL, query_url: str = VESPA_QUERY_URL):
+        self.document_url = document_url.rstrip("/")
+        self.query_url = query_url.rstrip("/")
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def feed(self, document: Dict) -> None:
+        fields = {key: value for key, value in document.items() if key != "_id"}
+        fields["id"] = document["_id"]
+        response = self.session.post(
+            f"{self.document_url}/document/v1/{NAMESPACE}/{DOCUMENT_TYPE}/docid/{document['_id']}",
+            json={"fields": fields}
+        )
+        response.raise_for_status()
+
+    def search(self, query: str, limit: int, query_type: str) -> Dict:
+        response = self.session.post(f"{self.query_url}/search/", json={
+            "yql": f"select * from sources {DOCUMENT_TYPE} where userQuery()",
+            "query": query,
+            "model.type": query_type,
+            "ranking": "bm25",
+            "hits": limit,
+        })
+        response.raise_for_status()
+        return response.json()
+
+    def delete_all(self) -> None:
+        self.session.delete(f"{self.document_url}/document/v1/{NAMESPACE}/{DOCUMENT_TYPE}/docid",
+                            params={"selection": "true", "cluster": CONTENT_CLUSTER}).raise_for_status()
+
+
+def build_corpus(seed: int) -> Corpus:
+    return Corpus({field: "text" for field in TEXT_FIELDS}, seed=seed, text_length=(10, 50))
+
+
+def add_marqo_overhead(results: List[Dict]) -> None:
+    baselines = {(row["phase"], row["concurrency"]): row for row in results if row["system"] == "vespa"}
+    for row in results:
+        baseline = baselines.get((row["phase"], row["concurrency"]))
+        if row["system"] != "marqo" or not baseline:
+            continue
+        if baseline["p50_ms"]:
+            row["p50_vs_vespa"] = row["p50_ms"] / baseline["p50_ms"]
+        throughput = "docs_per_sec" if row["phase"] == "feed" else "requests_per_sec"
+        if baseline[throughput]:
+            row["throughput_vs_vespa"] = row[throughput] / baseline[throughput]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-docs", type=int, default=5000)
+    parser.add_argument("--concurrency", type=common.int_list, default=[1, 4, 16, 64])
+    parser.add_argument("--requests-per-point", type=int, default=500, help="searches per concurrency level")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--query-type", default="weakAnd", choices=["all", "any", "weakAnd"],
+                        help="how Vespa combines the query terms")
+    parser.add_argument("--compare-marqo", action="store_true")
+    parser.add_argument("--marqo-docs-per-request", type=int, default=64,
+                        help="documents per add_documents call; Vespa is fed one document per request")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    vespa = VespaClient()
+    corpus = build_corpus(args.seed)
+    documents = list(corpus.documents(args.num_docs))
+    queries = list(corpus.queries(args.requests_per_point))
+    client = common.get_client()
+    pool = IndexPool()
+    results = []
+
+    def record(row: Dict, outcome: Dict, docs_per_request: Optional[float] = None) -> None:
+        row.update(outcome)
+        if row["phase"] == "feed":
+            row["docs_per_sec"] = outcome["requests_per_sec"] * (docs_per_request or 1)
+        print(row)
+        results.append(row)
+
+    try:
+        index_name = None
+        if args.compare_marqo:
+            index_name, = pool.lease("vespa_baseline", [MARQO_INDEX_SETTINGS])
+        for concurrency in args.concurrency:
+            # Every concurrency level feeds the same documents, so the corpus does not grow between levels
+            record({"system": "vespa", "phase": "feed", "concurrency": concurrency},
+                   common.run_closed_loop(lambda i: vespa.feed(documents[i]), len(documents), concurrency))
+            if index_name is not None:
+                batches = [documents[i:i + args.marqo_docs_per_request]
+                           for i in range(0, len(documents), args.marqo_docs_per_request)]
+                record({"system": "marqo", "phase": "feed", "concurrency": concurrency},
+                       common.run_closed_loop(lambda i: client.index(index_name).add_documents(batches[i]),
+                                              len(batches), concurrency),
+                       len(documents) / len(batches))
+
+        for concurrency in args.concurrency:
+            record({"system": "vespa", "phase": "search", "concurrency": concurrency},
+                   common.run_closed_loop(
+                       lambda i: vespa.search(queries[i % len(queries)], args.limit, args.query_type),
+                       args.requests_per_point, concurrency))
+            if index_name is not None:
+                record({"system": "marqo", "phase": "search", "concurrency": concurrency},
+                       common.run_closed_loop(
+                           lambda i: client.index(index_name).search(q=queries[i % len(queries)], limit=args.limit,
+                                                                     search_method="LEXICAL"),
+                           args.requests_per_point, concurrency))
+    finally:
+        vespa.delete_all()
+        pool.delete_all()
+
+    add_marqo_overhead(results)
+    common.print_results(results, ["system", "phase", "concurrency", "requests_per_sec", "docs_per_sec", "p50_ms",
+                                   "p99_ms", "error_rate", "p50_vs_vespa", "throughput_vs_vespa"])
+    print(f"Results written to {common.write_results('vespa_baseline', vars(args), results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,13 @@
 # args:
 # $1 : marqo_image_name - name of the image you want to test
 # $@ : env_vars - strings representing all args to pass docker call
-docker rm -f marqo;
+# The container name and host port can be set with MARQO_CONTAINER_NAME and MARQO_HOST_PORT
+# (marqo and 8882 by default), so several Marqo containers can run side by side.
+# The script fails if Marqo does not answer within MARQO_START_TIMEOUT seconds (600 by default).
+# MARQO_MAX_CUDA_MODEL_MEMORY and MARQO_MAX_CPU_MODEL_MEMORY override the model cache sizes (15 by default).
+MARQO_CONTAINER_NAME="${MARQO_CONTAINER_NAME:-marqo}"
+MARQO_HOST_PORT="${MARQO_HOST_PORT:-8882}"
+docker rm -f "$MARQO_CONTAINER_NAME";
 
 MARQO_DOCKER_IMAGE="$1"
 shift
@@ -11,19 +17,26 @@ shift
 # -d detaches docker from process (so subprocess does not wait for it)
 # ${@:+"$@"} adds ALL args (past $1) if any exist.
 set -x
-docker run -d --name marqo --gpus all --privileged -p 8882:8882 --add-host host.docker.internal:host-gateway \
+docker run -d --name "$MARQO_CONTAINER_NAME" --gpus all --privileged -p "$MARQO_HOST_PORT":8882 --add-host host.docker.internal:host-gateway \
   -e MARQO_ENABLE_BATCH_APIS=TRUE \
-  -e MARQO_MAX_CUDA_MODEL_MEMORY=15 \
-  -e MARQO_MAX_CPU_MODEL_MEMORY=15 \
+  -e "MARQO_MAX_CUDA_MODEL_MEMORY=${MARQO_MAX_CUDA_MODEL_MEMORY:-15}" \
+  -e "MARQO_MAX_CPU_MODEL_MEMORY=${MARQO_MAX_CPU_MODEL_MEMORY:-15}" \
     ${@:+"$@"} "$MARQO_DOCKER_IMAGE"
 set +x
 
 # Follow docker logs (since it is detached)
-docker logs -f marqo &
+docker logs -f "$MARQO_CONTAINER_NAME" &
 LOGS_PID=$!
 
-# wait for marqo to start
-until [[ $(curl -v --silent --insecure http://localhost:8882 2>&1 | grep Marqo) ]]; do
+# wait for marqo to start, for at most MARQO_START_TIMEOUT seconds (600 by default)
+MARQO_START_TIMEOUT="${MARQO_START_TIMEOUT:-600}"
+SECONDS=0
+until [[ $(curl -v --silent --insecure http://localhost:$MARQO_HOST_PORT 2>&1 | grep Marqo) ]]; do
+    if (( SECONDS >= MARQO_START_TIMEOUT )); then
+        echo "Marqo did not start within ${MARQO_START_TIMEOUT}s"
+        kill $LOGS_PID
+        exit 1
+    fi
     sleep 0.1;
 done;
 
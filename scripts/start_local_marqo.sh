@@ -2,22 +2,31 @@
 # args:
 # $1 : marqo_image_name - name of the image you want to test
 # $@ : env_vars - strings representing all args to pass docker call
+# The container name and host port can be set with MARQO_CONTAINER_NAME and MARQO_HOST_PORT
+# (marqo and 8882 by default), so several Marqo containers can run side by side.
+# The script fails if Marqo does not answer within MARQO_START_TIMEOUT seconds (600 by default).
+# Set MARQO_REUSE_VESPA=true to connect to the running Vespa instead of starting a fresh one.
+# MARQO_MAX_CPU_MODEL_MEMORY overrides the model cache size (1.6 by default).
 
 
-python3 scripts/start_vespa.py
+if [[ "${MARQO_REUSE_VESPA:-}" != "true" ]]; then
+    python3 scripts/start_vespa.py
+fi
 
 MARQO_DOCKER_IMAGE="$1"
 shift
+MARQO_CONTAINER_NAME="${MARQO_CONTAINER_NAME:-marqo}"
+MARQO_HOST_PORT="${MARQO_HOST_PORT:-8882}"
 
-docker rm -f marqo 2>/dev/null || true
+docker rm -f "$MARQO_CONTAINER_NAME" 2>/dev/null || true
 
 # Explanation:
 # -d detaches docker from process (so subprocess does not wait for it)
 # ${@:+"$@"} adds ALL args (past $1) if any exist.
 
 set -x
-docker run -d --name marqo --privileged -p 8882:8882 --add-host host.docker.internal:host-gateway \
-    -e MARQO_MAX_CPU_MODEL_MEMORY=1.6 \
+docker run -d --name "$MARQO_CONTAINER_NAME" --privileged -p "$MARQO_HOST_PORT":8882 --add-host host.docker.internal:host-gateway \
+    -e "MARQO_MAX_CPU_MODEL_MEMORY=${MARQO_MAX_CPU_MODEL_MEMORY:-1.6}" \
     -e MARQO_ENABLE_BATCH_APIS=true \
     -e VESPA_CONFIG_URL="http://host.docker.internal:19071" \
     -e VESPA_DOCUMENT_URL="http://host.docker.internal:8080" \
@@ -28,11 +37,18 @@ docker run -d --name marqo --privileged -p 8882:8882 --add-host host.docker.inte
 set +x
 
 # Follow docker logs (since it is detached)
-docker logs -f marqo &
+docker logs -f "$MARQO_CONTAINER_NAME" &
 LOGS_PID=$!
 
-# wait for marqo to start
-until [[ $(curl -v --silent --insecure http://localhost:8882 2>&1 | grep Marqo) ]]; do
+# wait for marqo to start, for at most MARQO_START_TIMEOUT seconds (600 by default)
+MARQO_START_TIMEOUT="${MARQO_START_TIMEOUT:-600}"
+SECONDS=0
+until [[ $(curl -v --silent --insecure http://localhost:$MARQO_HOST_PORT 2>&1 | grep Marqo) ]]; do
+    if (( SECONDS >= MARQO_START_TIMEOUT )); then
+        echo "Marqo did not start within ${MARQO_START_TIMEOUT}s"
+        kill $LOGS_PID
+        exit 1
+    fi
     sleep 0.1;
 done;
 
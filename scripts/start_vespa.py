@@ -3,59 +3,218 @@
 It can be used in Marqo local runs to start Vespa outside the Marqo docker container. This requires
 that the host machine has docker installed.
 
-We generate a schema.sd file and a services.xml file and put them in a zip file. We then deploy the zip file
-using the REST API. After that, we check if Vespa is up and running. If it is, we can start Marqo.
-
-All the files are created in a directory called vespa_dummy_application_package. This directory is removed and
-the zip file is removed after the application package is deployed.
+We generate a schema.sd file and a services.xml file (plus a hosts.xml file for a multi-node cluster, see
+ClusterSpec and `python3 scripts/start_vespa.py --help`) and put them in a zip file in memory, while the Vespa image
+is pulled and started in the background. We then wait for the docker `start` event of the container and for the
+config server's health endpoint to report `up`, deploy the zip file using the REST API, and wait until the
+container cluster answers. After that, we can start Marqo. Nothing is written to disk.
 
 Note: Vespa CLI is not needed as we use the REST API to deploy the application package.
 """
 
+import argparse
+import io
 import os
-import shutil
+import select
 import subprocess
 import textwrap
+import threading
 import time
 import sys
+import zipfile
+from typing import Callable, List, Optional
+from xml.etree import ElementTree
 
 import requests
 
 VESPA_VERSION=os.getenv('VESPA_VERSION', '8.396.18')  # default version baked into marqo-base:30
+CONTAINER_NAME = "vespa"
+CONFIG_SERVER_HEALTH_URL = "http://localhost:19071/state/v1/health"
+POLL_INTERVAL_S = 0.2
+NETWORK_NAME = "vespa-network"
+
+
+class ClusterSpec:
+    """The shape of the local Vespa cluster.
+
+    The cluster runs on max(container_nodes, content_nodes) docker containers: container i hosts the i-th container
+    node and the i-th content node, and the first one also runs the config server. With the defaults everything
+    runs in the single `vespa` container, as before.
+
+    Args:
+        container_nodes: nodes of the container cluster serving feed and search
+        content_nodes: nodes of the content cluster storing the documents
+        redundancy: copies stored of every document
+        searchable_copies: copies indexed for search, at most redundancy; None uses Vespa's default
+        jvm_allocated_memory: share of each container node's memory given to the JVM heap, e.g. "50%"
+        search_threads, feed_threads: sizes of the container's search and document-api thread pools
+        proton_search_threads: threads each content node uses to serve searches
+        feeding_concurrency: share (0-1] of each content node's cores used for feeding
+    """
+
+    def __init__(self, container_nodes: int = 1, content_nodes: int = 1, redundancy: int = 2,
+                 searchable_copies: Optional[int] = None, jvm_allocated_memory: Optional[str] = None,
+                 search_threads: Optional[int] = None, feed_threads: Optional[int] = None,
+                 proton_search_threads: Optional[int] = None, feeding_concurrency: Optional[float] = None):
+        if container_nodes < 1 or content_nodes < 1:
+            raise ValueError("The cluster needs at least one container node and one content node")
+        if searchable_copies is not None and not 1 <= searchable_copies <= redundancy:
+            raise ValueError(f"searchable_copies must be between 1 and redundancy ({redundancy}), "
+                             f"got {searchable_copies}")
+        if feeding_concurrency is not None and not 0 < feeding_concurrency <= 1:
+            raise ValueError(f"feeding_concurrency must be in (0, 1], got {feeding_concurrency}")
+        self.container_nodes = container_nodes
+        self.content_nodes = content_nodes
+        self.redundancy = redundancy
+        self.searchable_copies = searchable_copies
+        self.jvm_allocated_memory = jvm_allocated_memory
+        self.search_threads = search_threads
+        self.feed_threads = feed_threads
+        self.proton_search_threads = proton_search_threads
+        self.feeding_concurrency = feeding_concurrency
+
+    @property
+    def num_hosts(self) -> int:
+        return max(self.container_nodes, self.content_nodes)
+
+    @property
+    def is_multi_node(self) -> bool:
+        return self.num_hosts > 1
+
+    def host_alias(self, i: int) -> str:
+        return f"node{i + 1}"
+
+    def hostname(self, i: int) -> str:
+        """The hostname (and docker network alias) of the i-th docker container."""
+        return "vespa-container" if not self.is_multi_node else f"vespa-{i + 1}"
+
+    def container_name(self, i: int) -> str:
+        """The first container keeps the name `vespa` so single- and multi-node clusters are managed alike."""
+        return CONTAINER_NAME if i == 0 else f"{CONTAINER_NAME}-{i + 1}"
+
+
+def remove_vespa_containers() -> None:
+    subprocess.run(f"docker ps -aq --filter 'name=^{CONTAINER_NAME}(-[0-9]+)?$' | xargs -r docker rm -f",
+                   shell=True, capture_output=True)
+
+
+def start_vespa(spec: Optional[ClusterSpec] = None) -> None:
+    """Starts one docker container per host of the cluster. A multi-node cluster runs on its own docker network,
+    where the containers reach each other by the hostnames in hosts.xml. The first container publishes the
+    usual ports; further container nodes publish their query and feed port on 8081, 8082, ..."""
+    spec = spec or ClusterSpec()
+    remove_vespa_containers()
+    if not spec.is_multi_node:
+        # check=True fails fast, e.g. when a port is taken, instead of waiting for a container that never starts
+        subprocess.run("docker run --detach "
+                       f"--name {CONTAINER_NAME} "
+                       f"--hostname {spec.hostname(0)} "
+                       "--publish 8080:8080 --publish 19071:19071 --publish 2181:2181 "
+                       f"vespaengine/vespa:{VESPA_VERSION}", shell=True, check=True)
+        return
 
-
-def start_vespa() -> None:
-    os.system("docker rm -f vespa 2>/dev/null || true")
-    os.system("docker run --detach "
-              "--name vespa "
-              "--hostname vespa-container "
-              "--publish 8080:8080 --publish 19071:19071 --publish 2181:2181 "
-              f"vespaengine/vespa:{VESPA_VERSION}")
-
-
-def get_services_xml_content() -> str:
-    return textwrap.dedent(
-    """<?xml version="1.0" encoding="utf-8" ?>
-    <!-- Copyright Yahoo. Licensed under the terms of the Apache 2.0 license. See LICENSE in the project root. -->
-    <services version="1.0" xmlns:deploy="vespa" xmlns:preprocess="properties">
-        <container id="default" version="1.0">
-            <document-api/>
-            <search/>
-            <nodes>
-                <node hostalias="node1"/>
-            </nodes>
-        </container>
-        <content id="content_default" version="1.0">
-            <redundancy>2</redundancy>
-            <documents>
-                <document type="test_vespa_client" mode="index"/>
-            </documents>
-            <nodes>
-                <node hostalias="node1" distribution-key="0"/>
-            </nodes>
-        </content>
-    </services>
-    """)
+    subprocess.run(f"docker network inspect {NETWORK_NAME} >/dev/null 2>&1 || docker network create {NETWORK_NAME}",
+                   shell=True, check=True)
+    for i in range(spec.num_hosts):
+        if i == 0:
+            ports, services = "--publish 8080:8080 --publish 19071:19071 --publish 2181:2181 ", "configserver,services"
+        else:
+            ports = f"--publish {8080 + i}:8080 " if i < spec.container_nodes else ""
+            # The other nodes only run services and get their configuration from the first node
+            services = "services"
+        subprocess.run("docker run --detach "
+                       f"--name {spec.container_name(i)} "
+                       f"--hostname {spec.hostname(i)} "
+                       f"--network {NETWORK_NAME} --network-alias {spec.hostname(i)} "
+                       f"--env VESPA_CONFIGSERVERS={spec.hostname(0)} "
+                       f"{ports}"
+                       f"vespaengine/vespa:{VESPA_VERSION} {services}", shell=True, check=True)
+
+
+def watch_container_start() -> subprocess.Popen:
+    """Subscribes to the docker `start` event of the Vespa container. Call it before starting the container so
+    the event cannot be missed."""
+    return subprocess.Popen(
+        ["docker", "events", "--filter", f"container={CONTAINER_NAME}", "--filter", "event=start",
+         "--format", "{{.Status}}"],
+        stdout=subprocess.PIPE, text=True
+    )
+
+
+def wait_until(condition: Callable[[], bool], timeout_s: float, poll_interval_s: float = POLL_INTERVAL_S) -> bool:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            if condition():
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(poll_interval_s)
+    return False
+
+
+def _to_xml(root: ElementTree.Element, comment: Optional[str] = None) -> str:
+    ElementTree.indent(root, space="    ")
+    header = '<?xml version="1.0" encoding="utf-8" ?>\n' + (f"<!-- {comment} -->\n" if comment else "")
+    return header + ElementTree.tostring(root, encoding="unicode") + "\n"
+
+
+def _add_threadpool(parent: ElementTree.Element, threads: Optional[int]) -> None:
+    if threads is not None:
+        ElementTree.SubElement(ElementTree.SubElement(parent, "threadpool"), "threads").text = str(threads)
+
+
+def get_services_xml_content(spec: Optional[ClusterSpec] = None) -> str:
+    spec = spec or ClusterSpec()
+    services = ElementTree.Element("services", {"version": "1.0", "xmlns:deploy": "vespa",
+                                                "xmlns:preprocess": "properties"})
+    if spec.is_multi_node:
+        admin = ElementTree.SubElement(services, "admin", version="2.0")
+        ElementTree.SubElement(admin, "adminserver", hostalias=spec.host_alias(0))
+        configservers = ElementTree.SubElement(admin, "configservers")
+        ElementTree.SubElement(configservers, "configserver", hostalias=spec.host_alias(0))
+
+    container = ElementTree.SubElement(services, "container", id="default", version="1.0")
+    _add_threadpool(ElementTree.SubElement(container, "document-api"), spec.feed_threads)
+    _add_threadpool(ElementTree.SubElement(container, "search"), spec.search_threads)
+    container_nodes = ElementTree.SubElement(container, "nodes")
+    if spec.jvm_allocated_memory is not None:
+        ElementTree.SubElement(container_nodes, "jvm", {"allocated-memory": spec.jvm_allocated_memory})
+    for i in range(spec.container_nodes):
+        ElementTree.SubElement(container_nodes, "node", hostalias=spec.host_alias(i))
+
+    content = ElementTree.SubElement(services, "content", id="content_default", version="1.0")
+    ElementTree.SubElement(content, "redundancy").text = str(spec.redundancy)
+    documents = ElementTree.SubElement(content, "documents")
+    ElementTree.SubElement(documents, "document", type="test_vespa_client", mode="index")
+    if spec.searchable_copies is not None or spec.proton_search_threads is not None \
+            or spec.feeding_concurrency is not None:
+        proton = ElementTree.SubElement(ElementTree.SubElement(content, "engine"), "proton")
+        if spec.searchable_copies is not None:
+            ElementTree.SubElement(proton, "searchable-copies").text = str(spec.searchable_copies)
+        if spec.proton_search_threads is not None or spec.feeding_concurrency is not None:
+            searchnode = ElementTree.SubElement(ElementTree.SubElement(proton, "tuning"), "searchnode")
+        if spec.proton_search_threads is not None:
+            requestthreads = ElementTree.SubElement(searchnode, "requestthreads")
+            ElementTree.SubElement(requestthreads, "search").text = str(spec.proton_search_threads)
+        if spec.feeding_concurrency is not None:
+            feeding = ElementTree.SubElement(searchnode, "feeding")
+            ElementTree.SubElement(feeding, "concurrency").text = str(spec.feeding_concurrency)
+    content_nodes = ElementTree.SubElement(content, "nodes")
+    for i in range(spec.content_nodes):
+        ElementTree.SubElement(content_nodes, "node", hostalias=spec.host_alias(i), **{"distribution-key": str(i)})
+
+    return _to_xml(services, "Copyright Yahoo. Licensed under the terms of the Apache 2.0 license. "
+                             "See LICENSE in the project root.")
+
+
+def get_hosts_xml_content(spec: ClusterSpec) -> str:
+    """Maps the host aliases used in services.xml to the hostnames of the docker containers."""
+    hosts = ElementTree.Element("hosts")
+    for i in range(spec.num_hosts):
+        host = ElementTree.SubElement(hosts, "host", name=spec.hostname(i))
+        ElementTree.SubElement(host, "alias").text = spec.host_alias(i)
+    return _to_xml(hosts)
 
 
 def get_test_vespa_client_schema_content() -> str:
@@ -92,66 +251,35 @@ def get_test_vespa_client_schema_content() -> str:
     """)
 
 
-def generate_application_package() -> str:
-    base_dir = "vespa_dummy_application_package"
-    subdirs = ["schemas"]
-    files = {
-        "schemas": ["test_vespa_client.sd"],
-        "": ["services.xml"]
-    }
-    # Content for the files
-    content_for_services_xml = get_services_xml_content()
-    content_for_test_vespa_client_sd = get_test_vespa_client_schema_content()
-    # Create the directories and files, and write content
-    os.makedirs(base_dir, exist_ok=True)
-    for subdir in subdirs:
-        os.makedirs(os.path.join(base_dir, subdir), exist_ok=True)
-        for file in files[subdir]:
-            file_path = os.path.join(base_dir, subdir, file)
-            with open(file_path, 'w') as f:
-                if file == "test_vespa_client.sd":
-                    f.write(content_for_test_vespa_client_sd)
-    for file in files[""]:
-        file_path = os.path.join(base_dir, file)
-        with open(file_path, 'w') as f:
-            if file == "services.xml":
-                f.write(content_for_services_xml)
-    os.chdir(base_dir)
-    shutil.make_archive('../' + base_dir, 'zip', ".")
-    os.chdir("..")
-    zip_file_path = f"{base_dir}.zip"
-
-    if os.path.isfile(zip_file_path):
-        print(f"Zip file created successfully: {zip_file_path}")
-        # Remove the base directory
-        shutil.rmtree(base_dir)
-        print(f"Directory {base_dir} removed.")
-        return zip_file_path
-    else:
-        print("Failed to create the zip file.")
-
-
-def deploy_application_package(zip_file_path: str, max_retries: int = 5, backoff_factor: float = 0.5) -> None:
+def generate_application_package(spec: Optional[ClusterSpec] = None) -> bytes:
+    """Returns the application package as an in-memory zip file."""
+    spec = spec or ClusterSpec()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("services.xml", get_services_xml_content(spec))
+        if spec.is_multi_node:
+            package.writestr("hosts.xml", get_hosts_xml_content(spec))
+        package.writestr("schemas/test_vespa_client.sd", get_test_vespa_client_schema_content())
+    print("Application package generated.")
+    return buffer.getvalue()
+
+
+def deploy_application_package(zip_content: bytes, max_retries: int = 5, backoff_factor: float = 0.5) -> None:
     # URL and headers
     url = "http://localhost:19071/application/v2/tenant/default/prepareandactivate"
     headers = {
         "Content-Type": "application/zip"
     }
 
-    # Ensure the zip file exists
-    if not os.path.isfile(zip_file_path):
-        print("Zip file does not exist.")
-        return
-
     print("Start deploying the application package...")
 
     # Attempt to send the request with retries
     for attempt in range(max_retries):
         try:
-            with open(zip_file_path, 'rb') as zip_file:
-                response = requests.post(url, headers=headers, data=zip_file)
+            response = requests.post(url, headers=headers, data=zip_content)
             print(response.text)
-            break  # Success, exit the retry loop
+            response.raise_for_status()
+            return
         except requests.exceptions.RequestException as e:
             print(f"Attempt {attempt + 1} failed due to a request error: {e}")
             if attempt < max_retries - 1:
@@ -159,63 +287,89 @@ def deploy_application_package(zip_file_path: str, max_retries: int = 5, backoff
                 sleep_time = backoff_factor * (2 ** attempt)
                 print(f"Retrying in {sleep_time} seconds...")
                 time.sleep(sleep_time)
-            else:
-                print("Max retries reached. Aborting.")
-                return
+    raise RuntimeError("Max retries reached. Failed to deploy the application package.")
 
-    # Cleanup
-    os.remove(zip_file_path)
-    print("Zip file removed.")
 
+def is_config_server_up(waiting_time: int = 120) -> bool:
+    """Waits for the config server's health endpoint to report `up`, after which deployments are accepted."""
+    def config_server_up() -> bool:
+        response = requests.get(CONFIG_SERVER_HEALTH_URL, timeout=1)
+        return response.ok and response.json().get("status", {}).get("code") == "up"
 
-def is_vespa_up(waiting_time: int = 60) -> bool:
-    for _ in range(waiting_time):
-        document_url = "http://localhost:8080"
-        try:
-            document_request = requests.get(document_url)
-            if document_request.status_code == 200:
-                print(f"Vespa is up and running! You can start Marqo. Make sure you set the Vespa environment variable")
-                return True
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(1)
+    if wait_until(config_server_up, waiting_time):
+        print("Vespa config server is up.")
+        return True
+    print(f"Vespa config server is not up after {waiting_time}s")
+    return False
 
-    print(f"Vespa is not up and running after {waiting_time}s")
 
+def is_vespa_up(waiting_time: int = 60) -> bool:
+    def container_cluster_up() -> bool:
+        return requests.get("http://localhost:8080", timeout=1).status_code == 200
 
-def wait_vespa_container_running(max_wait_time: int = 60):
-    start_time = time.time()
-    # Check if the container is running
-    while True:
-        if time.time() - start_time > max_wait_time:
-            print("Maximum wait time exceeded. Vespa container may not be running.")
-            break
+    if wait_until(container_cluster_up, waiting_time):
+        print(f"Vespa is up and running! You can start Marqo. Make sure you set the Vespa environment variable")
+        return True
+    print(f"Vespa is not up and running after {waiting_time}s")
+    return False
 
-        try:
-            output = subprocess.check_output(["docker", "inspect", "--format", "{{.State.Status}}", "vespa"])
-            if output.decode().strip() == "running":
-                print("Vespa container is up and running.")
-                break
-        except subprocess.CalledProcessError:
-            pass
 
-        print("Waiting for Vespa container to start...")
-        time.sleep(5)
+def wait_vespa_container_running(events: subprocess.Popen, max_wait_time: int = 600) -> bool:
+    """Waits for the `start` event of the Vespa container, which includes the time it takes to pull the image."""
+    try:
+        ready, _, _ = select.select([events.stdout], [], [], max_wait_time)
+        if ready and events.stdout.readline():
+            print("Vespa container is up and running.")
+            return True
+        print("Maximum wait time exceeded. Vespa container may not be running.")
+        return False
+    finally:
+        events.terminate()
+
+
+def parse_cluster_spec(argv: Optional[List[str]] = None) -> ClusterSpec:
+    parser = argparse.ArgumentParser(description="Start a local Vespa cluster and deploy a dummy application")
+    parser.add_argument("--container-nodes", type=int, default=1)
+    parser.add_argument("--content-nodes", type=int, default=1)
+    parser.add_argument("--redundancy", type=int, default=2)
+    parser.add_argument("--searchable-copies", type=int)
+    parser.add_argument("--jvm-allocated-memory", help="JVM heap of the container nodes, e.g. 50%%")
+    parser.add_argument("--search-threads", type=int, help="container search thread pool size")
+    parser.add_argument("--feed-threads", type=int, help="container document-api thread pool size")
+    parser.add_argument("--proton-search-threads", type=int, help="search threads per content node")
+    parser.add_argument("--feeding-concurrency", type=float, help="share of content node cores used for feeding")
+    return ClusterSpec(**vars(parser.parse_args(argv)))
 
 
 def main():
+    spec = parse_cluster_spec()
     try:
-        # Start Vespa
-        start_vespa()
-        # Wait for the container is pulled and running
-        wait_vespa_container_running()
-        # Generate the application package
-        zip_file_path = generate_application_package()
+        # Pull and start Vespa in the background while the application package is generated
+        events = watch_container_start()
+        start_errors = []
+
+        def start():
+            try:
+                start_vespa(spec)
+            except Exception as e:
+                start_errors.append(e)
+
+        starter = threading.Thread(target=start)
+        starter.start()
+        zip_content = generate_application_package(spec)
+        starter.join()
+        if start_errors:
+            # Fail fast rather than waiting for a container start event that will never come
+            events.kill()
+            raise start_errors[0]
+        # Wait for the container to be running and the config server to accept deployments
+        if not wait_vespa_container_running(events) or not is_config_server_up():
+            sys.exit(1)
         # Deploy the application package
-        time.sleep(10)
-        deploy_application_package(zip_file_path)
+        deploy_application_package(zip_content)
         # Check if Vespa is up and running
-        is_vespa_up()
+        if not is_vespa_up():
+            sys.exit(1)
     except Exception as e:
         print(f"An error occurred when staring vespa: {e}")
         sys.exit(1)
@@ -223,5 +377,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
@@ -1,4 +1,3 @@
-import uuid
 from unittest import mock
 
 import pytest
@@ -10,18 +9,14 @@ from tests.marqo_test import MarqoTestCase
 
 @pytest.mark.cuda_test
 class TestCudaStructuredAddDocuments(MarqoTestCase):
-    text_index_name = "add_doc_api_test_structured_index" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "add_doc_api_test_structured_image_index" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -31,7 +26,6 @@ class TestCudaStructuredAddDocuments(MarqoTestCase):
                 "tensorFields": ["title", "content"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -43,12 +37,6 @@ class TestCudaStructuredAddDocuments(MarqoTestCase):
         ]
         )
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def test_add_documents_with_ids(self):
         d1 = {
             "title": "Cool Document 1",
@@ -165,29 +153,18 @@ class TestCudaUnstructuredAddDocuments(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai",
                 "treatUrlsAndPointersAsImages": True,
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def test_add_documents_with_ids(self):
         d1 = {
             "doc_title": "Cool Document 1",
@@ -294,7 +271,7 @@ class TestCudaUnstructuredAddDocuments(MarqoTestCase):
 
     def test_add_document_multimodal(self):
         """Test that adding a document with a multimodal field works"""
-        image_content = "https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"
+        image_content = self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg")
 
         documents = [
             {
@@ -1,4 +1,3 @@
-import uuid
 from typing import Dict
 
 import pytest
@@ -6,9 +5,8 @@ import pytest
 from tests.marqo_test import MarqoTestCase
 
 
-def generate_structured_index_settings_dict(index_name, image_preprocessing_method) -> Dict:
+def generate_structured_index_settings_dict(image_preprocessing_method) -> Dict:
     return {
-        "indexName": index_name,
         "type": "structured",
         "model": "open_clip/ViT-B-32/openai",
         "allFields": [{"name": "image_content", "type": "image_pointer"},
@@ -18,9 +16,8 @@ def generate_structured_index_settings_dict(index_name, image_preprocessing_meth
     }
 
 
-def generate_unstructured_index_settings_dict(index_name, image_preprocessing_method) -> Dict:
+def generate_unstructured_index_settings_dict(image_preprocessing_method) -> Dict:
     return {
-        "indexName": index_name,
         "type": "unstructured",
         "model": "open_clip/ViT-B-32/openai",
         "treatUrlsAndPointersAsImages": True,
@@ -37,80 +34,43 @@ class TestUnstructuredImageChunking(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.unstructured_no_image_processing_index_name = (
-                "unstructured_no_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.unstructured_simple_image_processing_index_name = (
-                "unstructured_simple_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.unstructured_frcnn_image_processing_index_name = (
-                "unstructured_frcnn_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.unstructured_dino_v1_image_processing_index_name = (
-                "unstructured_dino_v1_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.unstructured_dino_v2_image_processing_index_name = (
-                "unstructured_dino_v2_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.unstructured_marqo_yolo_image_processing_index_name = (
-                "unstructured_marqo_yolo_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-
-        cls.structured_no_image_processing_index_name = (
-                "structured_no_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_simple_image_processing_index_name = (
-                "structured_simple_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_frcnn_image_processing_index_name = (
-                "structured_frcnn_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_dino_v1_image_processing_index_name = (
-                "structured_dino_v1_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_dino_v2_image_processing_index_name = (
-                "structured_dino_v2_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_marqo_yolo_image_processing_index_name = (
-                "structured_marqo_yolo_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-
-        # create the structured indexes
-        cls.create_indexes(
-            [
-                generate_structured_index_settings_dict(cls.structured_no_image_processing_index_name, None),
-                generate_structured_index_settings_dict(cls.structured_simple_image_processing_index_name, "simple"),
-                generate_structured_index_settings_dict(cls.structured_frcnn_image_processing_index_name, "frcnn"),
-                generate_structured_index_settings_dict(cls.structured_dino_v1_image_processing_index_name, "dino-v1"),
-                generate_structured_index_settings_dict(cls.structured_dino_v2_image_processing_index_name, "dino-v2"),
-                generate_structured_index_settings_dict(cls.structured_marqo_yolo_image_processing_index_name,
-                                                        "marqo-yolo"),
-            ]
-        )
-
-        # create the unstructured indexes
-        cls.create_indexes(
-            [
-                generate_unstructured_index_settings_dict(cls.unstructured_no_image_processing_index_name, None),
-                generate_unstructured_index_settings_dict(cls.unstructured_simple_image_processing_index_name,
-                                                          "simple"),
-                generate_unstructured_index_settings_dict(cls.unstructured_frcnn_image_processing_index_name, "frcnn"),
-                generate_unstructured_index_settings_dict(cls.unstructured_dino_v1_image_processing_index_name,
-                                                          "dino-v1"),
-                generate_unstructured_index_settings_dict(cls.unstructured_dino_v2_image_processing_index_name,
-                                                          "dino-v2"),
-                generate_unstructured_index_settings_dict(cls.unstructured_marqo_yolo_image_processing_index_name,
-                                                          "marqo-yolo"),
-            ]
-        )
-
-        cls.indexes_to_delete = [
+        # lease the structured indexes
+        (
+            cls.structured_no_image_processing_index_name,
+            cls.structured_simple_image_processing_index_name,
+            cls.structured_frcnn_image_processing_index_name,
+            cls.structured_dino_v1_image_processing_index_name,
+            cls.structured_dino_v2_image_processing_index_name,
+            cls.structured_marqo_yolo_image_processing_index_name,
+        ) = cls.lease_indexes([
+            generate_structured_index_settings_dict(None),
+            generate_structured_index_settings_dict("simple"),
+            generate_structured_index_settings_dict("frcnn"),
+            generate_structured_index_settings_dict("dino-v1"),
+            generate_structured_index_settings_dict("dino-v2"),
+            generate_structured_index_settings_dict("marqo-yolo"),
+        ])
+
+        # lease the unstructured indexes
+        (
             cls.unstructured_no_image_processing_index_name,
             cls.unstructured_simple_image_processing_index_name,
             cls.unstructured_frcnn_image_processing_index_name,
             cls.unstructured_dino_v1_image_processing_index_name,
             cls.unstructured_dino_v2_image_processing_index_name,
             cls.unstructured_marqo_yolo_image_processing_index_name,
-
-            cls.structured_no_image_processing_index_name,
-            cls.structured_simple_image_processing_index_name,
-            cls.structured_frcnn_image_processing_index_name,
-            cls.structured_dino_v1_image_processing_index_name,
-            cls.structured_dino_v2_image_processing_index_name,
-            cls.structured_marqo_yolo_image_processing_index_name
-        ]
+        ) = cls.lease_indexes([
+            generate_unstructured_index_settings_dict(None),
+            generate_unstructured_index_settings_dict("simple"),
+            generate_unstructured_index_settings_dict("frcnn"),
+            generate_unstructured_index_settings_dict("dino-v1"),
+            generate_unstructured_index_settings_dict("dino-v2"),
+            generate_unstructured_index_settings_dict("marqo-yolo"),
+        ])
 
     def test_image_no_chunking(self):
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_no_image_processing_index_name, {"tensor_fields": ["image_content"]},
@@ -137,7 +97,7 @@ class TestUnstructuredImageChunking(MarqoTestCase):
 
     def test_image_simple_chunking(self):
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_simple_image_processing_index_name, {"tensor_fields": ["image_content"]},
@@ -167,7 +127,7 @@ class TestUnstructuredImageChunking(MarqoTestCase):
 
     def test_image_frcnn_chunking(self):
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_frcnn_image_processing_index_name, {"tensor_fields": ["image_content"]},
@@ -197,7 +157,7 @@ class TestUnstructuredImageChunking(MarqoTestCase):
 
     def test_image_dino_v1_chunking(self):
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_dino_v1_image_processing_index_name, {"tensor_fields": ["image_content"]},
@@ -227,7 +187,7 @@ class TestUnstructuredImageChunking(MarqoTestCase):
 
     def test_image_dino_v2_chunking(self):
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_dino_v2_image_processing_index_name, {"tensor_fields": ["image_content"]},
@@ -258,7 +218,7 @@ class TestUnstructuredImageChunking(MarqoTestCase):
     def test_image_marqo_yolo_chunking(self):
 
         # image_size = (256, 384)
-        temp_file_name = 'https://avatars.githubusercontent.com/u/13092433?v=4'
+        temp_file_name = self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
 
         test_case = [
             (self.unstructured_marqo_yolo_image_processing_index_name, {"tensor_fields": ["image_content"]},
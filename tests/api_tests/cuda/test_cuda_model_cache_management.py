@@ -1,5 +1,3 @@
-import uuid
-
 import pytest
 from marqo.errors import MarqoWebError
 
@@ -13,12 +11,8 @@ class TestModlCacheManagement(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -27,14 +21,11 @@ class TestModlCacheManagement(MarqoTestCase):
                 "tensorFields": ["title"]
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "type": "unstructured",
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     def test_get_cuda_info(self) -> None:
         for index_name in [self.structured_index_name, self.unstructured_index_name]:
             with self.subTest(index_name):
@@ -1,5 +1,4 @@
 import copy
-import uuid
 
 import marqo
 import pytest
@@ -11,19 +10,14 @@ from tests.marqo_test import MarqoTestCase
 
 @pytest.mark.cuda_test
 class TestCudaStructuredSearch(MarqoTestCase):
-    text_index_name = "api_test_structured_index_text" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "api_test_structured_image_index_image" + str(uuid.uuid4()).replace('-', '')
-    filter_test_index_name = "api_test_structured_filter_index_filter" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        cls.text_index_name, cls.filter_test_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -33,7 +27,6 @@ class TestCudaStructuredSearch(MarqoTestCase):
                 "tensorFields": ["title", "content"],
             },
             {
-                "indexName": cls.filter_test_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -45,7 +38,6 @@ class TestCudaStructuredSearch(MarqoTestCase):
                 "tensorFields": ["field_a", "field_b"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -57,12 +49,6 @@ class TestCudaStructuredSearch(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name, cls.filter_test_index_name]
-
-    def setUp(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     @staticmethod
     def strip_marqo_fields(doc, strip_id=True):
         """Strips Marqo fields from a returned doc to get the original doc"""
@@ -216,9 +202,9 @@ class TestCudaStructuredSearch(MarqoTestCase):
     def test_multi_queries(self):
         docs = [
             {
-                "content": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png",
+                "content": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"),
                 "_id": 'realistic_hippo'},
-            {"content": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png",
+            {"content": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"),
              "_id": 'artefact_hippo'}
         ]
 
@@ -229,10 +215,10 @@ class TestCudaStructuredSearch(MarqoTestCase):
         queries_expected_ordering = [
             ({"Nature photography": 2.0, "Artefact": -2}, ['realistic_hippo', 'artefact_hippo']),
             ({"Nature photography": -1.0, "Artefact": 1.0}, ['artefact_hippo', 'realistic_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": -1.0,
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): -1.0,
               "blah": 1.0}, ['realistic_hippo', 'artefact_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": 2.0,
-              "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png": -1.0},
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): 2.0,
+              self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"): -1.0},
              ['artefact_hippo', 'realistic_hippo']),
         ]
         for query, expected_ordering in queries_expected_ordering:
@@ -289,28 +275,17 @@ class TestCudaUnstructuredSearch(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai"
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     @staticmethod
     def strip_marqo_fields(doc, strip_id=True):
         """Strips Marqo fields from a returned doc to get the original doc"""
@@ -484,9 +459,9 @@ class TestCudaUnstructuredSearch(MarqoTestCase):
     def test_multi_queries(self):
         docs = [
             {
-                "loc a": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png",
+                "loc a": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"),
                 "_id": 'realistic_hippo'},
-            {"loc b": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png",
+            {"loc b": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"),
              "_id": 'artefact_hippo'}
         ]
         image_index_config = {
@@ -503,10 +478,10 @@ class TestCudaUnstructuredSearch(MarqoTestCase):
         queries_expected_ordering = [
             ({"Nature photography": 2.0, "Artefact": -2}, ['realistic_hippo', 'artefact_hippo']),
             ({"Nature photography": -1.0, "Artefact": 1.0}, ['artefact_hippo', 'realistic_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": -1.0,
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): -1.0,
               "blah": 1.0}, ['realistic_hippo', 'artefact_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": 2.0,
-              "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png": -1.0},
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): 2.0,
+              self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"): -1.0},
              ['artefact_hippo', 'realistic_hippo']),
         ]
         for query, expected_ordering in queries_expected_ordering:
@@ -1,5 +1,3 @@
-import uuid
-
 import pytest
 
 from tests.marqo_test import MarqoTestCase
@@ -18,20 +16,14 @@ class TestCudaSentenceChunking(MarqoTestCase):
         super().setUpClass()
 
         # A very large split length
-        cls.large_structured_index_name = "structured_large" + str(uuid.uuid4()).replace('-', '')
         # A standard split length 2, with 0 split overlap
-        cls.standard_structured_index_name = "structured_standard" + str(uuid.uuid4()).replace('-', '')
         # A standard split length 2, with 1 split overlap
-        cls.overlap_structured_index_name = "structured_overlap" + str(uuid.uuid4()).replace('-', '')
-
-        cls.large_unstructured_index_name = "unstructured_large" + str(uuid.uuid4()).replace('-', '')
-        cls.standard_unstructured_index_name = "unstructured_standard" + str(uuid.uuid4()).replace('-', '')
-        cls.overlap_unstructured_index_name = "unstructured_overlap" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        (cls.large_structured_index_name, cls.standard_structured_index_name, cls.overlap_structured_index_name,
+         cls.large_unstructured_index_name, cls.standard_unstructured_index_name,
+         cls.overlap_unstructured_index_name) = cls.lease_indexes([
             # Structured Indexes
             {
-                "indexName": cls.large_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": int(1e3),
@@ -44,7 +36,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3"]
             },
             {
-                "indexName": cls.standard_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -57,7 +48,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3"]
             },
             {
-                "indexName": cls.overlap_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -71,7 +61,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
             },
             # Unstructured Indexes
             {
-                "indexName": cls.large_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": int(1e3),
@@ -80,7 +69,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 },
             },
             {
-                "indexName": cls.standard_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -89,7 +77,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 },
             },
             {
-                "indexName": cls.overlap_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -99,16 +86,6 @@ class TestCudaSentenceChunking(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [
-            cls.large_structured_index_name,
-            cls.standard_structured_index_name,
-            cls.overlap_structured_index_name,
-
-            cls.large_unstructured_index_name,
-            cls.standard_unstructured_index_name,
-            cls.overlap_unstructured_index_name
-        ]
-
     def test_sentence_no_chunking(self):
         document = {'_id': '1',  # '_id' can be provided but is not required
                     'text_field_1': 'hello. how are you. another one.',
@@ -120,7 +97,7 @@ class TestCudaSentenceChunking(MarqoTestCase):
         for index_name in [self.large_structured_index_name, self.large_structured_index_name]:
             with self.subTest(index_name):
                 self.client.index(index_name).add_documents([document], tensor_fields=unstructured_tensor_fields if \
-                    index_name.startswith("un") else None, device="cuda")
+                    self.is_unstructured(index_name) else None, device="cuda")
 
                 # test the search works
                 results = self.client.index(index_name).search('hello how are you', device="cuda")
@@ -154,7 +131,7 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 with self.subTest(f"{search_term}, {index_name}"):
                     self.client.index(index_name).add_documents(
                         documents=[document], tensor_fields=unstructured_tensor_fields if \
-                            index_name.startswith("un") else None, device="cuda"
+                            self.is_unstructured(index_name) else None, device="cuda"
                     )
 
                     res = self.client.index(index_name).search(search_term, device="cuda")
@@ -188,7 +165,7 @@ class TestCudaSentenceChunking(MarqoTestCase):
                 with self.subTest(f"{search_term}, {index_name}"):
                     self.client.index(index_name).add_documents(
                         documents=[document], tensor_fields=unstructured_tensor_fields if \
-                            index_name.startswith("un") else None, device="cuda"
+                            self.is_unstructured(index_name) else None, device="cuda"
                     )
 
                     res = self.client.index(index_name).search(search_term, device="cuda")
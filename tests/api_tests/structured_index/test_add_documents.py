@@ -1,5 +1,4 @@
 import copy
-import uuid
 from unittest import mock
 import pytest
 
@@ -10,20 +9,15 @@ from tests.marqo_test import MarqoTestCase
 
     
 class TestStructuredAddDocuments(MarqoTestCase):
-    text_index_name = "add_doc_api_test_structured_index" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "add_doc_api_test_structured_image_index" + str(uuid.uuid4()).replace('-', '')
-    structured_languagebind_index_name = "add_doc_api_test_structured_languagebind_index" + str(uuid.uuid4()).replace('-', '')
-    text_index_with_normalize_embeddings_true = "add_doc_api_test_structured_index_with_normalize_embeddings_true" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        (cls.text_index_name, cls.image_index_name, cls.structured_languagebind_index_name,
+         cls.text_index_with_normalize_embeddings_true) = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "normalizeEmbeddings": False,
@@ -43,7 +37,6 @@ class TestStructuredAddDocuments(MarqoTestCase):
                 "tensorFields": ["title", "content", "custom_vector_field_1"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -53,7 +46,6 @@ class TestStructuredAddDocuments(MarqoTestCase):
                 "tensorFields": ["title", "image_content"],
             },
             {
-                "indexName": cls.structured_languagebind_index_name,
                 "type": "structured",
                 "model": "LanguageBind/Video_V1.5_FT_Audio_FT_Image",
                 "allFields": [
@@ -83,7 +75,6 @@ class TestStructuredAddDocuments(MarqoTestCase):
                 "tensorFields": ["multimodal_field", "text_field_3", "video_field_3", "audio_field_2", "image_field_2"]
             },
             {
-                "indexName": cls.text_index_with_normalize_embeddings_true,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "normalizeEmbeddings": True,
@@ -106,12 +97,6 @@ class TestStructuredAddDocuments(MarqoTestCase):
         ]
         )
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name, cls.structured_languagebind_index_name, cls.text_index_with_normalize_embeddings_true]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def test_add_documents_with_ids(self):
         d1 = {
             "title": "Cool Document 1",
@@ -377,15 +362,19 @@ class TestStructuredAddDocuments(MarqoTestCase):
     def test_add_multimodal_single_documents(self):
         documents = [
             {
-                "video_field_3": "https://marqo-k400-video-test-dataset.s3.amazonaws.com/videos/---QUuC4vJs_000084_000094.mp4",
+                "video_field_3": self.media_url(
+                    "https://marqo-k400-video-test-dataset.s3.amazonaws.com/videos/---QUuC4vJs_000084_000094.mp4"),
                 "_id": "1"
             },
             {
-                "audio_field_2": "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3",
+                "audio_field_2": self.media_url(
+                    "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3"),
                 "_id": "2"
             },
             {
-                "image_field_2": "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png",
+                "image_field_2": self.media_url(
+                    "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png"
+                ),
                 "_id": "3"
             },
             {
@@ -419,7 +408,9 @@ class TestStructuredAddDocuments(MarqoTestCase):
                 "_id": "2"
             },
             {
-                "image_field_2": "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png",
+                "image_field_2": self.media_url(
+                    "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png"
+                ),
                 "_id": "3"
             },
             {
@@ -463,15 +454,19 @@ class TestStructuredAddDocuments(MarqoTestCase):
     def test_add_documents_with_mismatched_media_fields(self):
         documents = [
             {
-                "video_field_3": "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3",
+                "video_field_3": self.media_url(
+                    "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3"),
                 "_id": "1"
             },
             {
-                "audio_field_2": "https://marqo-k400-video-test-dataset.s3.amazonaws.com/videos/---QUuC4vJs_000084_000094.mp4",
+                "audio_field_2": self.media_url(
+                    "https://marqo-k400-video-test-dataset.s3.amazonaws.com/videos/---QUuC4vJs_000084_000094.mp4"),
                 "_id": "2"
             },
             {
-                "image_field_2": "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png",
+                "image_field_2": self.media_url(
+                    "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_realistic.png"
+                ),
                 "_id": "3"
             },
             {
@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.errors import MarqoWebError
 
@@ -7,8 +5,6 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestStructuredDeleteDocuments(MarqoTestCase):
-    text_index_name = "api_test_structured_index" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "api_test_structured_image_index" + str(uuid.uuid4()).replace('-', '')
 
     @classmethod
     def setUpClass(cls):
@@ -16,9 +12,8 @@ class TestStructuredDeleteDocuments(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -28,7 +23,6 @@ class TestStructuredDeleteDocuments(MarqoTestCase):
                 "tensorFields": ["title", "content"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -39,12 +33,6 @@ class TestStructuredDeleteDocuments(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def test_delete_docs(self):
         self.client.index(self.text_index_name).add_documents([
             {"title": "wow camel", "_id": "123"},
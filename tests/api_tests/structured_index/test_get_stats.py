@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.errors import MarqoWebError
 
@@ -7,8 +5,6 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestStructuredGetStats(MarqoTestCase):
-    text_index_name = "api_test_structured_index" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "api_test_structured_image_index" + str(uuid.uuid4()).replace('-', '')
 
     @classmethod
     def setUpClass(cls):
@@ -16,9 +12,8 @@ class TestStructuredGetStats(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -35,7 +30,6 @@ class TestStructuredGetStats(MarqoTestCase):
                 "tensorFields": ["title", "content", "my_multi_modal_field"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -53,13 +47,7 @@ class TestStructuredGetStats(MarqoTestCase):
                 "tensorFields": ["title", "image_content", "my_multi_modal_field"],
             }
         ])
-        cls.indexes_to_delete= [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
 
-    
     def test_get_status_response_format(self):
         res = self.client.index(self.text_index_name).get_stats()
         assert isinstance(res, dict)
@@ -105,7 +93,7 @@ class TestStructuredGetStats(MarqoTestCase):
     def test_get_status_response_results_image_index(self):
         """Ensure that the number of vectors and documents is correct, with or without mappings"""
 
-        image_content = "https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"
+        image_content = self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg")
 
         test_cases = [
             ([
@@ -1,5 +1,4 @@
 import copy
-import uuid
 from unittest import mock
 
 import marqo
@@ -12,20 +11,15 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestStructuredHybridSearch(MarqoTestCase):
-    text_index_name = "api_test_structured_index_text" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "api_test_structured_image_index_image" + str(uuid.uuid4()).replace('-', '')
-    unstructured_text_index_name = "api_test_unstructured_index_text" + str(uuid.uuid4()).replace('-', '')
-    unstructured_image_index_name = "api_test_unstructured_image_index_image" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        (cls.text_index_name, cls.image_index_name, cls.unstructured_text_index_name,
+         cls.unstructured_image_index_name) = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -40,7 +34,6 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3"]
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -54,23 +47,17 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3", "image_field_1", "image_field_2"],
             },
             {
-                "indexName": cls.unstructured_text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.unstructured_image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai",
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name, cls.unstructured_text_index_name,
-                                 cls.unstructured_image_index_name]
-
     def setUp(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
+        super().setUp()
 
         self.docs_list = [
             # similar semantics to dogs
@@ -115,7 +102,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                    if "unstructured" in index_name else None
+                    if self.is_unstructured(index_name) else None
                 )
                 sample_vector = [0.5 for _ in range(384)]
 
@@ -152,7 +139,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 hybrid_res = self.client.index(index_name).search(
@@ -191,7 +178,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 hybrid_res = self.client.index(index_name).search(
@@ -224,7 +211,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 with self.subTest("retrieval: disjunction, ranking: rrf"):
@@ -292,7 +279,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                         {"_id": "doc9", "text_field_1": "HELLO WORLD", "mult_field_1": 3.0},  # highest score
                         {"_id": "doc10", "text_field_1": "HELLO WORLD", "mult_field_2": 3.0},  # lowest score
                     ],
-                    tensor_fields=["text_field_1"] if "unstructured" in index_name else None
+                    tensor_fields=["text_field_1"] if self.is_unstructured(index_name) else None
                 )
 
                 with self.subTest("retrieval: lexical, ranking: tensor"):
@@ -423,7 +410,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 test_cases = [
@@ -463,7 +450,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 test_cases = [
@@ -643,7 +630,7 @@ class TestStructuredHybridSearch(MarqoTestCase):
                 self.client.index(index_name).add_documents(
                     self.docs_list,
                     tensor_fields=["text_field_1", "text_field_2", "text_field_3"] \
-                        if "unstructured" in index_name else None
+                        if self.is_unstructured(index_name) else None
                 )
 
                 default_hybrid_res = self.client.index(index_name).search(
@@ -1,7 +1,5 @@
-import uuid
 import random
 import threading
-import uuid
 
 import numpy as np
 import requests
@@ -12,22 +10,15 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestStructuredUpdateDocuments(MarqoTestCase):
-    update_doc_index_name = "update_doc_api_test_index" + str(uuid.uuid4()).replace('-', '')
-    large_score_modifier_index_name = ("update_doc_api_test_score_modifier_index" +
-                                        str(uuid.uuid4()).replace('-', ''))
-
-    test_unstructured_index_name = ("update_doc_api_test_unstructured_index" +
-                                    str(uuid.uuid4()).replace('-', ''))
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        (cls.update_doc_index_name, cls.large_score_modifier_index_name,
+         cls.test_unstructured_index_name) = cls.lease_indexes([
             {
-                "indexName": cls.update_doc_index_name,
                 "type": "structured",
                 "model": "random/small",
                 "allFields": [
@@ -54,7 +45,6 @@ class TestStructuredUpdateDocuments(MarqoTestCase):
                 "tensorFields": ["text_field_tensor", "multi_modal_field"],  # Specified as tensor fields
             },
             {
-                "indexName": cls.large_score_modifier_index_name,
                 "type": "structured",
                 "model": "random/small",
                 "allFields": [{"name": f"float_field_{i}", "type": "float", "features":
@@ -63,20 +53,12 @@ class TestStructuredUpdateDocuments(MarqoTestCase):
                 "tensorFields": ["text_field_tensor"],
             },
             {
-                "indexName": cls.test_unstructured_index_name,
                 "type": "unstructured",
                 "model": "random/small",
             }
         ]
         )
 
-        cls.indexes_to_delete = [cls.update_doc_index_name, cls.large_score_modifier_index_name,
-                                 cls.test_unstructured_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def set_up_for_text_field_test(self):
         """A helper function to set up the index to test the update document feature for text fields with
         different features."""
@@ -400,7 +382,7 @@ class TestStructuredUpdateDocuments(MarqoTestCase):
 
         Note: We can only update an image pointer field when it is not a tensor field."""
         original_doc = {
-            "image_pointer_field": "https://marqo-assets.s3.amazonaws.com/tests/images/image1.jpg",
+            "image_pointer_field": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image1.jpg"),
             "text_field_tensor": "search me",
             "_id": "1"
         }
@@ -410,7 +392,7 @@ class TestStructuredUpdateDocuments(MarqoTestCase):
         self.assertEqual(1, self.client.index(self.update_doc_index_name).get_stats()["numberOfDocuments"])
 
         updated_doc = {
-            "image_pointer_field": "https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg",
+            "image_pointer_field": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"),
             "_id": "1"
         }
         # Update the document's image pointer field
@@ -418,7 +400,7 @@ class TestStructuredUpdateDocuments(MarqoTestCase):
 
         # Retrieve the updated document to verify the update
         updated_doc = self.client.index(self.update_doc_index_name).get_document(updated_doc["_id"])
-        self.assertEqual("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg",
+        self.assertEqual(self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"),
                          updated_doc["image_pointer_field"])
 
     def test_update_multimodal_dependent_field(self):
@@ -1,5 +1,4 @@
 import copy
-import uuid
 from unittest import mock
 
 import marqo
@@ -12,19 +11,14 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestStructuredSearch(MarqoTestCase):
-    text_index_name = "api_test_structured_index_text" + str(uuid.uuid4()).replace('-', '')
-    image_index_name = "api_test_structured_image_index_image" + str(uuid.uuid4()).replace('-', '')
-    filter_test_index_name = "api_test_structured_filter_index_filter" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
 
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        cls.text_index_name, cls.filter_test_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -34,7 +28,6 @@ class TestStructuredSearch(MarqoTestCase):
                 "tensorFields": ["title", "content"],
             },
             {
-                "indexName": cls.filter_test_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -50,7 +43,6 @@ class TestStructuredSearch(MarqoTestCase):
                 "tensorFields": ["field_a", "field_b"],
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -62,12 +54,6 @@ class TestStructuredSearch(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name, cls.filter_test_index_name]
-
-    def setUp(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-            
     @staticmethod
     def strip_marqo_fields(doc, strip_id=True):
         """Strips Marqo fields from a returned doc to get the original doc"""
@@ -249,9 +235,9 @@ class TestStructuredSearch(MarqoTestCase):
     def test_multi_queries(self):
         docs = [
             {
-                "content": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png",
+                "content": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"),
                 "_id": 'realistic_hippo'},
-            {"content": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png",
+            {"content": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"),
              "_id": 'artefact_hippo'}
         ]
 
@@ -262,10 +248,10 @@ class TestStructuredSearch(MarqoTestCase):
         queries_expected_ordering = [
             ({"Nature photography": 2.0, "Artefact": -2}, ['realistic_hippo', 'artefact_hippo']),
             ({"Nature photography": -1.0, "Artefact": 1.0}, ['artefact_hippo', 'realistic_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": -1.0,
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): -1.0,
               "blah": 1.0}, ['realistic_hippo', 'artefact_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": 2.0,
-              "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png": -1.0},
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): 2.0,
+              self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"): -1.0},
              ['artefact_hippo', 'realistic_hippo']),
         ]
         for query, expected_ordering in queries_expected_ordering:
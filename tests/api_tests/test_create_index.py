@@ -55,7 +55,8 @@ class TestCreateIndex(MarqoTestCase):
     def test_create_unstructured_image_index(self):
         self.client.create_index(index_name=self.index_name, type="unstructured",
                                  treat_urls_and_pointers_as_images=True, model="open_clip/ViT-B-32/laion400m_e32")
-        image_url = "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg"
+        image_url = self.media_url(
+            "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg")
         documents = [{"test": "test",
                       "image": image_url}]
         self.client.index(self.index_name).add_documents(documents, tensor_fields=["test", "image"])
@@ -103,7 +104,8 @@ class TestCreateIndex(MarqoTestCase):
                                  treat_urls_and_pointers_as_images=True,
                                  model="open_clip/ViT-B-16/laion400m_e31",
                                  image_preprocessing={"patchMethod": "simple"})
-        image_url = "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg"
+        image_url = self.media_url(
+            "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg")
         documents = [{"test": "test",
                       "image": image_url}]
         self.client.index(self.index_name).add_documents(documents, tensor_fields=["test", "image"])
@@ -291,7 +293,8 @@ class TestCreateIndex(MarqoTestCase):
                                  all_fields=[{"name": "test", "type": "text", "features": ["lexical_search"]},
                                              {"name": "image", "type": "image_pointer"}],
                                  tensor_fields=["test", "image"])
-        image_url = "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg"
+        image_url = self.media_url(
+            "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg")
         documents = [{"test": "test",
                       "image": image_url}]
 
@@ -344,7 +347,8 @@ class TestCreateIndex(MarqoTestCase):
                                  all_fields=[{"name": "test", "type": "text", "features": ["lexical_search"]},
                                              {"name": "image", "type": "image_pointer"}],
                                  tensor_fields=["test", "image"])
-        image_url = "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg"
+        image_url = self.media_url(
+            "https://raw.githubusercontent.com/marqo-ai/marqo/mainline/examples/ImageSearchGuide/data/image2.jpg")
         documents = [{"test": "test",
                       "image": image_url}]
 
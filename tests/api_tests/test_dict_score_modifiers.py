@@ -1,4 +1,3 @@
-import uuid
 import math
 
 from tests.marqo_test import MarqoTestCase
@@ -10,12 +9,8 @@ class TestDictScoreModifiers(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "vectorNumericType": "float",
                 "model": "open_clip/ViT-B-32/laion2b_s34b_b79k",
@@ -41,14 +36,11 @@ class TestDictScoreModifiers(MarqoTestCase):
                 }
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/laion2b_s34b_b79k"
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     # Test Double score modifier
     def test_double_score_modifier(self):
         """
@@ -65,7 +57,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "3", "text_field": "a photo of a cat", "double_score_mods": 5.5 * 1 ** 39},
                     {"_id": "4", "text_field": "a photo of a cat"}
                 ]
-                tensor_fields = ["text_field"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(test_index_name) else None
                 res = self.client.index(test_index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 # Search
@@ -98,7 +90,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "3", "text_field": "a photo of a cat", "long_score_mods": 2 ** 36},
                     {"_id": "4", "text_field": "a photo of a cat"}
                 ]
-                tensor_fields = ["text_field"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(test_index_name) else None
                 res = self.client.index(test_index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 # Search
@@ -137,7 +129,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                      "map_score_mods": {"a": 0.5}},
                 ]
 
-                tensor_fields = ["text_field"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(test_index_name) else None
                 res = self.client.index(test_index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 # Search
@@ -178,7 +170,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                      "map_score_mods": {"a": 0.5}},
                 ]
 
-                tensor_fields = ["text_field"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(test_index_name) else None
                 res = self.client.index(test_index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 # Search
@@ -219,7 +211,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                      "map_score_mods": {"a": 0.5}},
                 ]
 
-                tensor_fields = ["text_field"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(test_index_name) else None
                 res = self.client.index(test_index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 # Search
@@ -311,7 +303,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "3", "text_field": "test", "map_score_mods": {"a": 1.5}},
                     {"_id": "4", "text_field": "test"},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -351,7 +343,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "2", "text_field": "test", "long_score_mods": 3, "map_score_mods_int": {"b": 2}},
                     {"_id": "3", "text_field": "test"},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -388,7 +380,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "2", "text_field": "test", "map_score_mods": {"a": 1.5}},
                     {"_id": "3", "text_field": "test"},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -422,7 +414,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "map_score_mods": {}},
                     {"_id": "2", "text_field": "test", "map_score_mods": {"a": 1.5}},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -450,7 +442,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "double_score_mods": 2.0},
                     {"_id": "2", "text_field": "test", "map_score_mods": {"a": 1.5}},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
                 
                 try:
@@ -475,7 +467,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "double_score_mods": 0.0},
                     {"_id": "2", "text_field": "test", "double_score_mods": 1.0},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -501,7 +493,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "double_score_mods": -1.0},
                     {"_id": "2", "text_field": "test", "double_score_mods": 1.0},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -530,7 +522,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "double_score_mods": 1e20},
                     {"_id": "2", "text_field": "test", "double_score_mods": 1e10},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -558,7 +550,7 @@ class TestDictScoreModifiers(MarqoTestCase):
                     {"_id": "1", "text_field": "test", "double_score_mods": 2.0},
                     {"_id": "2", "text_field": "test", "double_score_mods": 3.0},
                 ]
-                tensor_fields = ["text_field"] if "unstr" in index_name else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 self.client.index(index_name).add_documents(documents=docs, tensor_fields=tensor_fields)
 
                 res = self.client.index(index_name).search(
@@ -1,4 +1,3 @@
-import uuid
 import math
 
 from tests.marqo_test import MarqoTestCase
@@ -11,12 +10,8 @@ class TestDictScoreModifiers(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "vectorNumericType": "float",
                 "model": "open_clip/ViT-B-32/laion2b_s34b_b79k",
@@ -39,14 +34,11 @@ class TestDictScoreModifiers(MarqoTestCase):
                 }
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/laion2b_s34b_b79k"
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     def test_add_documents_headers(self):
         documents = [
             {"text_field": "hello", "int_field": 1, "_id": "1"},
@@ -54,9 +46,9 @@ class TestDictScoreModifiers(MarqoTestCase):
             {"text_field": "hello world", "int_field": 3, "_id": "3"},
             {"text_field": "hello world", "int_field": 3, "_id": 4}, # Error id
         ]
-        for index_name in self.indexes_to_delete:
+        for index_name in self.leased_indexes:
             with self.subTest(msg=str(index_name)):
-                tensor_fields = ["text_field"] if index_name.startswith("unstructured") else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
                 body = {
                     "documents": documents,
                     "tensorFields": tensor_fields
@@ -102,9 +94,9 @@ class TestDictScoreModifiers(MarqoTestCase):
             {"text_field": "hello world", "int_field": 3, "_id": "3"},
             {"text_field": "hello world", "int_field": 4, "_id": "4"}
         ]
-        for index_name in self.indexes_to_delete:
+        for index_name in self.leased_indexes:
             with self.subTest(msg=str(index_name)):
-                tensor_fields = ["text_field"] if index_name.startswith("unstructured") else None
+                tensor_fields = ["text_field"] if self.is_unstructured(index_name) else None
 
                 self.client.index(index_name).add_documents(documents, tensor_fields=tensor_fields)
                 document_ids = ["1", "2", "3", "4", "5", "0"] # 0 and 5 are failures
@@ -1,5 +1,3 @@
-import uuid
-
 import numpy as np
 
 from tests.marqo_test import MarqoTestCase
@@ -10,13 +8,8 @@ class TestEmbed(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_non_e5 = "unstructured_non_e5_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name, cls.unstructured_index_non_e5 = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -26,16 +19,13 @@ class TestEmbed(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2"]
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "type": "unstructured",
             },
             {
-                "indexName": cls.unstructured_index_non_e5,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2"
             }
         ])
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name, cls.unstructured_index_non_e5]
 
     def test_embed_single_string(self):
         """Embeds a string. Use add docs and get docs with tensor facets to ensure the vector is correct.
@@ -46,7 +36,7 @@ class TestEmbed(MarqoTestCase):
         for test_index_name in test_cases:
             with (self.subTest(test_index_name)):
                 # Add document
-                tensor_fields = ["text_field_1"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field_1"] if self.is_unstructured(test_index_name) else None
                 d1 = {
                     "_id": "doc1",
                     "text_field_1": "Jimmy Butler is the GOAT."
@@ -67,7 +57,6 @@ class TestEmbed(MarqoTestCase):
                 self.assertEqual(embed_res["content"], "Jimmy Butler is the GOAT.")
                 self.assertTrue(np.allclose(embed_res["embeddings"][0], retrieved_d1["_tensor_facets"][0] ["_embedding"], atol=1e-6))
 
-
     def test_embed_with_device(self):
         """Embeds a string with device parameter. Use add docs and get docs with tensor facets to ensure the vector is correct.
                         Checks the basic functionality and response structure"""
@@ -76,7 +65,7 @@ class TestEmbed(MarqoTestCase):
         for test_index_name in test_cases:
             with (self.subTest(test_index_name)):
                 # Add document
-                tensor_fields = ["text_field_1"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field_1"] if self.is_unstructured(test_index_name) else None
                 d1 = {
                     "_id": "doc1",
                     "text_field_1": "Jimmy Butler is the GOAT."
@@ -105,7 +94,7 @@ class TestEmbed(MarqoTestCase):
         for test_index_name in test_cases:
             with (self.subTest(test_index_name)):
                 # Add document
-                tensor_fields = ["text_field_1"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field_1"] if self.is_unstructured(test_index_name) else None
                 d1 = {
                     "_id": "doc1",
                     "text_field_1": "Jimmy Butler is the GOAT."
@@ -134,7 +123,7 @@ class TestEmbed(MarqoTestCase):
         for test_index_name in test_cases:
             with (self.subTest(test_index_name)):
                 # Add document
-                tensor_fields = ["text_field_1"] if "unstr" in test_index_name else None
+                tensor_fields = ["text_field_1"] if self.is_unstructured(test_index_name) else None
                 d1 = {
                     "_id": "doc1",
                     "text_field_1": "Jimmy Butler is the GOAT."
@@ -1,4 +1,3 @@
-import uuid
 from unittest.mock import patch
 
 from tests.marqo_test import MarqoTestCase
@@ -11,12 +10,8 @@ class TestHealth(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -25,13 +20,10 @@ class TestHealth(MarqoTestCase):
                 "tensorFields": ["title"]
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "type": "unstructured",
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     def test_check_index_health_response_format(self):
         test_cases = [
             (self.structured_index_name, "structured"),
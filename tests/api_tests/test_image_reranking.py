@@ -1,13 +1,10 @@
-import uuid
-
 from marqo.errors import MarqoWebError
 
 from tests.marqo_test import MarqoTestCase
 
 
-def generate_structured_index_settings_dict(index_name, image_preprocessing_method):
+def generate_structured_index_settings_dict(image_preprocessing_method):
     return {
-        "indexName": index_name,
         "type": "structured",
         "model": "open_clip/ViT-B-32/openai",
         "allFields": [{"name": "image_content_1", "type": "image_pointer"},
@@ -26,26 +23,18 @@ class TestImageReranking(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_no_image_processing_index_name = (
-                "structured_no_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_simple_image_processing_index_name = (
-                "structured_simple_image_processing_index_name" + str(uuid.uuid4()).replace('-', ''))
-
-        cls.create_indexes([
-            generate_structured_index_settings_dict(cls.structured_no_image_processing_index_name, None),
-            generate_structured_index_settings_dict(cls.structured_simple_image_processing_index_name, "simple"),
-        ])
-
-        cls.indexes_to_delete = [
-            cls.structured_no_image_processing_index_name,
-            cls.structured_simple_image_processing_index_name,
-        ]
+        cls.structured_no_image_processing_index_name, cls.structured_simple_image_processing_index_name = \
+            cls.lease_indexes([
+                generate_structured_index_settings_dict(None),
+                generate_structured_index_settings_dict("simple"),
+            ])
 
     def test_image_reranking(self):
         documents = [{'_id': '1',
-                      'image_content_1': 'https://avatars.githubusercontent.com/u/13092433?v=4'},
+                      'image_content_1': self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')},
                      {'_id': '2',
-                      'image_content_1': 'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png'},
+                      'image_content_1': self.media_url(
+                          'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png')},
                      ]
         index_name = self.structured_no_image_processing_index_name
         self.client.index(index_name).add_documents(documents)
@@ -63,9 +52,10 @@ class TestImageReranking(MarqoTestCase):
 
     def test_image_reranking_searchable_is_none(self):
         documents = [{'_id': '1',
-                      'image_content_1': 'https://avatars.githubusercontent.com/u/13092433?v=4'},
+                      'image_content_1': self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')},
                      {'_id': '2',
-                      'image_content_1': 'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png'},
+                      'image_content_1': self.media_url(
+                          'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png')},
                      ]
         index_name = self.structured_no_image_processing_index_name
         self.client.index(index_name).add_documents(documents)
@@ -78,9 +68,10 @@ class TestImageReranking(MarqoTestCase):
 
     def test_image_reranking_model_name_error(self):
         documents = [{'_id': '1',
-                      'image_content_1': 'https://avatars.githubusercontent.com/u/13092433?v=4'},
+                      'image_content_1': self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')},
                      {'_id': '2',
-                      'image_content_1': 'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png'},
+                      'image_content_1': self.media_url(
+                          'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png')},
                      ]
         index_name = self.structured_no_image_processing_index_name
         self.client.index(index_name).add_documents(documents)
@@ -94,12 +85,13 @@ class TestImageReranking(MarqoTestCase):
             {
                 '_id': '1',
                 'text_content': 'the image chunking can (optionally) chunk the image into sub-patches (aking to segmenting text) by using either a learned model or simple box generation and cropping',
-                'image_content_1': 'https://avatars.githubusercontent.com/u/13092433?v=4'
+                'image_content_1': self.media_url('https://avatars.githubusercontent.com/u/13092433?v=4')
             },
             {
                 '_id': '2',
                 'text_content': 'ing either a learned model or simple box generation and cropping. brain',
-                'image_content_1': 'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png'
+                'image_content_1': self.media_url(
+                    'https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png')
             },
         ]
 
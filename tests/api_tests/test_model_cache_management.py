@@ -1,5 +1,3 @@
-import uuid
-
 import pytest
 from marqo.errors import MarqoWebError
 
@@ -12,12 +10,8 @@ class TestModlCacheManagement(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.structured_index_name = "structured_" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.structured_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -26,14 +20,11 @@ class TestModlCacheManagement(MarqoTestCase):
                 "tensorFields": ["title"]
             },
             {
-                "indexName": cls.unstructured_index_name,
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "type": "unstructured",
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     @pytest.mark.cpu_only_test
     def test_get_cuda_info_error(self) -> None:
         """Test that cuda is not supported in the current machine"""
@@ -1,7 +1,6 @@
 import queue
 import threading
 import time
-import uuid
 
 import pytest
 from marqo.errors import MarqoWebError
@@ -17,41 +16,40 @@ class TestModelEject(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
         cls.device = "cpu"
-        cls.index_model_object = {
-            "test_0": 'open_clip/ViT-B-32/laion400m_e31',
-            "test_1": 'open_clip/ViT-B-32/laion400m_e32',
-            "test_2": 'open_clip/convnext_base_w/laion2b_s13b_b82k',
-            "test_3": 'open_clip/ViT-B-16-plus-240/laion400m_e32',
-            "test_4": 'open_clip/RN50x4/openai',
-            "test_5": 'open_clip/RN101-quickgelu/yfcc15m',
-            "test_6": 'open_clip/ViT-B-32/laion2b_e16',
-            "test_7": 'open_clip/ViT-B-32-quickgelu/laion400m_e31',
-            "test_8": 'open_clip/ViT-B-16-plus-240/laion400m_e31',
-            "test_9": 'open_clip/ViT-L-14/laion2b_s32b_b82k',
-            "test_10": "hf/all-MiniLM-L6-v1",
-            "test_11": "hf/all-MiniLM-L6-v2",
-            "test_12": 'open_clip/ViT-B-16/laion400m_e32',
-            "test_13": "hf/all_datasets_v3_MiniLM-L12",
-            "test_14": 'open_clip/ViT-B-32/laion2b_e16',
-            "test_15": 'open_clip/RN101/yfcc15m',
-            "test_16": 'open_clip/convnext_base/laion400m_s13b_b51k',
-            "test_17": 'open_clip/convnext_base_w/laion2b_s13b_b82k',
-            "test_18": 'open_clip/ViT-B-32/laion2b_s34b_b79k',
-            "test_19": 'open_clip/ViT-B-16-plus-240/laion400m_e31',
-            "test_20": 'open_clip/ViT-L-14/laion400m_e31',
-            "test_21": 'open_clip/ViT-L-14/laion2b_s32b_b82k',
-            "test_22": 'open_clip/ViT-B-16/laion400m_e32',
-        }
-
-        cls.create_indexes([
+        models = [
+            'open_clip/ViT-B-32/laion400m_e31',
+            'open_clip/ViT-B-32/laion400m_e32',
+            'open_clip/convnext_base_w/laion2b_s13b_b82k',
+            'open_clip/ViT-B-16-plus-240/laion400m_e32',
+            'open_clip/RN50x4/openai',
+            'open_clip/RN101-quickgelu/yfcc15m',
+            'open_clip/ViT-B-32/laion2b_e16',
+            'open_clip/ViT-B-32-quickgelu/laion400m_e31',
+            'open_clip/ViT-B-16-plus-240/laion400m_e31',
+            'open_clip/ViT-L-14/laion2b_s32b_b82k',
+            "hf/all-MiniLM-L6-v1",
+            "hf/all-MiniLM-L6-v2",
+            'open_clip/ViT-B-16/laion400m_e32',
+            "hf/all_datasets_v3_MiniLM-L12",
+            'open_clip/ViT-B-32/laion2b_e16',
+            'open_clip/RN101/yfcc15m',
+            'open_clip/convnext_base/laion400m_s13b_b51k',
+            'open_clip/convnext_base_w/laion2b_s13b_b82k',
+            'open_clip/ViT-B-32/laion2b_s34b_b79k',
+            'open_clip/ViT-B-16-plus-240/laion400m_e31',
+            'open_clip/ViT-L-14/laion400m_e31',
+            'open_clip/ViT-L-14/laion2b_s32b_b82k',
+            'open_clip/ViT-B-16/laion400m_e32',
+        ]
+
+        index_names = cls.lease_indexes([
             {
-                "indexName": index_name,
                 "model": model,
                 "type": "unstructured",
-            } for index_name, model in cls.index_model_object.items()
+            } for model in models
         ])
-
-        cls.indexes_to_delete = list(cls.index_model_object)
+        # Leased index name -> model
+        cls.index_model_object = dict(zip(index_names, models))
 
     def test_sequentially_search(self):
         """Iterate through each index and loading each model. We expect to not run out of space as previously
@@ -85,11 +83,8 @@ class TestConcurrencyRequestsBlock(MarqoTestCase):
     def setUpClass(cls) -> None:
         super().setUpClass()
 
-        cls.index_name = "unstructured_" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        [cls.index_name] = cls.lease_indexes([
             {
-                "indexName": cls.index_name,
                 "model": "open_clip/ViT-B-32/laion400m_e31",
                 "type": "unstructured",
             }
@@ -100,7 +95,6 @@ class TestConcurrencyRequestsBlock(MarqoTestCase):
              {"test_2": "what is best to wear on the moon?"}],
             tensor_fields=["test_1", "test_2"], device="cpu"
         )
-        cls.indexes_to_delete = [cls.index_name]
 
     def setUp(self) -> None:
         self.device = "cpu"
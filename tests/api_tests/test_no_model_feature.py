@@ -1,5 +1,4 @@
 import copy
-import uuid
 
 import numpy as np
 from marqo.client import Client
@@ -15,13 +14,10 @@ class TestNoModelFeature(MarqoTestCase):
         super().setUpClass()
         cls.client = Client(**cls.client_settings)
 
-        cls.unstructured_no_model_index_name = "unstructured_no_model" + str(uuid.uuid4()).replace('-', '')
-        cls.structured_no_model_index_name = "structured_no_model" + str(uuid.uuid4()).replace('-', '')
         cls.DIMENSION = 128
 
-        cls.create_indexes([
+        cls.unstructured_no_model_index_name, cls.structured_no_model_index_name = cls.lease_indexes([
             {
-                "indexName": cls.unstructured_no_model_index_name,
                 "type": "unstructured",
                 "model": "no_model",
                 "modelProperties": {
@@ -30,7 +26,6 @@ class TestNoModelFeature(MarqoTestCase):
                 }
             },
             {
-                "indexName": cls.structured_no_model_index_name,
                 "type": "structured",
                 "model": "no_model",
                 "modelProperties": {
@@ -46,12 +41,6 @@ class TestNoModelFeature(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.unstructured_no_model_index_name, cls.structured_no_model_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     @staticmethod
     def strip_marqo_fields(doc, strip_id=True):
         """Strips Marqo fields from a returned doc to get the original doc"""
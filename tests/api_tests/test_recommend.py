@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.enums import InterpolationMethod
 from marqo.errors import MarqoWebError
@@ -8,16 +6,12 @@ from tests.marqo_test import MarqoTestCase
 
 
 class TestRecommend(MarqoTestCase):
-    structured_index_name = "structured_index" + str(uuid.uuid4()).replace('-', '')
-    unstructured_index_name = "unstructured_index" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        cls.create_indexes(
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes(
             [
                 {
-                    "indexName": cls.structured_index_name,
                     "type": "structured",
                     "model": "sentence-transformers/all-MiniLM-L6-v2",
                     "allFields": [
@@ -29,15 +23,12 @@ class TestRecommend(MarqoTestCase):
                     "tensorFields": ["title", "content"],
                 },
                 {
-                    "indexName": cls.unstructured_index_name,
                     "type": "unstructured",
                     "model": "sentence-transformers/all-MiniLM-L6-v2",
                 }
             ]
         )
 
-        cls.indexes_to_delete = [cls.structured_index_name, cls.unstructured_index_name]
-
     def test_recommend_defaults(self):
         """
         Test recommend with only required fields provided
@@ -0,0 +1,149 @@
+import os
+from typing import Dict, List, Tuple
+
+from tests import reference_ranking
+from tests.corpus import Corpus
+from tests.marqo_test import MarqoTestCase
+
+
+class TestReferenceRanking(MarqoTestCase):
+    """Compares score modifier and hybrid RRF rankings of whole corpora against tests/reference_ranking.py.
+
+    Set MARQO_API_TESTS_REFERENCE_DOCS to change the number of documents (300 by default). Searches page through
+    at most MARQO_MAX_RETRIEVABLE_DOCS results, so raise that on the Marqo side for larger corpora.
+    """
+    NUM_DOCS_ENV_VAR = "MARQO_API_TESTS_REFERENCE_DOCS"
+    PAGE_SIZE = 1000
+    LIMIT = 100
+    NUM_QUERIES = 3
+    SCORE_MODIFIERS = {
+        "multiply_score_by": [
+            {"field_name": "double_score_mods", "weight": 0.5},
+            {"field_name": "map_score_mods.key_0", "weight": 2},
+        ],
+        "add_to_score": [
+            {"field_name": "long_score_mods", "weight": 0.001},
+            {"field_name": "map_score_mods_int.key_1", "weight": 0.01},
+        ],
+    }
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+
+        cls.structured_index_name, cls.unstructured_index_name = cls.lease_indexes([
+            {
+                "type": "structured",
+                "model": "sentence-transformers/all-MiniLM-L6-v2",
+                "allFields": [
+                    {"name": "text_field", "type": "text", "features": ["lexical_search"]},
+                    {"name": "double_score_mods", "type": "double", "features": ["score_modifier"]},
+                    {"name": "long_score_mods", "type": "long", "features": ["score_modifier"]},
+                    {"name": "map_score_mods", "type": "map<text, float>", "features": ["score_modifier"]},
+                    {"name": "map_score_mods_int", "type": "map<text,int>", "features": ["score_modifier"]},
+                ],
+                "tensorFields": ["text_field"],
+            },
+            {
+                "type": "unstructured",
+                "model": "sentence-transformers/all-MiniLM-L6-v2",
+            }
+        ])
+
+        num_docs = int(os.environ.get(cls.NUM_DOCS_ENV_VAR, "300"))
+        cls.corpus = Corpus({"text_field": "text", "double_score_mods": "double", "long_score_mods": "long",
+                             "map_score_mods": "map<text,float>", "map_score_mods_int": "map<text,int>"},
+                            seed=7, vocab_size=500, text_length=(3, 10), map_size=(0, 2), map_key_space=3)
+        cls.documents = []
+        for doc in cls.corpus.documents(num_docs):
+            # Leave scalar fields out of some documents, so missing fields are covered as well as missing map keys
+            if int(doc["_id"]) % 3 == 0:
+                del doc["double_score_mods"]
+            if int(doc["_id"]) % 5 == 0:
+                del doc["long_score_mods"]
+            cls.documents.append(doc)
+        cls.document_index = {doc["_id"]: i for i, doc in enumerate(cls.documents)}
+        cls.queries = list(cls.corpus.queries(cls.NUM_QUERIES, words_per_query=(1, 2)))
+
+        for index_name in cls.leased_indexes:
+            tensor_fields = ["text_field"] if cls.is_unstructured(index_name) else None
+            for start in range(0, num_docs, 128):
+                res = cls.client.index(index_name).add_documents(cls.documents[start:start + 128],
+                                                                 tensor_fields=tensor_fields)
+                assert not res["errors"], res
+        # The tests only search, so the documents are loaded once for the class instead of before every test
+        cls.write_tracker.discard(cls.leased_indexes)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # Hand the indexes back to the pool empty
+        cls.write_tracker.mark_dirty(cls.leased_indexes)
+        super().tearDownClass()
+
+    def search_all(self, index_name: str, q: str, search_method: str) -> Tuple[List[str], List[float]]:
+        """Pages through every hit of a search without score modifiers."""
+        ids, scores = [], []
+        while True:
+            hits = self.client.index(index_name).search(q=q, search_method=search_method, limit=self.PAGE_SIZE,
+                                                        offset=len(ids))["hits"]
+            ids += [hit["_id"] for hit in hits]
+            scores += [hit["_score"] for hit in hits]
+            if len(hits) < self.PAGE_SIZE:
+                return ids, scores
+
+    def expected_modified_scores(self, ids: List[str], scores: List[float], score_modifiers: Dict):
+        documents = [self.documents[self.document_index[doc_id]] for doc_id in ids]
+        return reference_ranking.apply_score_modifiers(scores, documents, score_modifiers)
+
+    def test_score_modifiers_match_reference(self):
+        for index_name in self.leased_indexes:
+            for search_method in ["TENSOR", "LEXICAL"]:
+                for q in self.queries:
+                    with self.subTest(index=index_name, search_method=search_method, q=q):
+                        raw_ids, raw_scores = self.search_all(index_name, q, search_method)
+                        expected = self.expected_modified_scores(raw_ids, raw_scores, self.SCORE_MODIFIERS)
+                        hits = self.client.index(index_name).search(
+                            q=q, search_method=search_method, limit=self.LIMIT,
+                            score_modifiers=self.SCORE_MODIFIERS)["hits"]
+
+                        # Tensor search only applies score modifiers to the documents its ANN retrieval finds
+                        considered_ids = raw_ids[:self.LIMIT] if search_method == "TENSOR" else None
+                        mismatches = reference_ranking.ranking_mismatches(
+                            [hit["_id"] for hit in hits], [hit["_score"] for hit in hits], raw_ids, expected,
+                            expected, self.LIMIT, considered_ids=considered_ids)
+                        self.assertEqual([], mismatches[:10], f"{len(mismatches)} mismatches")
+
+    def test_hybrid_rrf_matches_reference(self):
+        test_cases = [
+            ({}, None),
+            ({"alpha": 0.2, "rrfK": 10}, None),
+            ({"alpha": 0.7}, self.SCORE_MODIFIERS),
+        ]
+        for index_name in self.leased_indexes:
+            for hybrid_parameters, score_modifiers in test_cases:
+                for q in self.queries:
+                    with self.subTest(index=index_name, hybrid_parameters=hybrid_parameters,
+                                      score_modifiers=score_modifiers is not None, q=q):
+                        # Disjunction retrieves `limit` hits with each method and fuses them
+                        rankings = {}
+                        for search_method in ["TENSOR", "LEXICAL"]:
+                            hits = self.client.index(index_name).search(
+                                q=q, search_method=search_method, limit=self.LIMIT,
+                                score_modifiers=score_modifiers)["hits"]
+                            rankings[search_method] = ([hit["_id"] for hit in hits], [hit["_score"] for hit in hits])
+                        fused_ids, lower, upper = reference_ranking.reciprocal_rank_fusion(
+                            *rankings["TENSOR"], *rankings["LEXICAL"],
+                            alpha=hybrid_parameters.get("alpha", reference_ranking.DEFAULT_ALPHA),
+                            k=hybrid_parameters.get("rrfK", reference_ranking.DEFAULT_RRF_K))
+
+                        parameters = {"retrievalMethod": "disjunction", "rankingMethod": "rrf", **hybrid_parameters}
+                        if score_modifiers:
+                            parameters["scoreModifiersTensor"] = score_modifiers
+                            parameters["scoreModifiersLexical"] = score_modifiers
+                        hits = self.client.index(index_name).search(
+                            q=q, search_method="HYBRID", limit=self.LIMIT, hybrid_parameters=parameters)["hits"]
+
+                        mismatches = reference_ranking.ranking_mismatches(
+                            [hit["_id"] for hit in hits], [hit["_score"] for hit in hits], fused_ids, lower, upper,
+                            self.LIMIT)
+                        self.assertEqual([], mismatches[:10], f"{len(mismatches)} mismatches")
@@ -1,5 +1,3 @@
-import uuid
-
 import numpy as np
 from marqo.errors import MarqoWebError
 
@@ -11,18 +9,13 @@ class TestScoreModifierSearch(MarqoTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
-        cls.unstructured_score_modifier_index_name = ("unstructured_score_modifier"
-                                                      + str(uuid.uuid4()).replace('-', ''))
-        cls.structured_score_modifier_index_name = "structured_score_modifier" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        cls.unstructured_score_modifier_index_name, cls.structured_score_modifier_index_name = cls.lease_indexes([
             {
-                "indexName": cls.unstructured_score_modifier_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/laion400m_e31"
             },
             {
-                "indexName": cls.structured_score_modifier_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/laion400m_e31",
                 "allFields": [
@@ -38,10 +31,9 @@ class TestScoreModifierSearch(MarqoTestCase):
         ]
         )
 
-        cls.indexes_to_delete = [cls.structured_score_modifier_index_name,
-                                 cls.unstructured_score_modifier_index_name]
-
     def test_score_modifier_search_results(self):
+        image_url = self.media_url(
+            "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_statue_small.png")
         for index_name in [self.unstructured_score_modifier_index_name, self.structured_score_modifier_index_name]:
             for _ in range(10):
                 # Generate 8 random values to test score modifiers
@@ -50,7 +42,7 @@ class TestScoreModifierSearch(MarqoTestCase):
                     np.round(np.random.uniform(-10, 10, 8), 2)
 
                 doc = {
-                    "image_field": "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_statue_small.png",
+                    "image_field": image_url,
                     "text_field": "Marqo can support vector search",
                     "multiply_1": multiply_1_value,
                     "multiply_2": multiply_2_value,
@@ -66,13 +58,14 @@ class TestScoreModifierSearch(MarqoTestCase):
                         [{"field_name": "add_1", "weight": add_1_weight},
                          {"field_name": "add_2", "weight": add_2_weight}]
                 }
-                msg = (f"{'unstructured' if index_name.startswith('un') else 'structured'}, doc = {doc}, "
+                msg = (f"{'unstructured' if self.is_unstructured(index_name) else 'structured'}, doc = {doc}, "
                        f"score_modifiers = {score_modifiers}")
 
                 with self.subTest(msg):
-                    self.clear_indexes(self.indexes_to_delete)
+                    self.clear_indexes(self.leased_indexes)
                     res = self.client.index(index_name).add_documents(
-                        documents=[doc], tensor_fields=["text_field", "image_field"] if msg.startswith("un") else None,
+                        documents=[doc],
+                        tensor_fields=["text_field", "image_field"] if self.is_unstructured(index_name) else None,
                     )
                     self.assertEqual(1, self.client.index(index_name).get_stats()["numberOfDocuments"])
 
@@ -110,7 +103,6 @@ class TestScoreModifierSearch(MarqoTestCase):
 
                 self.assertIn("score_modifiers", str(e.exception.message))
 
-
     def test_valid_score_modifiers_format(self):
         valid_score_modifiers_list = [
             {
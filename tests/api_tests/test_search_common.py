@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.errors import MarqoWebError
 
@@ -12,21 +10,14 @@ class TestSearchCommon(MarqoTestCase):
     We should test the shared functionalities between structured and unstructured indexes here to avoid code duplication
     and branching in the test cases."""
 
-    structured_text_index_name = "structured_index_text" + str(uuid.uuid4()).replace('-', '')
-    structured_image_index_name = "structured_image_index" + str(uuid.uuid4()).replace('-', '')
-    structured_filter_index_name = "structured_filter_index" + str(uuid.uuid4()).replace('-', '')
-
-    unstructured_text_index_name = "unstructured_index_text" + str(uuid.uuid4()).replace('-', '')
-    unstructured_image_index_name = "unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
         cls.client = Client(**cls.client_settings)
 
-        cls.create_indexes([
+        (cls.structured_text_index_name, cls.structured_filter_index_name,
+         cls.structured_image_index_name) = cls.lease_indexes([
             {
-                "indexName": cls.structured_text_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -36,7 +27,6 @@ class TestSearchCommon(MarqoTestCase):
                 "tensorFields": ["title", "content"],
             },
             {
-                "indexName": cls.structured_filter_index_name,
                 "type": "structured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "allFields": [
@@ -52,7 +42,6 @@ class TestSearchCommon(MarqoTestCase):
                 "tensorFields": ["field_a", "field_b"],
             },
             {
-                "indexName": cls.structured_image_index_name,
                 "type": "structured",
                 "model": "open_clip/ViT-B-32/openai",
                 "allFields": [
@@ -64,23 +53,17 @@ class TestSearchCommon(MarqoTestCase):
             }
         ])
 
-        cls.create_indexes([
+        cls.unstructured_text_index_name, cls.unstructured_image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.unstructured_text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.unstructured_image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai"
             }
         ])
 
-        cls.indexes_to_delete = [cls.structured_image_index_name, cls.structured_filter_index_name,
-                                 cls.structured_text_index_name, cls.unstructured_image_index_name,
-                                 cls.unstructured_text_index_name]
-
     def test_lexical_query_can_not_be_none(self):
         context = {"tensor": [{"vector": [1, ] * 384, "weight": 1},
                           {"vector": [2, ] * 384, "weight": 2}]}
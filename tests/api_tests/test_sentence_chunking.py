@@ -1,5 +1,3 @@
-import uuid
-
 from tests.marqo_test import MarqoTestCase
 
 
@@ -15,20 +13,14 @@ class TestSentenceChunking(MarqoTestCase):
         super().setUpClass()
 
         # A very large split length
-        cls.large_structured_index_name = "structured_large" + str(uuid.uuid4()).replace('-', '')
         # A standard split length 2, with 0 split overlap
-        cls.standard_structured_index_name = "structured_standard" + str(uuid.uuid4()).replace('-', '')
         # A standard split length 2, with 1 split overlap
-        cls.overlap_structured_index_name = "structured_overlap" + str(uuid.uuid4()).replace('-', '')
-
-        cls.large_unstructured_index_name = "unstructured_large" + str(uuid.uuid4()).replace('-', '')
-        cls.standard_unstructured_index_name = "unstructured_standard" + str(uuid.uuid4()).replace('-', '')
-        cls.overlap_unstructured_index_name = "unstructured_overlap" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        (cls.large_structured_index_name, cls.standard_structured_index_name, cls.overlap_structured_index_name,
+         cls.large_unstructured_index_name, cls.standard_unstructured_index_name,
+         cls.overlap_unstructured_index_name) = cls.lease_indexes([
             # Structured Indexes
             {
-                "indexName": cls.large_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": int(1e3),
@@ -41,7 +33,6 @@ class TestSentenceChunking(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3"]
             },
             {
-                "indexName": cls.standard_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -54,7 +45,6 @@ class TestSentenceChunking(MarqoTestCase):
                 "tensorFields": ["text_field_1", "text_field_2", "text_field_3"]
             },
             {
-                "indexName": cls.overlap_structured_index_name,
                 "type": "structured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -68,7 +58,6 @@ class TestSentenceChunking(MarqoTestCase):
             },
             # Unstructured Indexes
             {
-                "indexName": cls.large_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": int(1e3),
@@ -77,7 +66,6 @@ class TestSentenceChunking(MarqoTestCase):
                 },
             },
             {
-                "indexName": cls.standard_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -86,7 +74,6 @@ class TestSentenceChunking(MarqoTestCase):
                 },
             },
             {
-                "indexName": cls.overlap_unstructured_index_name,
                 "type": "unstructured",
                 "textPreprocessing": {
                     "splitLength": 2,
@@ -96,16 +83,6 @@ class TestSentenceChunking(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [
-            cls.large_structured_index_name,
-            cls.standard_structured_index_name,
-            cls.overlap_structured_index_name,
-
-            cls.large_unstructured_index_name,
-            cls.standard_unstructured_index_name,
-            cls.overlap_unstructured_index_name
-        ]
-
     def test_sentence_no_chunking(self):
         document = {'_id': '1',  # '_id' can be provided but is not required
                     'text_field_1': 'hello. how are you. another one.',
@@ -117,7 +94,7 @@ class TestSentenceChunking(MarqoTestCase):
         for index_name in [self.large_structured_index_name, self.large_structured_index_name]:
             with self.subTest(index_name):
                 self.client.index(index_name).add_documents([document], tensor_fields=unstructured_tensor_fields if \
-                    index_name.startswith("un") else None)
+                    self.is_unstructured(index_name) else None)
 
                 # test the search works
                 results = self.client.index(index_name).search('hello how are you')
@@ -151,7 +128,7 @@ class TestSentenceChunking(MarqoTestCase):
                 with self.subTest(f"{search_term}, {index_name}"):
                     self.client.index(index_name).add_documents(
                         documents=[document], tensor_fields=unstructured_tensor_fields if \
-                            index_name.startswith("un") else None
+                            self.is_unstructured(index_name) else None
                     )
 
                     res = self.client.index(index_name).search(search_term)
@@ -185,7 +162,7 @@ class TestSentenceChunking(MarqoTestCase):
                 with self.subTest(f"{search_term}, {index_name}"):
                     self.client.index(index_name).add_documents(
                         documents=[document], tensor_fields=unstructured_tensor_fields if \
-                            index_name.startswith("un") else None
+                            self.is_unstructured(index_name) else None
                     )
 
                     res = self.client.index(index_name).search(search_term)
@@ -7,7 +7,6 @@ TestFieldNames tests the following:
     - Identifies and tests which special characters work in fieldnames used as searchable attributes
     - Identifies and tests which special characters work in fieldnames used as within filters
 """
-import uuid
 
 from marqo.errors import MarqoWebError
 
@@ -29,16 +28,12 @@ class TestSpecialCharacterInValue(MarqoTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
-        cls.standard_structured_index_name = "structured_standard" + str(uuid.uuid4()).replace('-', '')
-        cls.standard_unstructured_index_name = "unstructured_standard" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        cls.standard_unstructured_index_name, cls.standard_structured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.standard_unstructured_index_name,
                 "type": "unstructured"
             },
             {
-                "indexName": cls.standard_structured_index_name,
                 "type": "structured",
                 "allFields": [{"name": "searchField", "type": "text", "features": ["lexical_search"]},
                               {"name": "filteringField", "type": "text", "features": ["filter"]}],
@@ -46,8 +41,6 @@ class TestSpecialCharacterInValue(MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.standard_unstructured_index_name, cls.standard_structured_index_name]
-
     def test_filtering_on_content_with_special_chars_tensor(self):
         for index_name in [self.standard_structured_index_name, self.standard_unstructured_index_name]:
             for special_str in self.supported_special_str_sequences:
@@ -62,10 +55,10 @@ class TestSpecialCharacterInValue(MarqoTestCase):
 
                     with self.subTest(f"Tensor Search, {index_name}, "
                                       f"str for filtering {str_for_filtering}, expected_doc {expected_document}"):
-                        self.clear_indexes(self.indexes_to_delete)
+                        self.clear_indexes(self.leased_indexes)
 
                         self.client.index(index_name).add_documents(docs, tensor_fields=["searchField"] if \
-                            index_name.startswith("un") else None)
+                            self.is_unstructured(index_name) else None)
 
                         res = self.client.index(index_name).search(q="hello",
                                                                    filter_string=f"filteringField:{str_for_filtering}", )
@@ -86,10 +79,10 @@ class TestSpecialCharacterInValue(MarqoTestCase):
 
                     with self.subTest(f"Lexical search, {index_name}, str for filtering "
                                       f"{str_for_filtering}, expected_doc {expected_document}"):
-                        self.clear_indexes(self.indexes_to_delete)
+                        self.clear_indexes(self.leased_indexes)
 
                         self.client.index(index_name).add_documents(docs, tensor_fields=["searchField"] if \
-                            index_name.startswith("un") else None)
+                            self.is_unstructured(index_name) else None)
 
                         res = self.client.index(index_name).search(q="hello",
                                                                    filter_string=f"filteringField:{str_for_filtering}",
@@ -105,7 +98,7 @@ class TestSpecialCharacterInValue(MarqoTestCase):
         for index_name in [self.standard_structured_index_name, self.standard_unstructured_index_name]:
             with self.subTest(index_name):
                 res = self.client.index(index_name).add_documents(bad_documents, tensor_fields=["searchField"] if \
-                    index_name.startswith("un") else None)
+                    self.is_unstructured(index_name) else None)
                 self.assertEqual(True, res["errors"])
                 for item in res["items"]:
                     self.assertEqual(400, item["status"])
@@ -131,16 +124,12 @@ class TestSpecialCharsFieldNamesUnstructured(MarqoTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
-        cls.standard_structured_index_name = "structured_standard" + str(uuid.uuid4()).replace('-', '')
-        cls.standard_unstructured_index_name = "unstructured_standard" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        [cls.standard_unstructured_index_name] = cls.lease_indexes([
             {
-                "indexName": cls.standard_unstructured_index_name,
                 "type": "unstructured"
             },
         ])
-        cls.indexes_to_delete = [cls.standard_unstructured_index_name]
 
     def test_supported_field_name_in_fieldnames_unstructured(self):
         """Test supported special chars in field names can be indexed, searched, and filtered on"""
@@ -1,5 +1,4 @@
 import copy
-import uuid
 from unittest import mock
 
 from marqo.client import Client
@@ -16,46 +15,31 @@ class TestUnstructuredAddDocuments(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-        cls.unstructured_languagebind_index_name = "api_test_unstructured_languagebind_index" + str(uuid.uuid4()).replace('-', '')
-        cls.text_index_with_normalize_embeddings_true = "api_test_unstructured_index_with_normalize_embeddings_true" + str(
-            uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        (cls.text_index_name, cls.image_index_name, cls.unstructured_languagebind_index_name,
+         cls.text_index_with_normalize_embeddings_true) = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "normalizeEmbeddings": False,
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai",
                 "treatUrlsAndPointersAsImages": True,
             },
             {
-                "indexName": cls.unstructured_languagebind_index_name,
                 "type": "unstructured",
                 "model": "LanguageBind/Video_V1.5_FT_Audio_FT_Image",
                 "treatUrlsAndPointersAsMedia": True,
                 "treatUrlsAndPointersAsImages": True
             },
             {
-                "indexName": cls.text_index_with_normalize_embeddings_true,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
                 "normalizeEmbeddings": True,
             }
             ])
         
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name, cls.unstructured_languagebind_index_name, cls.text_index_with_normalize_embeddings_true]
-        
-        
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
 
     def test_add_documents_with_ids(self):
         d1 = {
@@ -196,7 +180,7 @@ class TestUnstructuredAddDocuments(MarqoTestCase):
 
     def test_add_document_multimodal(self):
         """Test that adding a document with a multimodal field works"""
-        image_content = "https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"
+        image_content = self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg")
 
         documents = [
             {
@@ -320,7 +304,6 @@ class TestUnstructuredAddDocuments(MarqoTestCase):
         assert doc_res_normalized['_tensor_facets'][0]["custom_vector_field_1"] == "custom vector text"
         assert doc_res_normalized['_tensor_facets'][0]['_embedding'] == expected_custom_vector_after_normalization
 
-
     def test_custom_zero_vector_doc_in_normalized_embedding_true(self):
 
         DEFAULT_DIMENSIONS = 384
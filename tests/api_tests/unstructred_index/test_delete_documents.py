@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.errors import MarqoWebError
 
@@ -18,28 +16,17 @@ class TestUnstructuredDeleteDocuments(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai"
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-            
     def test_delete_docs(self):
         self.client.index(self.text_index_name).add_documents([
             {"abc": "wow camel", "_id": "123"},
@@ -1,5 +1,3 @@
-import uuid
-
 from marqo.client import Client
 from marqo.errors import MarqoWebError
 
@@ -18,29 +16,18 @@ class TestUnstructuredGetStats(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.text_index_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai",
                 "treatUrlsAndPointersAsImages": True,
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-
     def test_get_status_response_format(self):
         res = self.client.index(self.text_index_name).get_stats()
         assert isinstance(res, dict)
@@ -82,7 +69,7 @@ class TestUnstructuredGetStats(MarqoTestCase):
     def test_get_status_response_results_image_index(self):
         """Ensure that the number of vectors and documents is correct, with or without mappings"""
 
-        image_content = "https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg"
+        image_content = self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/image2.jpg")
 
         test_cases = [
             ([
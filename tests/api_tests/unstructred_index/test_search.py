@@ -1,5 +1,4 @@
 import copy
-import uuid
 from unittest import mock
 
 import marqo
@@ -23,34 +22,21 @@ class TestUnstructuredSearch(MarqoTestCase):
 
         cls.client = Client(**cls.client_settings)
 
-        cls.text_index_name = "api_test_unstructured_index" + str(uuid.uuid4()).replace('-', '')
-        cls.text_index_2_name = "api_test_unstructured_index_2_" + str(uuid.uuid4()).replace('-', '')
-        cls.image_index_name = "api_test_unstructured_image_index" + str(uuid.uuid4()).replace('-', '')
-
-        cls.create_indexes([
+        cls.text_index_name, cls.text_index_2_name, cls.image_index_name = cls.lease_indexes([
             {
-                "indexName": cls.text_index_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.text_index_2_name,
                 "type": "unstructured",
                 "model": "sentence-transformers/all-MiniLM-L6-v2",
             },
             {
-                "indexName": cls.image_index_name,
                 "type": "unstructured",
                 "model": "open_clip/ViT-B-32/openai"
             }
         ])
 
-        cls.indexes_to_delete = [cls.text_index_name, cls.text_index_2_name, cls.image_index_name]
-
-    def tearDown(self):
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
-            
     @staticmethod
     def strip_marqo_fields(doc, strip_id=True):
         """Strips Marqo fields from a returned doc to get the original doc"""
@@ -237,9 +223,9 @@ class TestUnstructuredSearch(MarqoTestCase):
     def test_multi_queries(self):
         docs = [
             {
-                "loc a": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png",
+                "loc a": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"),
                 "_id": 'realistic_hippo'},
-            {"loc b": "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png",
+            {"loc b": self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"),
              "_id": 'artefact_hippo'}
         ]
         image_index_config = {
@@ -256,10 +242,10 @@ class TestUnstructuredSearch(MarqoTestCase):
         queries_expected_ordering = [
             ({"Nature photography": 2.0, "Artefact": -2}, ['realistic_hippo', 'artefact_hippo']),
             ({"Nature photography": -1.0, "Artefact": 1.0}, ['artefact_hippo', 'realistic_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": -1.0,
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): -1.0,
               "blah": 1.0}, ['realistic_hippo', 'artefact_hippo']),
-            ({"https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": 2.0,
-              "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png": -1.0},
+            ({self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png"): 2.0,
+              self.media_url("https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png"): -1.0},
              ['artefact_hippo', 'realistic_hippo']),
         ]
         for query, expected_ordering in queries_expected_ordering:
@@ -1,12 +1,9 @@
-import random
 import sys
 import threading
 import time
-import uuid
-
-import requests
 
 from tests import marqo_test
+from tests.corpus import Corpus
 
 sys.setswitchinterval(0.005)
 
@@ -16,16 +13,12 @@ class TestAsync (marqo_test.MarqoTestCase):
     @classmethod
     def setUpClass(cls) -> None:
         super().setUpClass()
-        cls.standard_structured_index_name = "structured_standard" + str(uuid.uuid4()).replace('-', '')
-        cls.standard_unstructured_index_name = "unstructured_standard" + str(uuid.uuid4()).replace('-', '')
 
-        cls.create_indexes([
+        cls.standard_unstructured_index_name, cls.standard_structured_index_name = cls.lease_indexes([
             {
-                "indexName": cls.standard_unstructured_index_name,
                 "type": "unstructured"
             },
             {
-                "indexName": cls.standard_structured_index_name,
                 "type": "structured",
                 "allFields": [{"name": "text_field_1", "type": "text"},
                               {"name": "text_field_2", "type": "text"}],
@@ -33,16 +26,12 @@ class TestAsync (marqo_test.MarqoTestCase):
             }
         ])
 
-        cls.indexes_to_delete = [cls.standard_unstructured_index_name, cls.standard_structured_index_name]
-
     def test_async(self):
         for index_name in [self.standard_unstructured_index_name, self.standard_structured_index_name]:
             with self.subTest(f"test async for {index_name}"):
                 num_docs = 500
 
-                vocab_source = "https://www.mit.edu/~ecprice/wordlist.10000"
-
-                vocab = requests.get(vocab_source).text.splitlines()
+                corpus = Corpus({"text_field_1": "text", "text_field_2": "text"}, text_length=(10, 25))
 
                 d1 = {
                     "text_field_1": "Just Your Average Doc",
@@ -55,9 +44,8 @@ class TestAsync (marqo_test.MarqoTestCase):
                 assert self.client.index(index_name).get_stats()['numberOfDocuments'] == 1
 
                 def significant_ingestion():
-                    docs = [{"text_field_1": " ".join(random.choices(population=vocab, k=10)),
-                                  "text_field_2": " ".join(random.choices(population=vocab, k=25)),
-                                  } for _ in range(num_docs)]
+                    # Start past d1's _id so every generated document is new
+                    docs = list(corpus.documents(num_docs, start=1000))
                     self.client.index(index_name).add_documents(documents=docs, client_batch_size=1,
                                                                 tensor_fields=tensor_fields)
 
@@ -14,8 +14,8 @@ To test these functions locally:
 
 
 We may test multiple different env vars in the same test case. This is because
- each new test case is expensive, requiring a restart of Marqo. This prevents
- this test suite's runtime from growing too large.
+ each new env var configuration is expensive, requiring a new Marqo container (see
+ tests/container_pool.py). This prevents this test suite's runtime from growing too large.
 """
 import json
 
@@ -25,6 +25,9 @@ from tests import utilities
 from marqo import Client
 
 
+# The env var containers are started with the start script of the testing configuration, so the class is
+# skipped at collection time (before setUpClass) under configurations without one, e.g. CUSTOM
+@utilities.allow_environments(list(utilities.START_SCRIPTS))
 class TestEnvVarChanges(marqo_test.MarqoTestCase):
 
     """
@@ -35,11 +38,11 @@ class TestEnvVarChanges(marqo_test.MarqoTestCase):
     @classmethod
     def tearDownClass(cls) -> None:
         super().tearDownClass()
-        # Ensures that marqo goes back to default state after these tests
-        utilities.rerun_marqo_with_default_config(
+        # Ensures that the client points back at the default marqo after these tests
+        cls.use_marqo_at(utilities.rerun_marqo_with_default_config(
             calling_class=cls.__name__
-        )
-        print("Marqo has been rerun with default env vars!")
+        ))
+        print("Pointed back at Marqo with default env vars!")
 
     def test_preload_models(self):
         # TODO: Add log test
@@ -61,10 +64,10 @@ class TestEnvVarChanges(marqo_test.MarqoTestCase):
         }
 
         print(f"Attempting to rerun marqo with custom model {open_clip_model_object['model']}")
-        utilities.rerun_marqo_with_env_vars(
+        self.use_marqo_at(utilities.rerun_marqo_with_env_vars(
             env_vars = ['-e', f"MARQO_MODELS_TO_PRELOAD=[{json.dumps(open_clip_model_object)}]"],
             calling_class=self.__class__.__name__
-        )
+        ))
 
         # check preloaded models (should be custom model)
         custom_models = ["open-clip-1"]
@@ -91,7 +94,7 @@ class TestEnvVarChanges(marqo_test.MarqoTestCase):
         max_ef = 6000
         new_models = ["hf/e5-large-v2"]
         index_name = "test_multiple_env_vars"
-        utilities.rerun_marqo_with_env_vars(
+        self.use_marqo_at(utilities.rerun_marqo_with_env_vars(
             env_vars=[
                 "-e", f"MARQO_EF_CONSTRUCTION_MAX_VALUE={max_ef}",
                 "-e", f"MARQO_MODELS_TO_PRELOAD={json.dumps(new_models)}",
@@ -99,7 +102,7 @@ class TestEnvVarChanges(marqo_test.MarqoTestCase):
                 "-e", f"MARQO_INFERENCE_CACHE_SIZE=10"
             ],
             calling_class=self.__class__.__name__
-        )
+        ))
 
         # Create index with same number of replicas and EF
         res_0 = self.client.create_index(index_name=index_name, ann_parameters={
@@ -1,10 +1,85 @@
 import pytest
 import os
+import warnings
+from _pytest.skipping import evaluate_skip_marks
+
+from tests import http_recorder
+from tests import media_server
+from tests import model_prewarm
+from tests import telemetry_harvester
+from tests import utilities
+from tests.marqo_test import MarqoTestCase
 
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "cuda_test: mark test as cuda_test to skip")
     config.addinivalue_line("markers", "cpu_only_test: mark test as cpu_only_test to skip")
+    config.addinivalue_line("markers", "allow_environments(configurations): only run the test with "
+                                       "TESTING_CONFIGURATION in configurations")
+    config.addinivalue_line("markers", "disallow_environments(configurations): skip the test with "
+                                       "TESTING_CONFIGURATION in configurations")
+
+    http_report_path = os.environ.get(http_recorder.HTTP_REPORT_ENV_VAR)
+    if http_report_path:
+        recorder = http_recorder.HttpRecorder(base_url=MarqoTestCase._MARQO_URL, report_path=http_report_path)
+        recorder.install()
+        config.pluginmanager.register(recorder, "http_recorder")
+
+    telemetry_report_path = os.environ.get(telemetry_harvester.TELEMETRY_REPORT_ENV_VAR)
+    if telemetry_report_path:
+        harvester = telemetry_harvester.TelemetryHarvester(report_path=telemetry_report_path)
+        harvester.install()
+        config.pluginmanager.register(harvester, "telemetry_harvester")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_media_server():
+    """Serves the test media from this machine for the whole session if MARQO_API_TESTS_LOCAL_MEDIA is set."""
+    if not os.environ.get(media_server.LOCAL_MEDIA_ENV_VAR):
+        yield None
+        return
+    server = media_server.MediaServer().start()
+    MarqoTestCase.media_server = server
+    yield server
+    MarqoTestCase.media_server = None
+    server.stop()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def pooled_marqo_containers():
+    """Removes the Marqo containers started for env var configurations at the end of the session."""
+    yield
+    utilities.remove_marqo_containers()
+
+
+def will_run(item) -> bool:
+    """Whether item will run rather than be skipped, by skip or skipif marks (including the environment gating
+    added in pytest_collection_modifyitems) or by unittest skip decorators."""
+    # The same evaluation pytest makes before running the item
+    if evaluate_skip_marks(item) is not None:
+        return False
+    return not any(getattr(obj, "__unittest_skip__", False) for obj in (item.cls, getattr(item, "obj", None)))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def prewarmed_models(request):
+    """Loads the models of every test module that will run, if MARQO_API_TESTS_PREWARM_MODELS is set."""
+    if not os.environ.get(model_prewarm.PREWARM_ENV_VAR):
+        return {}
+    paths = [str(item.path) for item in request.session.items if will_run(item)]
+    load_times = model_prewarm.prewarm_models(model_prewarm.models_in_files(paths),
+                                              model_prewarm.leased_settings_in_files(paths))
+
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter is not None:
+        reporter.write_sep("-", "model pre-warm")
+        for model, outcome in load_times.items():
+            status = f"failed: {outcome['error']}" if outcome["error"] else "loaded"
+            reporter.write_line(f"{model}: {outcome['load_s']:.2f}s {status}")
+    failed = {model: outcome["error"] for model, outcome in load_times.items() if outcome["error"]}
+    if failed:
+        warnings.warn(f"Failed to pre-warm {len(failed)} of {len(load_times)} models: {failed}")
+    return load_times
 
 
 def pytest_collection_modifyitems(items):
@@ -25,4 +100,16 @@ def pytest_collection_modifyitems(items):
                                                  "'TESTING_CONFIGURATION=CUDA_DOCKER_MARQO' to run")
         for item in items:
             if "cuda_test" in item.keywords:
-                item.add_marker(skip_cuda_test)
\ No newline at end of file
+                item.add_marker(skip_cuda_test)
+
+    # Skip marks are evaluated before any fixture is set up, so a class whose tests are all skipped here never runs
+    # setUpClass and never creates its indexes
+    for item in items:
+        reason = utilities.environment_skip_reason(item, os.environ["TESTING_CONFIGURATION"])
+        if reason:
+            item.add_marker(pytest.mark.skip(reason=reason))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # Delete every index handed out by the shared index pool in one batch call
+    MarqoTestCase.index_pool.delete_all()
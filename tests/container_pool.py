@@ -0,0 +1,157 @@
+"""Keeps a warm Marqo container running for each environment variable configuration the env-var tests ask for.
+
+Restarting the `marqo` container for every configuration costs minutes of model and Vespa warm-up, and the
+default container has to be restarted again afterwards. Instead, every non-default configuration gets its own
+container, named after a hash of its docker arguments and published on a free port, while the default `marqo`
+container keeps running on 8882. Asking for a configuration that is already running returns its URL without a
+restart, and asking for the default configuration returns the default URL.
+
+At most max_containers pooled containers run at a time; the oldest one is removed to make room for a new one.
+All pooled containers are removed at the end of the test session.
+
+Pooled containers that share the default container's Vespa (shares_vespa) also share its indexes, so the pool
+records the indexes that exist when a non-default configuration is first acquired, and deletes the ones created
+since when the default configuration is acquired again, a container is evicted, or the pool is removed.
+"""
+import hashlib
+import json
+import os
+import socket
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple
+
+import requests
+
+CONTAINER_PREFIX = "marqo-env-"
+MARQO_PORT = 8882
+DEFAULT_URL = f"http://localhost:{MARQO_PORT}"
+MAX_CONTAINERS_ENV_VAR = "MARQO_API_TESTS_ENV_CONTAINERS"
+DEFAULT_MAX_CONTAINERS = 2
+# Every pooled container of the docker configurations runs its own Vespa, besides its own models
+DEFAULT_MAX_DOCKER_CONTAINERS = 1
+
+
+def canonical_docker_args(docker_args: List[str]) -> List[Tuple[str, ...]]:
+    """Groups docker arguments into flags with their values, e.g. ['-e', 'A=1'] -> [('-e', 'A=1')], sorted so the
+    order in which the flags are given does not matter."""
+    groups = []
+    for arg in docker_args:
+        if arg.startswith("-") or not groups:
+            groups.append((arg,))
+        else:
+            groups[-1] += (arg,)
+    return sorted(groups)
+
+
+def container_name(docker_args: List[str]) -> str:
+    digest = hashlib.sha1(json.dumps(canonical_docker_args(docker_args)).encode()).hexdigest()
+    return CONTAINER_PREFIX + digest[:12]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("", 0))
+        return s.getsockname()[1]
+
+
+def remove_pooled_containers() -> None:
+    """Removes every pooled container, including ones started by an earlier session that did not clean up."""
+    names = subprocess.run(["docker", "ps", "-aq", "--filter", f"name=^{CONTAINER_PREFIX}"], capture_output=True,
+                           text=True).stdout.split()
+    if names:
+        subprocess.run(["docker", "rm", "-f"] + names, capture_output=True)
+
+
+class MarqoContainerPool:
+    """Starts Marqo containers with start_script (one of the scripts/start_*_marqo.sh scripts), which reads the
+    container name and host port from MARQO_CONTAINER_NAME and MARQO_HOST_PORT.
+
+    Args:
+        start_script: path of the start script
+        image_name: the Marqo image to start
+        max_containers: pooled containers kept running besides the default one
+        script_env: extra environment variables for the start script
+        shares_vespa: whether pooled containers use the Vespa of the default container, in which case the indexes
+            created while a non-default configuration was in use are deleted when it is released
+    """
+
+    def __init__(self, start_script: str, image_name: str, max_containers: int = DEFAULT_MAX_CONTAINERS,
+                 script_env: Optional[Dict[str, str]] = None, shares_vespa: bool = False):
+        if max_containers < 1:
+            raise ValueError(f"max_containers must be at least 1, got {max_containers}")
+        self.start_script = start_script
+        self.image_name = image_name
+        self.max_containers = max_containers
+        self.script_env = script_env or {}
+        self.shares_vespa = shares_vespa
+        self._indexes_before: Optional[Set[str]] = None
+
+    @staticmethod
+    def _index_names() -> Set[str]:
+        res = requests.get(f"{DEFAULT_URL}/indexes")
+        res.raise_for_status()
+        return {index["indexName"] for index in res.json()["results"]}
+
+    def release(self) -> None:
+        """Deletes the indexes created since a non-default configuration was acquired, if pooled containers share
+        the default container's Vespa."""
+        if self._indexes_before is None:
+            return
+        for index_name in sorted(self._index_names() - self._indexes_before):
+            print(f"Deleting index {index_name} created with a pooled Marqo container.")
+            res = requests.delete(f"{DEFAULT_URL}/indexes/{index_name}")
+            if res.status_code != 404:
+                res.raise_for_status()
+        self._indexes_before = None
+
+    def _running_port(self, name: str) -> Optional[int]:
+        """The host port of the container if it is running, else None."""
+        result = subprocess.run(["docker", "port", name, f"{MARQO_PORT}/tcp"], capture_output=True, text=True)
+        if result.returncode != 0 or not result.stdout.strip():
+            return None
+        return int(result.stdout.splitlines()[0].rsplit(":", 1)[1])
+
+    def _pooled_containers(self) -> List[str]:
+        """Names of the pooled containers, newest first."""
+        result = subprocess.run(["docker", "ps", "-a", "--filter", f"name=^{CONTAINER_PREFIX}", "--format",
+                                 "{{.Names}}"], capture_output=True, text=True)
+        return result.stdout.split()
+
+    def _evict(self, keep: int) -> None:
+        evicted = self._pooled_containers()[keep:]
+        if evicted:
+            self.release()
+        for name in evicted:
+            print(f"Removing pooled Marqo container {name} to make room for a new configuration.")
+            subprocess.run(["docker", "rm", "-f", name], capture_output=True)
+
+    def _start(self, name: str, port: int, docker_args: List[str]) -> None:
+        env = {**os.environ, **self.script_env, "MARQO_CONTAINER_NAME": name, "MARQO_HOST_PORT": str(port)}
+        run_process = subprocess.Popen(
+            ["bash", self.start_script, self.image_name] + docker_args,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, env=env
+        )
+        # Read and print the output line by line (in real time)
+        for line in run_process.stdout:
+            print(line, end='')
+        if run_process.wait() != 0:
+            raise RuntimeError(f"Failed to start Marqo container {name} with {docker_args}")
+
+    def acquire(self, docker_args: List[str]) -> str:
+        """Returns the URL of a running Marqo started with docker_args, starting a container only if no container
+        with the same configuration is running."""
+        if not docker_args:
+            self.release()
+            return DEFAULT_URL
+        name = container_name(docker_args)
+        port = self._running_port(name)
+        if port is not None:
+            print(f"Reusing Marqo container {name} on port {port} for {docker_args}")
+        else:
+            self._evict(keep=self.max_containers - 1)
+            port = free_port()
+            print(f"Starting Marqo container {name} on port {port} for {docker_args}")
+            self._start(name, port, docker_args)
+        if self.shares_vespa and self._indexes_before is None:
+            self._indexes_before = self._index_names()
+        return f"http://localhost:{port}"
@@ -0,0 +1,147 @@
+"""Deterministic, streaming synthetic corpus generator.
+
+Documents are generated lazily for any index schema used by the tests, and each document only depends on the seed
+and its position, so the same seed always produces the same corpus, across runs and regardless of how it is
+batched. This lets benchmarks stream millions of documents into Marqo with bounded memory.
+
+Example:
+    corpus = Corpus.for_index_settings(index_settings, seed=42)
+    for batch in corpus.batches(num_docs=1_000_000, batch_size=64):
+        client.index(index_name).add_documents(batch)
+
+Text is built from a synthetic vocabulary whose word frequencies follow a Zipf distribution, like natural
+language, so lexical search and the inference cache see realistic term repetition.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "ta", "vo", "shi", "an", "el", "or", "up", "ba", "de", "fi", "go",
+              "hu", "ja", "ke", "li", "mo", "nu", "pa", "qi", "re", "so", "ti", "wa", "xe", "yo", "zu", "en"]
+
+# Structured field types that need no input from the caller. multimodal_combination fields are computed by Marqo
+# from their dependent fields and media pointer fields need URLs, see Corpus(media_urls=...)
+TEXT_TYPES = {"text"}
+NUMERIC_TYPES = {"int", "long", "float", "double"}
+MEDIA_POINTER_TYPES = {"image_pointer", "audio_pointer", "video_pointer"}
+
+
+def synthetic_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """Returns `size` distinct pronounceable pseudo-words."""
+    rng = np.random.default_rng(seed)
+    words, seen = [], set()
+    while len(words) < size:
+        num_syllables = int(rng.integers(1, 5))
+        word = "".join(_SYLLABLES[i] for i in rng.integers(0, len(_SYLLABLES), num_syllables))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+class Corpus:
+    """Generates documents for a schema given as {field_name: field_type}, using Marqo field type names.
+
+    Args:
+        fields: field name -> type, e.g. {"title": "text", "price": "float", "tags": "array<text>",
+            "boosts": "map<text,float>", "embedding": "custom_vector"}
+        seed: documents and queries are a pure function of the seed and their position
+        vocab_size: number of distinct words
+        zipf_exponent: skew of the word frequencies. ~1.0 is natural language, higher repeats more
+        text_length: (min, max) words per text field
+        array_length: (min, max) items per array field
+        map_size: (min, max) keys per map field, drawn from a key space of map_key_space
+        vector_dimension: length of custom vectors, must match the index's model
+        media_urls: URLs media pointer fields are filled with, round robin. Pointer fields are left out if None
+    """
+
+    def __init__(self, fields: Dict[str, str], seed: int = 0, vocab_size: int = 10000, zipf_exponent: float = 1.1,
+                 text_length: Sequence[int] = (5, 30), array_length: Sequence[int] = (1, 5),
+                 map_size: Sequence[int] = (1, 5), map_key_space: int = 100, vector_dimension: int = 384,
+                 media_urls: Optional[Sequence[str]] = None):
+        self.fields = fields
+        self.seed = seed
+        self.vocab = synthetic_vocabulary(vocab_size, seed)
+        ranks = np.arange(1, vocab_size + 1, dtype=np.float64)
+        weights = ranks ** -zipf_exponent
+        self._word_cdf = np.cumsum(weights / weights.sum())
+        self.text_length = text_length
+        self.array_length = array_length
+        self.map_size = map_size
+        self.map_keys = [f"key_{i}" for i in range(map_key_space)]
+        self.vector_dimension = vector_dimension
+        self.media_urls = list(media_urls) if media_urls else []
+
+    @classmethod
+    def for_index_settings(cls, index_settings: Dict, **kwargs) -> "Corpus":
+        """Builds a corpus for the `allFields` of a structured index's settings (as passed to create_indexes).
+
+        For unstructured indexes, which have no schema, construct Corpus with the fields directly.
+        """
+        if "allFields" not in index_settings:
+            raise ValueError("for_index_settings needs a structured index. Pass `fields` to Corpus instead")
+        fields = {
+            field["name"]: field["type"] for field in index_settings["allFields"]
+            if field["type"] != "multimodal_combination"
+        }
+        return cls(fields, **kwargs)
+
+    def words(self, rng: np.random.Generator, count: int) -> List[str]:
+        indices = np.searchsorted(self._word_cdf, rng.random(count), side="right")
+        return [self.vocab[min(i, len(self.vocab) - 1)] for i in indices]
+
+    def _text(self, rng: np.random.Generator) -> str:
+        return " ".join(self.words(rng, int(rng.integers(self.text_length[0], self.text_length[1] + 1))))
+
+    def _value(self, rng: np.random.Generator, field_type: str, doc_number: int):
+        if field_type in TEXT_TYPES:
+            return self._text(rng)
+        if field_type in ("int", "long"):
+            return int(rng.integers(0, 1000))
+        if field_type in ("float", "double"):
+            return round(float(rng.uniform(-10, 10)), 4)
+        if field_type == "bool":
+            return bool(rng.integers(0, 2))
+        if field_type.startswith("array<"):
+            item_type = field_type[len("array<"):-1]
+            length = int(rng.integers(self.array_length[0], self.array_length[1] + 1))
+            if item_type == "text":
+                return self.words(rng, length)
+            return [self._value(rng, item_type, doc_number) for _ in range(length)]
+        if field_type.startswith("map<text,"):
+            value_type = field_type[len("map<text,"):-1]
+            size = int(rng.integers(self.map_size[0], self.map_size[1] + 1))
+            keys = rng.choice(len(self.map_keys), size=min(size, len(self.map_keys)), replace=False)
+            return {self.map_keys[k]: self._value(rng, value_type, doc_number) for k in sorted(keys)}
+        if field_type == "custom_vector":
+            return {"content": self._text(rng),
+                    "vector": rng.standard_normal(self.vector_dimension).round(6).tolist()}
+        if field_type in MEDIA_POINTER_TYPES:
+            return self.media_urls[doc_number % len(self.media_urls)]
+        raise ValueError(f"Unsupported field type {field_type}")
+
+    def document(self, doc_number: int) -> Dict:
+        """Returns document number doc_number, with `_id` set to str(doc_number)."""
+        rng = np.random.default_rng([self.seed, doc_number])
+        doc = {"_id": str(doc_number)}
+        for name, field_type in self.fields.items():
+            if field_type in MEDIA_POINTER_TYPES and not self.media_urls:
+                continue
+            doc[name] = self._value(rng, field_type, doc_number)
+        return doc
+
+    def documents(self, num_docs: int, start: int = 0) -> Iterator[Dict]:
+        for doc_number in range(start, start + num_docs):
+            yield self.document(doc_number)
+
+    def batches(self, num_docs: int, batch_size: int, start: int = 0) -> Iterator[List[Dict]]:
+        """Yields lists of at most batch_size documents, only ever holding one batch in memory."""
+        for batch_start in range(start, start + num_docs, batch_size):
+            yield list(self.documents(min(batch_size, start + num_docs - batch_start), batch_start))
+
+    def queries(self, num_queries: int, words_per_query: Sequence[int] = (1, 4), start: int = 0) -> Iterator[str]:
+        """Yields text queries drawn from the same Zipfian vocabulary as the documents."""
+        for query_number in range(start, start + num_queries):
+            # Seed entropy must be non-negative; the trailing 1 keeps queries independent of the documents
+            rng = np.random.default_rng([self.seed, query_number, 1])
+            yield " ".join(self.words(rng, int(rng.integers(words_per_query[0], words_per_query[1] + 1))))
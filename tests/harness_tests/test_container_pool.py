@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from tests import container_pool
+from tests.container_pool import MarqoContainerPool
+
+
+class TestMarqoContainerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = MarqoContainerPool("scripts/start_docker_marqo.sh", "marqoai/marqo:test", max_containers=2)
+
+    def test_container_name_ignores_flag_order(self):
+        args = ["-e", "MARQO_LOG_LEVEL=debug", "-e", "MARQO_INFERENCE_CACHE_SIZE=10"]
+        reordered = ["-e", "MARQO_INFERENCE_CACHE_SIZE=10", "-e", "MARQO_LOG_LEVEL=debug"]
+        self.assertEqual(container_pool.container_name(args), container_pool.container_name(reordered))
+        self.assertNotEqual(container_pool.container_name(args),
+                            container_pool.container_name(["-e", "MARQO_LOG_LEVEL=info"]))
+        self.assertTrue(container_pool.container_name(args).startswith(container_pool.CONTAINER_PREFIX))
+        self.assertEqual([("--cpus", "2"), ("-e", "A=1")],
+                         container_pool.canonical_docker_args(["-e", "A=1", "--cpus", "2"]))
+
+    def test_default_configuration_uses_default_container(self):
+        with patch.object(self.pool, "_start") as mock_start:
+            self.assertEqual(container_pool.DEFAULT_URL, self.pool.acquire([]))
+        mock_start.assert_not_called()
+
+    def test_running_configuration_is_reused(self):
+        with patch.object(self.pool, "_running_port", return_value=49153), \
+                patch.object(self.pool, "_start") as mock_start:
+            self.assertEqual("http://localhost:49153", self.pool.acquire(["-e", "A=1"]))
+        mock_start.assert_not_called()
+
+    def test_new_configuration_evicts_oldest_and_starts(self):
+        args = ["-e", "A=1"]
+        with patch.object(self.pool, "_running_port", return_value=None), \
+                patch.object(self.pool, "_pooled_containers", return_value=["marqo-env-new", "marqo-env-old"]), \
+                patch("tests.container_pool.subprocess.run") as mock_run, \
+                patch("tests.container_pool.free_port", return_value=50000), \
+                patch.object(self.pool, "_start") as mock_start:
+            self.assertEqual("http://localhost:50000", self.pool.acquire(args))
+        mock_run.assert_called_once_with(["docker", "rm", "-f", "marqo-env-old"], capture_output=True)
+        mock_start.assert_called_once_with(container_pool.container_name(args), 50000, args)
+
+    def test_running_port(self):
+        with patch("tests.container_pool.subprocess.run",
+                   return_value=MagicMock(returncode=0, stdout="0.0.0.0:49153\n[::]:49153\n")):
+            self.assertEqual(49153, self.pool._running_port("marqo-env-abc"))
+        with patch("tests.container_pool.subprocess.run", return_value=MagicMock(returncode=1, stdout="")):
+            self.assertIsNone(self.pool._running_port("marqo-env-abc"))
+
+    def test_invalid_max_containers(self):
+        with self.assertRaises(ValueError):
+            MarqoContainerPool("script.sh", "image", max_containers=0)
+
+    def test_shared_vespa_indexes_are_deleted_on_release(self):
+        pool = MarqoContainerPool("scripts/start_local_marqo.sh", "marqoai/marqo:test", shares_vespa=True)
+        with patch.object(pool, "_running_port", return_value=49153), \
+                patch.object(pool, "_index_names", side_effect=[{"leased"}, {"leased", "created"}]), \
+                patch("tests.container_pool.requests.delete") as mock_delete:
+            pool.acquire(["-e", "A=1"])
+            pool.acquire(["-e", "B=1"])
+            mock_delete.assert_not_called()
+            self.assertEqual(container_pool.DEFAULT_URL, pool.acquire([]))
+            pool.acquire([])
+        mock_delete.assert_called_once_with(f"{container_pool.DEFAULT_URL}/indexes/created")
+
+    def test_shared_vespa_indexes_are_deleted_on_evict(self):
+        pool = MarqoContainerPool("scripts/start_local_marqo.sh", "marqoai/marqo:test", max_containers=1,
+                                  shares_vespa=True)
+        with patch.object(pool, "_running_port", side_effect=[49153, None]), \
+                patch.object(pool, "_pooled_containers", return_value=["marqo-env-old"]), \
+                patch.object(pool, "_index_names", side_effect=[set(), {"created"}, {"created"}]), \
+                patch("tests.container_pool.requests.delete") as mock_delete, \
+                patch("tests.container_pool.subprocess.run"), \
+                patch.object(pool, "_start"):
+            pool.acquire(["-e", "A=1"])
+            pool.acquire(["-e", "B=1"])
+        mock_delete.assert_called_once_with(f"{container_pool.DEFAULT_URL}/indexes/created")
+        # The indexes that exist when the new configuration starts are kept on its release
+        self.assertEqual({"created"}, pool._indexes_before)
+
+    def test_separate_vespa_indexes_are_left_alone(self):
+        with patch.object(self.pool, "_running_port", return_value=49153), \
+                patch.object(self.pool, "_index_names") as mock_index_names:
+            self.pool.acquire(["-e", "A=1"])
+            self.pool.acquire([])
+        mock_index_names.assert_not_called()
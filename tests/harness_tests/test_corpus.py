@@ -0,0 +1,82 @@
+import collections
+import unittest
+
+from tests.corpus import Corpus, synthetic_vocabulary
+
+INDEX_SETTINGS = {
+    "type": "structured",
+    "allFields": [
+        {"name": "text_field", "type": "text"},
+        {"name": "int_field", "type": "int", "features": ["score_modifier"]},
+        {"name": "float_field", "type": "float", "features": ["score_modifier"]},
+        {"name": "bool_field", "type": "bool"},
+        {"name": "array_field", "type": "array<text>"},
+        {"name": "map_field", "type": "map<text,float>", "features": ["score_modifier"]},
+        {"name": "vector_field", "type": "custom_vector"},
+        {"name": "image_field", "type": "image_pointer"},
+        {"name": "combo_field", "type": "multimodal_combination",
+         "dependentFields": {"text_field": 0.5, "image_field": 0.5}},
+    ],
+    "tensorFields": ["text_field", "vector_field", "combo_field"],
+}
+
+
+class TestCorpus(unittest.TestCase):
+
+    def test_vocabulary_is_distinct(self):
+        vocab = synthetic_vocabulary(5000, seed=3)
+        self.assertEqual(5000, len(set(vocab)))
+        self.assertEqual(vocab, synthetic_vocabulary(5000, seed=3))
+
+    def test_documents_are_deterministic_and_independent_of_batching(self):
+        corpus = Corpus.for_index_settings(INDEX_SETTINGS, seed=7, vector_dimension=8)
+        documents = list(corpus.documents(20))
+        batched = [doc for batch in corpus.batches(20, batch_size=6) for doc in batch]
+        self.assertEqual(documents, batched)
+        self.assertEqual(documents, list(Corpus.for_index_settings(INDEX_SETTINGS, seed=7,
+                                                                   vector_dimension=8).documents(20)))
+        self.assertEqual(documents[10:], list(corpus.documents(10, start=10)))
+        self.assertNotEqual(documents, list(Corpus.for_index_settings(INDEX_SETTINGS, seed=8,
+                                                                      vector_dimension=8).documents(20)))
+
+    def test_field_types(self):
+        corpus = Corpus.for_index_settings(INDEX_SETTINGS, vector_dimension=8, map_size=(2, 3))
+        doc = corpus.document(0)
+        self.assertEqual("0", doc["_id"])
+        self.assertIsInstance(doc["text_field"], str)
+        self.assertIsInstance(doc["int_field"], int)
+        self.assertIsInstance(doc["float_field"], float)
+        self.assertIsInstance(doc["bool_field"], bool)
+        self.assertTrue(all(isinstance(item, str) for item in doc["array_field"]))
+        self.assertIn(len(doc["map_field"]), (2, 3))
+        self.assertTrue(all(isinstance(value, float) for value in doc["map_field"].values()))
+        self.assertEqual(8, len(doc["vector_field"]["vector"]))
+        self.assertIsInstance(doc["vector_field"]["content"], str)
+        # No media URLs were given and multimodal_combination fields are computed by Marqo
+        self.assertNotIn("image_field", doc)
+        self.assertNotIn("combo_field", doc)
+
+        with_media = Corpus.for_index_settings(INDEX_SETTINGS, media_urls=["http://a/1.png", "http://a/2.png"])
+        self.assertEqual(["http://a/1.png", "http://a/2.png", "http://a/1.png"],
+                         [doc["image_field"] for doc in with_media.documents(3)])
+
+    def test_word_frequencies_are_zipfian(self):
+        corpus = Corpus({"text": "text"}, vocab_size=1000, zipf_exponent=1.0, text_length=(100, 100))
+        counts = collections.Counter(word for doc in corpus.documents(200) for word in doc["text"].split())
+        most_common = [count for _, count in counts.most_common(4)]
+        # With exponent 1 the k-th most common word appears ~1/k as often as the most common one
+        self.assertAlmostEqual(most_common[0] / most_common[1], 2, delta=0.3)
+        self.assertAlmostEqual(most_common[0] / most_common[3], 4, delta=0.8)
+
+    def test_queries(self):
+        corpus = Corpus({"text": "text"}, seed=3)
+        queries = list(corpus.queries(20, words_per_query=(2, 3)))
+        self.assertEqual(20, len(queries))
+        self.assertTrue(all(2 <= len(query.split()) <= 3 for query in queries))
+        self.assertEqual(queries[5:], list(corpus.queries(15, words_per_query=(2, 3), start=5)))
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            Corpus({"field": "geo_point"}).document(0)
+        with self.assertRaises(ValueError):
+            Corpus.for_index_settings({"type": "unstructured"})
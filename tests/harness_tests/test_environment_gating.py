@@ -0,0 +1,47 @@
+import unittest
+
+from tests import utilities
+
+
+class FakeItem:
+    """Stands in for a collected pytest item, which finds markers on the test function and its class."""
+
+    def __init__(self, test_class, method_name):
+        self.marks = getattr(getattr(test_class, method_name), "pytestmark", []) + \
+            getattr(test_class, "pytestmark", [])
+
+    def iter_markers(self, name):
+        return (mark for mark in self.marks if mark.name == name)
+
+
+class TestEnvironmentGating(unittest.TestCase):
+
+    def test_method_markers(self):
+        class Gated(unittest.TestCase):
+            @utilities.disallow_environments(["CUDA_DOCKER_MARQO"])
+            def test_not_on_cuda(self):
+                pass
+
+            @utilities.allow_environments(["CPU_LOCAL_MARQO"])
+            def test_only_local(self):
+                pass
+
+        self.assertIsNotNone(utilities.environment_skip_reason(FakeItem(Gated, "test_not_on_cuda"),
+                                                               "CUDA_DOCKER_MARQO"))
+        self.assertIsNone(utilities.environment_skip_reason(FakeItem(Gated, "test_not_on_cuda"), "CPU_DOCKER_MARQO"))
+        self.assertIsNone(utilities.environment_skip_reason(FakeItem(Gated, "test_only_local"), "CPU_LOCAL_MARQO"))
+        self.assertIsNotNone(utilities.environment_skip_reason(FakeItem(Gated, "test_only_local"),
+                                                               "CPU_DOCKER_MARQO"))
+
+    def test_classwide_decorate_marks_the_class(self):
+        @utilities.classwide_decorate(utilities.allow_environments, ["CUDA_DOCKER_MARQO"])
+        class CudaOnly(unittest.TestCase):
+            def test_a(self):
+                pass
+
+            def test_b(self):
+                pass
+
+        for method in ("test_a", "test_b"):
+            self.assertIsNotNone(utilities.environment_skip_reason(FakeItem(CudaOnly, method), "CPU_DOCKER_MARQO"))
+            self.assertIsNone(utilities.environment_skip_reason(FakeItem(CudaOnly, method), "CUDA_DOCKER_MARQO"))
@@ -0,0 +1,44 @@
+import math
+import random
+import unittest
+
+from benchmarks.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_bucket_bounds_contain_value(self):
+        histogram = LatencyHistogram(precision_bits=4)
+        for value_us in list(range(0, 2000)) + [10 ** 6, 10 ** 9 + 7]:
+            low, high = histogram._bucket_bounds(histogram._bucket_index(value_us))
+            self.assertLessEqual(low, value_us)
+            self.assertGreaterEqual(high, value_us)
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(0)
+        latencies = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.record(latency)
+        ordered = sorted(latencies)
+        for q in [50, 90, 99, 99.9]:
+            with self.subTest(q=q):
+                # nearest rank, the definition LatencyHistogram uses
+                expected = ordered[math.ceil(q / 100 * len(ordered)) - 1]
+                self.assertAlmostEqual(expected, histogram.percentile(q), delta=expected * 0.01)
+        self.assertEqual(len(latencies), histogram.summary()["count"])
+
+    def test_merge_and_round_trip(self):
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i in range(1, 1001):
+            (first if i % 2 else second).record(i / 1000)
+            combined.record(i / 1000)
+        merged = LatencyHistogram.from_dict(first.to_dict()).merge(second)
+        self.assertEqual(combined.to_dict(), merged.to_dict())
+        self.assertEqual(combined.percentile(99), merged.percentile(99))
+
+    def test_record_corrected_backfills_missing_requests(self):
+        histogram = LatencyHistogram()
+        histogram.record_corrected(1.0, expected_interval_s=0.25)
+        self.assertEqual(4, histogram.total_count)
+        self.assertAlmostEqual(0.25, histogram.percentile(0), places=3)
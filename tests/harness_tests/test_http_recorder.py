@@ -0,0 +1,83 @@
+import csv
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+
+import requests
+
+from tests.http_recorder import CurrentTestClassTracker, HttpRecorder, path_template
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHttpRecorder(unittest.TestCase):
+
+    def test_path_template(self):
+        test_cases = [
+            ("http://localhost:8882/indexes/my_index/search", "/indexes/{index_name}/search"),
+            ("http://localhost:8882/indexes/my_index/documents/doc_1?expose_facets=true",
+             "/indexes/{index_name}/documents/{document_id}"),
+            ("http://localhost:8882/indexes/my_index/documents/delete-all",
+             "/indexes/{index_name}/documents/delete-all"),
+            ("http://localhost:8882/batch/indexes/create", "/batch/indexes/create"),
+            ("http://localhost:8882/models?model_name=x", "/models"),
+        ]
+        for url, expected in test_cases:
+            with self.subTest(url):
+                self.assertEqual(expected, path_template(url))
+
+    def test_current_class_is_keyed_by_module(self):
+        tracker = CurrentTestClassTracker()
+        for module_name in ("tests.api_tests.test_a", "tests.api_tests.cuda.test_a"):
+            item = SimpleNamespace(module=SimpleNamespace(__name__=module_name), cls=TestHttpRecorder)
+            protocol = tracker.pytest_runtest_protocol(item, None)
+            next(protocol)
+            self.assertEqual(f"{module_name}.TestHttpRecorder", tracker.current_class)
+            with self.assertRaises(StopIteration):
+                next(protocol)
+            self.assertEqual("session", tracker.current_class)
+
+    def test_records_calls_and_writes_report(self):
+        server = HTTPServer(("localhost", 0), _OkHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://localhost:{server.server_port}"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            recorder = HttpRecorder(base_url=base_url, report_path=os.path.join(tmp_dir, "report.json"))
+            recorder.install()
+            try:
+                recorder.current_class = "TestSomething"
+                for _ in range(3):
+                    requests.post(f"{base_url}/indexes/index_a/search", data="abcd")
+            finally:
+                recorder.uninstall()
+                server.shutdown()
+
+            self.assertEqual(3, len(recorder.records))
+            self.assertEqual({"method": "POST", "path": "/indexes/{index_name}/search", "status": 200,
+                              "bytes_sent": 4, "bytes_received": 12, "test_class": "TestSomething"},
+                             {k: v for k, v in recorder.records[0].items() if k != "wall_time"})
+
+            json_path, csv_path = recorder.write_report()
+            with open(json_path) as f:
+                report = json.load(f)
+            self.assertEqual(3, report["by_endpoint"]["POST /indexes/{index_name}/search"]["count"])
+            self.assertEqual(12, report["by_class"]["TestSomething"]["bytes_sent"])
+            with open(csv_path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual({"by_endpoint", "by_class"}, {row["group"] for row in rows})
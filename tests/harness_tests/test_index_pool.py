@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+
+from tests.marqo_test import IndexPool, MarqoTestCase
+
+
+class TestIndexPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.pool = IndexPool()
+        self.unstructured_settings = {"type": "unstructured", "model": "hf/all-MiniLM-L6-v2"}
+        self.structured_settings = {
+            "type": "structured",
+            "allFields": [{"name": "text_field_1", "type": "text"}],
+            "tensorFields": ["text_field_1"]
+        }
+
+    def test_fingerprint_ignores_index_name_and_key_order(self):
+        reordered = {"model": "hf/all-MiniLM-L6-v2", "type": "unstructured", "indexName": "my_index"}
+        self.assertEqual(IndexPool.fingerprint(self.unstructured_settings), IndexPool.fingerprint(reordered))
+        self.assertNotEqual(IndexPool.fingerprint(self.unstructured_settings),
+                            IndexPool.fingerprint(self.structured_settings))
+
+    def test_lease_creates_missing_indexes_in_one_batch(self):
+        with patch("tests.marqo_test.MarqoTestCase.create_indexes") as mock_create:
+            names = self.pool.lease("TestA", [self.unstructured_settings, self.structured_settings])
+        mock_create.assert_called_once()
+        created = mock_create.call_args[0][0]
+        self.assertEqual(names, [settings["indexName"] for settings in created])
+        self.assertEqual("structured", created[1]["type"])
+
+    def test_released_index_is_reused(self):
+        with patch("tests.marqo_test.MarqoTestCase.create_indexes") as mock_create:
+            first = self.pool.lease("TestA", [self.unstructured_settings])
+            self.assertEqual(first, self.pool.release("TestA"))
+            second = self.pool.lease("TestB", [self.unstructured_settings])
+        self.assertEqual(first, second)
+        self.assertEqual(1, mock_create.call_count)
+
+    def test_identical_settings_in_one_lease_get_distinct_indexes(self):
+        with patch("tests.marqo_test.MarqoTestCase.create_indexes"):
+            names = self.pool.lease("TestA", [self.unstructured_settings, self.unstructured_settings])
+            other = self.pool.lease("TestB", [self.unstructured_settings])
+        self.assertEqual(3, len(set(names + other)))
+
+    def test_delete_all_uses_one_batch(self):
+        with patch("tests.marqo_test.MarqoTestCase.create_indexes"):
+            names = self.pool.lease("TestA", [self.unstructured_settings, self.structured_settings])
+        with patch("tests.marqo_test.MarqoTestCase.delete_indexes") as mock_delete:
+            self.pool.delete_all()
+            self.pool.delete_all()
+        mock_delete.assert_called_once_with(names)
+
+    def test_lease_holder_includes_the_module(self):
+        first = type("TestSearch", (MarqoTestCase,), {"__module__": "tests.api_tests.test_a"})
+        second = type("TestSearch", (MarqoTestCase,), {"__module__": "tests.api_tests.test_b"})
+        self.assertNotEqual(first.lease_holder(), second.lease_holder())
+
+    def test_failed_set_up_class_releases_its_leases(self):
+        settings = self.unstructured_settings
+
+        class FailingSetUp(MarqoTestCase):
+            @classmethod
+            def setUpClass(cls):
+                super().setUpClass()
+                cls.lease_indexes([settings])
+                raise RuntimeError("setUpClass failed")
+
+            def test_nothing(self):
+                pass
+
+        with patch.object(MarqoTestCase, "index_pool", self.pool), \
+                patch("tests.marqo_test.MarqoTestCase.create_indexes"), \
+                patch("tests.marqo_test.MarqoTestCase.clear_dirty_indexes"):
+            result = unittest.TestResult()
+            unittest.defaultTestLoader.loadTestsFromTestCase(FailingSetUp).run(result)
+        self.assertEqual(1, len(result.errors))
+        self.assertEqual({}, self.pool._leases)
@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+from marqo.errors import MarqoWebError
+
+from tests.marqo_test import IndexWriteTracker, MarqoTestCase
+
+
+class TestIndexWriteTracker(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tracker = IndexWriteTracker()
+
+    def test_only_document_writes_mark_indexes_dirty(self):
+        base = "http://localhost:8882/indexes"
+        self.tracker.record("POST", f"{base}/added/documents")
+        self.tracker.record("PATCH", f"{base}/updated/documents?device=cpu")
+        self.tracker.record("POST", f"{base}/batch_deleted/documents/delete-batch")
+        self.tracker.record("DELETE", f"{base}/deleted_by_id/documents/doc_1")
+        self.tracker.record("POST", f"{base}/searched/search")
+        self.tracker.record("GET", f"{base}/read/documents/doc_1")
+        self.tracker.record("DELETE", f"{base}/cleared/documents/delete-all")
+
+        names = ["added", "updated", "batch_deleted", "deleted_by_id", "searched", "read", "cleared"]
+        self.assertEqual(["added", "updated", "batch_deleted", "deleted_by_id"], self.tracker.pop_dirty(names))
+        self.assertEqual([], self.tracker.pop_dirty(names))
+
+    def test_install_sees_raw_requests_calls(self):
+        with patch.object(requests.Session, "request", return_value="response"):
+            self.tracker.install()
+            try:
+                self.assertEqual("response", requests.post("http://localhost:8882/indexes/my_index/documents",
+                                                           json={"documents": []}))
+            finally:
+                self.tracker.uninstall()
+        self.assertEqual(["my_index"], self.tracker.pop_dirty(["my_index", "other_index"]))
+
+    def test_clear_dirty_indexes_clears_only_dirty_indexes(self):
+        with patch.object(MarqoTestCase, "write_tracker", self.tracker), \
+                patch.object(MarqoTestCase, "clear_indexes") as mock_clear:
+            self.tracker.mark_dirty(["a", "c"])
+            MarqoTestCase.clear_dirty_indexes(["a", "b", "c"])
+            mock_clear.assert_called_once_with(["a", "c"])
+
+            mock_clear.side_effect = MarqoWebError("cannot clear")
+            self.tracker.mark_dirty(["b"])
+            with self.assertRaises(MarqoWebError):
+                MarqoTestCase.clear_dirty_indexes(["a", "b", "c"])
+        # A failed clear leaves the index dirty so the next setUp retries it
+        self.assertEqual(["b"], self.tracker.pop_dirty(["a", "b", "c"]))
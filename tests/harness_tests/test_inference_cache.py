@@ -0,0 +1,35 @@
+import unittest
+
+from benchmarks import inference_cache
+from tests.corpus import Corpus
+
+
+class TestInferenceCacheStreams(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = Corpus({"text": "text"}, seed=3, vocab_size=500)
+
+    def test_query_stream(self):
+        stream = inference_cache.query_stream(self.corpus, 200, unique_ratio=0.1, zipf_exponent=1.1,
+                                              weighted_fraction=0.5, terms_per_dict=2, seed=1)
+        self.assertEqual(200, len(stream))
+        self.assertEqual(stream, inference_cache.query_stream(self.corpus, 200, 0.1, 1.1, 0.5, 2, seed=1))
+        self.assertLessEqual(len({key for query in stream for key in inference_cache.cache_keys(query)}), 20)
+        self.assertTrue(any(isinstance(query, dict) for query in stream))
+        self.assertTrue(all(len(query) == 2 for query in stream if isinstance(query, dict)))
+        self.assertTrue(any(isinstance(query, str) for query in stream))
+
+        skewed = inference_cache.query_stream(self.corpus, 500, 0.5, 2.0, 0.0, 2, seed=1)
+        uniform = inference_cache.query_stream(self.corpus, 500, 0.5, 0.0, 0.0, 2, seed=1)
+        self.assertLess(len(set(skewed)), len(set(uniform)))
+
+    def test_simulate_lru(self):
+        stream = ["a", "b", "a", "c", "a", {"a": 1.0, "b": 0.5}]
+        self.assertEqual(0.0, inference_cache.simulate_lru(stream, 0)["simulated_query_hit_rate"])
+        # With one entry only a term repeated back to back hits: the dict's "a" right after "a"
+        self.assertEqual(1 / 7, inference_cache.simulate_lru(stream, 1)["simulated_term_hit_rate"])
+        outcome = inference_cache.simulate_lru(stream, 2)
+        # "a" hits twice and the dict's "a" hits, "b" was evicted by "c"
+        self.assertEqual(2 / 6, outcome["simulated_query_hit_rate"])
+        self.assertEqual(3 / 7, outcome["simulated_term_hit_rate"])
+        self.assertEqual(3 / 7, outcome["distinct_term_fraction"])
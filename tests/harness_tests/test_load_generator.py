@@ -0,0 +1,27 @@
+import asyncio
+import time
+import unittest
+
+from benchmarks.load_generator import run_open_loop
+
+
+class TestOpenLoopLoadGenerator(unittest.TestCase):
+
+    def test_latency_includes_queueing_delay(self):
+        """A single worker that needs 20ms per request cannot keep up with 100 requests/sec. A closed-loop client
+        would report ~20ms; measured from the intended send time the backlog must show up in the latency."""
+        outcome = asyncio.run(run_open_loop(lambda i: time.sleep(0.02), rate=100, duration_s=0.3,
+                                            arrival="fixed", max_in_flight=1))
+        self.assertEqual(30, outcome["sent"])
+        self.assertEqual(0, outcome["errors"])
+        self.assertLess(outcome["service_time"].percentile(99), 0.05)
+        self.assertGreater(outcome["latency"].percentile(99), 0.2)
+
+    def test_errors_are_counted_separately(self):
+        def fail_every_other(i):
+            if i % 2:
+                raise RuntimeError("boom")
+
+        outcome = asyncio.run(run_open_loop(fail_every_other, rate=200, duration_s=0.1, arrival="poisson", seed=1))
+        self.assertEqual(outcome["sent"], outcome["errors"] + outcome["latency"].total_count)
+        self.assertGreater(outcome["errors"], 0)
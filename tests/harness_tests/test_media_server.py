@@ -0,0 +1,66 @@
+import os
+import shutil
+import time
+import unittest
+
+import requests
+
+from tests.media_server import ASSETS_DIR, MediaServer
+
+
+class TestMediaServer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = MediaServer(public_host="localhost", seed=0).start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_rewrite_and_serve_assets(self):
+        test_cases = [
+            "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png",
+            "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/ai_hippo_statue_small.png",
+        ]
+        for remote_url in test_cases:
+            with self.subTest(remote_url):
+                local_url = self.server.rewrite(remote_url)
+                self.assertTrue(local_url.startswith(f"http://localhost:{self.server.port}/assets/"))
+                res = requests.get(local_url)
+                self.assertEqual(200, res.status_code)
+                with open(os.path.join(ASSETS_DIR, local_url.rsplit("/", 1)[1]), "rb") as f:
+                    self.assertEqual(f.read(), res.content)
+
+    def test_unknown_urls_are_not_rewritten(self):
+        url = "https://avatars.githubusercontent.com/u/13092433?v=4"
+        self.assertEqual(url, self.server.rewrite(url))
+        self.assertEqual(404, requests.get(self.server.url("assets/../README.md")).status_code)
+
+    def test_generated_image(self):
+        self.assertEqual(200, requests.get(self.server.generate_image(32, 16)).status_code)
+
+    def test_generated_audio(self):
+        remote_url = "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3"
+        audio_url = self.server.rewrite(remote_url)
+        if shutil.which("ffmpeg") is None:
+            # Without ffmpeg there is no local copy, so the remote file is used
+            self.assertEqual(remote_url, audio_url)
+            return
+        self.assertTrue(audio_url.endswith(".mp3"))
+        res = requests.get(audio_url)
+        self.assertEqual(200, res.status_code)
+        # ID3 tag written by ffmpeg's mp3 muxer
+        self.assertTrue(res.content.startswith(b"ID3"))
+
+    def test_latency_bandwidth_and_errors(self):
+        url = self.server.generate_image(64, 64)
+        self.server.latency_s = 0.1
+        self.server.bandwidth_bytes_per_s = 50_000
+        start = time.perf_counter()
+        size = len(requests.get(url).content)
+        self.assertGreater(time.perf_counter() - start, 0.1 + size / 50_000 * 0.8)
+
+        self.server.latency_s, self.server.bandwidth_bytes_per_s = 0, None
+        self.server.error_rate = 1.0
+        self.assertEqual(503, requests.get(url).status_code)
+        self.assertEqual({"requests": 2, "injected_errors": 1}, {
+            key: value for key, value in self.server.reset_stats().items() if key != "bytes_sent"})
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+from marqo.errors import MarqoWebError
+
+from tests.marqo_test import ModelManager
+
+LOADED_MODELS = {"models": [
+    {"model_name": "hf/all-MiniLM-L6-v2", "model_device": "cpu"},
+    {"model_name": "open_clip/ViT-B-32/openai", "model_device": "cpu"},
+    {"model_name": "hf/e5-base-v2", "model_device": "cpu"},
+]}
+
+
+def fake_get(cpu_memory: str, cuda_memory=None):
+    def get(path: str):
+        if path == "models":
+            return LOADED_MODELS
+        if path == "device/cpu":
+            return {"cpu_usage_percent": "1.0 %", "memory_used_percent": cpu_memory, "memory_used_gb": "1.0"}
+        if cuda_memory is None:
+            raise MarqoWebError("CUDA is not available on this instance")
+        return {"cuda_devices": [{"memory_used_percent": cuda_memory}]}
+    return get
+
+
+class TestModelManager(unittest.TestCase):
+
+    def test_models_in_settings(self):
+        self.assertEqual({"hf/all-MiniLM-L6-v2", ModelManager.DEFAULT_MODEL}, ModelManager.models_in_settings([
+            {"type": "unstructured", "model": "hf/all-MiniLM-L6-v2"},
+            {"type": "structured", "allFields": [], "tensorFields": []},
+        ]))
+
+    def test_release_ejects_only_used_models_under_pressure(self):
+        manager = ModelManager(memory_threshold_percent=70)
+        with patch.object(ModelManager, "_get", side_effect=fake_get("85.0 %")), \
+                patch("tests.marqo_test.requests.delete") as mock_delete:
+            mock_delete.return_value.status_code = 200
+            ejected = manager.release(["open_clip/ViT-B-32/openai", "not/loaded"])
+        self.assertEqual(["open_clip/ViT-B-32/openai"], [model["model_name"] for model in ejected])
+        mock_delete.assert_called_once()
+        self.assertEqual({"model_name": "open_clip/ViT-B-32/openai", "model_device": "cpu"},
+                         mock_delete.call_args.kwargs["params"])
+
+    def test_release_keeps_models_without_pressure(self):
+        manager = ModelManager(memory_threshold_percent=70)
+        with patch.object(ModelManager, "_get", side_effect=fake_get("40.0 %")), \
+                patch("tests.marqo_test.requests.delete") as mock_delete:
+            self.assertEqual([], manager.release(["hf/all-MiniLM-L6-v2"]))
+        mock_delete.assert_not_called()
+
+    def test_cuda_memory_counts_as_pressure(self):
+        manager = ModelManager(memory_threshold_percent=70)
+        with patch.object(ModelManager, "_get", side_effect=fake_get("10.0 %", cuda_memory="95.5 %")):
+            self.assertEqual(95.5, manager.memory_used_percent())
+        with patch.object(ModelManager, "_get", side_effect=fake_get("10.0 %")):
+            self.assertEqual(10.0, manager.memory_used_percent())
+
+    def test_release_without_threshold_ignores_memory(self):
+        with patch.object(ModelManager, "_get", side_effect=fake_get("10.0 %")), \
+                patch("tests.marqo_test.requests.delete") as mock_delete:
+            mock_delete.return_value.status_code = 200
+            ejected = ModelManager().release(["hf/all-MiniLM-L6-v2"])
+        self.assertEqual(["hf/all-MiniLM-L6-v2"], [model["model_name"] for model in ejected])
+
+    def test_eject_sends_one_request_per_model(self):
+        with patch("tests.marqo_test.requests.delete") as mock_delete:
+            mock_delete.return_value.status_code = 200
+            ModelManager(memory_threshold_percent=0).eject(LOADED_MODELS["models"])
+        self.assertEqual(3, mock_delete.call_count)
+
+    def test_eject_ignores_models_no_longer_loaded(self):
+        with patch("tests.marqo_test.requests.delete") as mock_delete:
+            mock_delete.return_value.status_code = 404
+            ModelManager().eject(LOADED_MODELS["models"])
+            mock_delete.return_value.status_code = 500
+            mock_delete.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
+            with self.assertRaises(MarqoWebError):
+                ModelManager().eject(LOADED_MODELS["models"])
@@ -0,0 +1,71 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.marqo_test import MarqoTestCase, ModelManager
+from tests.model_prewarm import leased_settings_in_source, models_in_source, prewarm_models
+
+SOURCE = '''
+class TestSomething(MarqoTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.create_indexes([
+            {
+                "indexName": cls.structured_index_name,
+                "type": "structured",
+                "model": "open_clip/ViT-B-32/laion2b_s34b_b79k",
+                "allFields": [{"name": "text_field", "type": "text"}],
+                "tensorFields": ["text_field"],
+            },
+            {"indexName": cls.default_model_index_name, "type": "unstructured"},
+            {"indexName": cls.no_model_index_name, "type": "unstructured", "model": "no_model",
+             "modelProperties": {"type": "no_model", "dimensions": 3}},
+            {"indexName": cls.custom_index_name, "type": "unstructured", "model": "my-model",
+             "modelProperties": {"name": "ViT-B-32", "dimensions": 512, "type": "open_clip"}},
+            {"indexName": cls.variable_index_name, "type": "unstructured", "model": some_model},
+        ])
+        cls.text_index_name, = cls.lease_indexes([{"type": "unstructured", "model": "hf/all-MiniLM-L6-v2"}])
+        cls.image_index_name, = cls.lease_indexes([{"type": "unstructured", "model": "open_clip/ViT-B-32/openai",
+                                                    "normalizeEmbeddings": normalize}])
+        settings = {"type": "unstructured", "model": "random/small"}
+'''
+
+
+class TestModelPrewarm(unittest.TestCase):
+
+    def test_models_in_source(self):
+        self.assertEqual(
+            {"open_clip/ViT-B-32/laion2b_s34b_b79k", ModelManager.DEFAULT_MODEL, "hf/all-MiniLM-L6-v2",
+             "open_clip/ViT-B-32/openai"},
+            models_in_source(SOURCE)
+        )
+
+    def test_leased_settings_in_source(self):
+        # Created indexes are not pooled, and settings only known at run time cannot be leased again
+        self.assertEqual({"hf/all-MiniLM-L6-v2": {"type": "unstructured", "model": "hf/all-MiniLM-L6-v2"}},
+                         leased_settings_in_source(SOURCE))
+
+    def test_prewarm_models_loads_one_model_at_a_time(self):
+        in_flight, overlapped = threading.Semaphore(1), []
+
+        def embed(content):
+            if not in_flight.acquire(blocking=False):
+                overlapped.append(content)
+            try:
+                if client.index.call_args[0][0] == "index-b":
+                    raise Exception("Request rejected, as this request attempted to update the model cache")
+            finally:
+                in_flight.release()
+
+        client = MagicMock()
+        client.index.return_value.embed.side_effect = embed
+        pool = MagicMock()
+        pool.lease.return_value = ["index-a", "index-b", "index-c"]
+        with patch("tests.model_prewarm.Client", return_value=client), \
+                patch.object(MarqoTestCase, "index_pool", pool):
+            load_times = prewarm_models(["model-c", "model-a", "model-b"])
+        self.assertEqual([], overlapped)
+        self.assertEqual(["model-a", "model-b", "model-c"], list(load_times))
+        self.assertIsNone(load_times["model-a"]["error"])
+        self.assertIn("model cache", load_times["model-b"]["error"])
+        pool.release.assert_called_once_with("model_prewarm")
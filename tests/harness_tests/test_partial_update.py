@@ -0,0 +1,17 @@
+import unittest
+
+from benchmarks.partial_update import update_batch
+
+
+class TestUpdateBatch(unittest.TestCase):
+
+    def test_update_batch(self):
+        batch = update_batch(7, seed=1, num_docs=50, num_fields=100, updated_fields=10, docs_per_request=16)
+        self.assertEqual(16, len({doc["_id"] for doc in batch}))
+        for doc in batch:
+            self.assertEqual(11, len(doc))
+            self.assertTrue(all(1 <= value <= 100 for field, value in doc.items() if field != "_id"))
+        self.assertEqual(batch, update_batch(7, 1, 50, 100, 10, 16))
+        self.assertNotEqual(batch, update_batch(8, 1, 50, 100, 10, 16))
+        # A request cannot update more distinct documents than the index has
+        self.assertEqual(3, len(update_batch(0, 1, num_docs=3, num_fields=5, updated_fields=5, docs_per_request=16)))
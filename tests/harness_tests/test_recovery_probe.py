@@ -0,0 +1,35 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from marqo.errors import BackendCommunicationError, MarqoWebError
+
+from tests.recovery_probe import RecoveryProbe, is_recovering_error
+
+
+class TestRecoveryProbe(unittest.TestCase):
+
+    def test_is_recovering_error(self):
+        self.assertTrue(is_recovering_error(BackendCommunicationError("connection refused")))
+        server_error = MarqoWebError("internal error")
+        server_error.status_code = 500
+        self.assertTrue(is_recovering_error(server_error))
+        not_found = MarqoWebError("index not found")
+        not_found.status_code = 404
+        self.assertFalse(is_recovering_error(not_found))
+
+    def test_poll_backs_off_up_to_max_interval(self):
+        probe = RecoveryProbe(client=None, url="http://localhost:8882", index_name="index", query="q",
+                              initial_interval_s=0.1, max_interval_s=0.3, multiplier=2)
+        checks = iter([False] * 4 + [True])
+        with patch("tests.recovery_probe.time.sleep") as mock_sleep:
+            last_interval = probe._poll(lambda: next(checks), start=time.perf_counter(), description="test")
+        self.assertEqual([0.1, 0.2, 0.3, 0.3], [call.args[0] for call in mock_sleep.call_args_list])
+        self.assertEqual(0.3, last_interval)
+        self.assertEqual(0.0, probe._poll(lambda: True, start=time.perf_counter(), description="test"))
+
+    def test_poll_times_out(self):
+        probe = RecoveryProbe(client=None, url="http://localhost:8882", index_name="index", query="q",
+                              timeout_s=0.05, initial_interval_s=0.01)
+        with self.assertRaises(TimeoutError):
+            probe._poll(lambda: False, start=time.perf_counter(), description="test")
@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from tests import reference_ranking
+
+
+class TestReferenceRanking(unittest.TestCase):
+
+    def test_score_modifiers_match_hand_computed_scores(self):
+        # The documents and expected scores of TestDictScoreModifiers.test_multiple_map_values_score_modifiers
+        docs = [
+            {"_id": "1", "map_score_mods": {"a": 1.5, "b": 2, "c": 5}},
+            {"_id": "2", "map_score_mods": {"a": 1.5, "b": 2}},
+            {"_id": "3", "map_score_mods": {"a": 1.5}},
+            {"_id": "4"},
+        ]
+        score_modifiers = {
+            "multiply_score_by": [{"field_name": "map_score_mods.a", "weight": 2}],
+            "add_to_score": [{"field_name": "map_score_mods.b", "weight": 1},
+                             {"field_name": "map_score_mods.c", "weight": 3}],
+        }
+        base_score = 0.845687427
+        np.testing.assert_allclose(
+            [base_score * 3 + 17, base_score * 3 + 2, base_score * 3, base_score],
+            reference_ranking.apply_score_modifiers([base_score] * 4, docs, score_modifiers))
+
+    def test_score_modifiers_on_scalar_fields(self):
+        docs = [{"mult": 2.0, "add": 1}, {"mult": -1.0}, {"add": 4}, {"mult": True, "add": "1"}]
+        score_modifiers = {"multiply_score_by": [{"field_name": "mult", "weight": 10}],
+                           "add_to_score": [{"field_name": "add", "weight": 0.5}]}
+        np.testing.assert_allclose([20.5, -10, 3, 1],
+                                   reference_ranking.apply_score_modifiers([1, 1, 1, 1], docs, score_modifiers))
+        np.testing.assert_allclose([1, 2], reference_ranking.apply_score_modifiers([1, 2], docs[:2], None))
+
+    def test_tie_rank_bounds(self):
+        best, worst = reference_ranking.tie_rank_bounds([3, 2, 2, 1])
+        self.assertEqual([1, 2, 2, 4], best.tolist())
+        self.assertEqual([1, 3, 3, 4], worst.tolist())
+
+    def test_reciprocal_rank_fusion(self):
+        ids, lower, upper = reference_ranking.reciprocal_rank_fusion(
+            ["a", "b", "c"], [0.9, 0.8, 0.7], ["c", "d"], [5.0, 4.0], alpha=0.5, k=60)
+        self.assertEqual(["c", "a", "b", "d"], ids.tolist())
+        np.testing.assert_allclose([0.5 / 63 + 0.5 / 61, 0.5 / 61, 0.5 / 62, 0.5 / 62], upper)
+        np.testing.assert_allclose(upper, lower)
+
+    def test_reciprocal_rank_fusion_with_ties(self):
+        ids, lower, upper = reference_ranking.reciprocal_rank_fusion(["a", "b"], [1.0, 1.0], [], [], alpha=1.0)
+        self.assertEqual({"a", "b"}, set(ids.tolist()))
+        np.testing.assert_allclose([1 / 62, 1 / 62], lower)
+        np.testing.assert_allclose([1 / 61, 1 / 61], upper)
+
+    def test_alpha_leaves_out_the_other_ranking(self):
+        for alpha, expected_ids in [(0.0, ["c", "d"]), (1.0, ["a", "b"])]:
+            with self.subTest(alpha=alpha):
+                ids, _, _ = reference_ranking.reciprocal_rank_fusion(["a", "b"], [0.9, 0.8], ["c", "d"], [2.0, 1.0],
+                                                                     alpha=alpha)
+                self.assertEqual(expected_ids, ids.tolist())
+
+    def test_ranking_matches_thousands_of_documents(self):
+        rng = np.random.default_rng(0)
+        num_docs, limit = 5000, 1000
+        docs = [{"_id": str(i), "boost": float(rng.uniform(0.5, 2))} for i in range(num_docs)]
+        expected = reference_ranking.apply_score_modifiers(rng.random(num_docs), docs,
+                                                           {"multiply_score_by": [{"field_name": "boost"}]})
+        ids = np.array([doc["_id"] for doc in docs], dtype=object)
+        top = np.argsort(-expected)[:limit]
+        self.assertEqual([], reference_ranking.ranking_mismatches(ids[top], expected[top], ids, expected, expected,
+                                                                  limit))
+
+    def test_ranking_mismatches(self):
+        ids, scores = ["a", "b", "c"], np.array([3.0, 2.0, 1.0])
+
+        def mismatches(hit_ids, hit_scores, limit=2, **kwargs):
+            return reference_ranking.ranking_mismatches(hit_ids, hit_scores, ids, scores, scores, limit, **kwargs)
+
+        self.assertEqual([], mismatches(["a", "b"], [3.0, 2.0]))
+        self.assertEqual(1, len(mismatches(["a", "b"], [3.0, 2.5])))  # wrong score
+        self.assertEqual(1, len(mismatches(["a", "x"], [3.0, 2.0])))  # not a candidate
+        self.assertEqual(1, len(mismatches(["b", "a"], [2.0, 3.0])))  # out of order
+        self.assertEqual(1, len(mismatches(["a", "c"], [3.0, 1.0])))  # b should have outranked c
+        self.assertEqual([], mismatches(["a", "c"], [3.0, 1.0], considered_ids=["a", "c"]))
+        self.assertEqual(1, len(mismatches(["a", "b"], [3.0, 2.0], limit=3)))  # c is missing from a short page
@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks import retry
+
+
+class TestRetryPolicies(unittest.TestCase):
+
+    def test_delays(self):
+        self.assertEqual([0.5, 0.5], [retry.FixedDelay(delay_s=0.5).delay_s(a) for a in (1, 2)])
+        exponential = retry.ExponentialBackoff(base_delay_s=0.1, multiplier=2, max_delay_s=0.5)
+        self.assertEqual([0.1, 0.2, 0.4, 0.5], [round(exponential.delay_s(a), 6) for a in (1, 2, 3, 4)])
+        jittered = retry.JitteredBackoff(base_delay_s=0.1, max_delay_s=10, seed=0)
+        for attempt in range(1, 6):
+            self.assertTrue(0 <= jittered.delay_s(attempt) <= exponential.delay_s(attempt) * 20)
+        self.assertEqual(retry.JitteredBackoff(seed=3).delay_s(4), retry.JitteredBackoff(seed=3).delay_s(4))
+
+    def test_wait_on_health_returns_once_ready(self):
+        checks = iter([False, False, True])
+        with patch("benchmarks.retry.time.sleep") as mock_sleep:
+            retry.WaitOnHealth(poll_interval_s=0.01).wait(1, lambda: next(checks))
+        self.assertEqual(2, mock_sleep.call_count)
+
+    def test_wait_on_health_counts_timeouts(self):
+        policy = retry.WaitOnHealth(poll_interval_s=0.01, timeout_s=0.05)
+        policy.wait(1, lambda: True)
+        self.assertEqual(0, policy.timeouts)
+        policy.wait(2, lambda: False)
+        self.assertEqual(1, policy.timeouts)
+
+    def test_build_policy(self):
+        self.assertIsInstance(retry.build_policy("jittered", max_attempts=3, seed=1), retry.JitteredBackoff)
+        with self.assertRaises(ValueError):
+            retry.build_policy("unknown")
+
+    def test_call_with_retries(self):
+        calls = []
+
+        def rejected_twice():
+            calls.append(1)
+            if len(calls) <= 2:
+                raise RuntimeError("rejected")
+
+        outcome = retry.call_with_retries(rejected_twice, retry.FixedDelay(max_attempts=5, delay_s=0),
+                                          is_retryable=lambda e: "rejected" in str(e))
+        self.assertEqual({"attempts": 3, "retryable_failures": 2, "error": None}, outcome)
+
+        outcome = retry.call_with_retries(lambda: 1 / 0, retry.FixedDelay(max_attempts=5, delay_s=0),
+                                          is_retryable=lambda e: "rejected" in str(e))
+        self.assertEqual(1, outcome["attempts"])
+        self.assertIsInstance(outcome["error"], ZeroDivisionError)
+
+        calls.clear()
+        outcome = retry.call_with_retries(rejected_twice, retry.RetryPolicy(), is_retryable=lambda e: True)
+        self.assertEqual(1, outcome["attempts"])
+        self.assertIsNotNone(outcome["error"])
+
+        with self.assertRaises(ValueError):
+            retry.call_with_retries(rejected_twice, retry.FixedDelay(max_attempts=0), is_retryable=lambda e: True)
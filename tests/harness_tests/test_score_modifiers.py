@@ -0,0 +1,22 @@
+import unittest
+
+from benchmarks.score_modifiers import build_corpus, build_score_modifiers
+
+
+class TestScoreModifierBenchmark(unittest.TestCase):
+
+    def test_build_score_modifiers(self):
+        self.assertEqual({}, build_score_modifiers(0, 10))
+        modifiers = build_score_modifiers(5, map_cardinality=10)
+        self.assertEqual(["double_score_mods", "map_score_mods.key_0", "map_score_mods.key_1"],
+                         [modifier["field_name"] for modifier in modifiers["multiply_score_by"]])
+        self.assertEqual(["long_score_mods", "map_score_mods_int.key_0"],
+                         [modifier["field_name"] for modifier in modifiers["add_to_score"]])
+        self.assertEqual(42, sum(len(fields) for fields in build_score_modifiers(42, 20).values()))
+        with self.assertRaises(ValueError):
+            build_score_modifiers(5, map_cardinality=1)
+
+    def test_map_cardinality(self):
+        doc = build_corpus(map_cardinality=50, seed=1).document(0)
+        self.assertEqual([f"key_{i}" for i in range(50)], sorted(doc["map_score_mods"], key=lambda k: int(k[4:])))
+        self.assertEqual(50, len(doc["map_score_mods_int"]))
@@ -0,0 +1,51 @@
+import argparse
+import os
+import unittest
+from unittest.mock import patch
+
+from benchmarks import common, sweep
+
+
+class TestSweepGrid(unittest.TestCase):
+
+    def test_parse_setting(self):
+        self.assertEqual(("MARQO_INFERENCE_CACHE_SIZE", ["0", "1000"]),
+                         sweep.parse_setting("MARQO_INFERENCE_CACHE_SIZE=0,1000"))
+        for value in ("MARQO_INFERENCE_CACHE_SIZE", "=1", "MARQO_INFERENCE_CACHE_SIZE="):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                sweep.parse_setting(value)
+
+    def test_build_grid(self):
+        grid = sweep.build_grid({"A": ["1", "2"], "cpus": ["2", "4"], "memory": ["8g"]})
+        self.assertEqual(4, len(grid))
+        self.assertEqual({"A": "1", "cpus": "2", "memory": "8g"}, grid[0])
+        self.assertEqual({"A": "2", "cpus": "4", "memory": "8g"}, grid[-1])
+        self.assertEqual([{}], sweep.build_grid({}))
+
+    def test_split_point(self):
+        env_vars, docker_args = sweep.split_point({"A": "1", "cpus": "2", "memory": "8g"})
+        self.assertEqual({"A": "1"}, env_vars)
+        self.assertEqual(["--cpus", "2", "--memory", "8g"], docker_args)
+
+
+class TestRestartMarqo(unittest.TestCase):
+
+    def test_uses_the_start_script_of_the_configuration(self):
+        with patch.dict(os.environ, {"TESTING_CONFIGURATION": "CUDA_DOCKER_MARQO", "MARQO_IMAGE_NAME": "marqo:test"}), \
+                patch("benchmarks.common.subprocess.run") as mock_run:
+            common.restart_marqo({"MARQO_MAX_CPU_MODEL_MEMORY": "4", "MARQO_INFERENCE_CACHE_SIZE": "10"},
+                                 ["--cpus", "2"])
+        command = mock_run.call_args.args[0]
+        self.assertTrue(command[1].endswith("start_cuda_docker_marqo.sh"))
+        # Script defaults are overridden through the environment, everything else with `-e`
+        self.assertEqual(["marqo:test", "--cpus", "2", "-e", "MARQO_INFERENCE_CACHE_SIZE=10"], command[2:])
+        self.assertEqual("4", mock_run.call_args.kwargs["env"]["MARQO_MAX_CPU_MODEL_MEMORY"])
+        self.assertEqual(str(common.DEFAULT_START_TIMEOUT_S), mock_run.call_args.kwargs["env"]["MARQO_START_TIMEOUT"])
+        self.assertIsNotNone(mock_run.call_args.kwargs["timeout"])
+
+    def test_refuses_configurations_without_a_start_script(self):
+        with patch.dict(os.environ, {"TESTING_CONFIGURATION": "CUSTOM"}), \
+                patch("benchmarks.common.subprocess.run") as mock_run:
+            with self.assertRaises(RuntimeError):
+                common.restart_marqo({})
+        mock_run.assert_not_called()
@@ -0,0 +1,64 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from marqo import Client
+
+from tests.telemetry_harvester import TelemetryHarvester, server_time_ms
+
+
+class _TelemetryHandler(BaseHTTPRequestHandler):
+    """Echoes back whether telemetry was requested, with a fixed telemetry object if it was."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        response = {"hits": []}
+        if "telemetry=True" in self.path:
+            response["telemetry"] = {"timesMs": {"search.vector_inference_full_pipeline": 4.0,
+                                                 "search.vector_inference_full_pipeline.encode": 3.0,
+                                                 "search.vespa": 2.0}}
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTelemetryHarvester(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = HTTPServer(("localhost", 0), _TelemetryHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://localhost:{self.server.server_port}"
+        self.harvester = TelemetryHarvester(report_path="unused.json")
+        self.harvester.install()
+
+    def tearDown(self) -> None:
+        self.harvester.uninstall()
+        self.server.shutdown()
+
+    def test_server_time_ignores_nested_phases(self):
+        self.assertEqual(6.0, server_time_ms({"a.b": 4.0, "a.b.c": 3.0, "a.d": 2.0}))
+
+    def test_telemetry_is_harvested_and_stripped(self):
+        res = Client(url=self.url).http.post(path="indexes/my_index/search", body={"q": "test"})
+        self.assertEqual({"hits": []}, res)
+
+        self.assertEqual(1, len(self.harvester.records))
+        record = self.harvester.records[0]
+        self.assertEqual("POST /indexes/{index_name}/search", record["endpoint"])
+        self.assertAlmostEqual(0.006, record["server_time"])
+
+        summary = self.harvester.summary()["by_endpoint"]["POST /indexes/{index_name}/search"]
+        self.assertEqual(1, summary["overhead"]["count"])
+        self.assertIn("search.vespa", summary["phases"])
+
+    def test_telemetry_is_kept_when_requested_by_the_test(self):
+        res = Client(url=self.url, return_telemetry=True).http.post(path="indexes/my_index/search", body={})
+        self.assertIn("telemetry", res)
+        self.assertEqual(1, len(self.harvester.records))
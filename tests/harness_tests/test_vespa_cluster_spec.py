@@ -0,0 +1,63 @@
+import io
+import unittest
+import zipfile
+from xml.etree import ElementTree
+
+from scripts import start_vespa
+from scripts.start_vespa import ClusterSpec
+
+
+class TestVespaClusterSpec(unittest.TestCase):
+
+    def test_default_matches_single_node_package(self):
+        services = ElementTree.fromstring(start_vespa.get_services_xml_content())
+        self.assertIsNone(services.find("admin"))
+        self.assertEqual(["node1"], [node.get("hostalias") for node in services.iterfind("container/nodes/node")])
+        self.assertEqual([("node1", "0")], [(node.get("hostalias"), node.get("distribution-key"))
+                                            for node in services.iterfind("content/nodes/node")])
+        self.assertEqual("2", services.findtext("content/redundancy"))
+        self.assertEqual("test_vespa_client", services.find("content/documents/document").get("type"))
+        self.assertIsNone(services.find("content/engine"))
+        self.assertIsNone(services.find("container/search/threadpool"))
+
+        with zipfile.ZipFile(io.BytesIO(start_vespa.generate_application_package())) as package:
+            self.assertEqual(["services.xml", "schemas/test_vespa_client.sd"], package.namelist())
+
+    def test_multi_node_cluster(self):
+        spec = ClusterSpec(container_nodes=2, content_nodes=3, redundancy=3, searchable_copies=2,
+                           jvm_allocated_memory="50%", search_threads=64, feed_threads=16, proton_search_threads=8,
+                           feeding_concurrency=0.5)
+        services = ElementTree.fromstring(start_vespa.get_services_xml_content(spec))
+        self.assertEqual("node1", services.find("admin/configservers/configserver").get("hostalias"))
+        self.assertEqual(["node1", "node2"],
+                         [node.get("hostalias") for node in services.iterfind("container/nodes/node")])
+        self.assertEqual(["0", "1", "2"],
+                         [node.get("distribution-key") for node in services.iterfind("content/nodes/node")])
+        self.assertEqual("50%", services.find("container/nodes/jvm").get("allocated-memory"))
+        self.assertEqual("64", services.findtext("container/search/threadpool/threads"))
+        self.assertEqual("16", services.findtext("container/document-api/threadpool/threads"))
+        self.assertEqual("3", services.findtext("content/redundancy"))
+        proton = services.find("content/engine/proton")
+        self.assertEqual("2", proton.findtext("searchable-copies"))
+        self.assertEqual("8", proton.findtext("tuning/searchnode/requestthreads/search"))
+        self.assertEqual("0.5", proton.findtext("tuning/searchnode/feeding/concurrency"))
+
+        hosts = ElementTree.fromstring(start_vespa.get_hosts_xml_content(spec))
+        self.assertEqual({"vespa-1": "node1", "vespa-2": "node2", "vespa-3": "node3"},
+                         {host.get("name"): host.findtext("alias") for host in hosts.iterfind("host")})
+        self.assertEqual(["vespa", "vespa-2", "vespa-3"], [spec.container_name(i) for i in range(spec.num_hosts)])
+        with zipfile.ZipFile(io.BytesIO(start_vespa.generate_application_package(spec))) as package:
+            self.assertIn("hosts.xml", package.namelist())
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            ClusterSpec(content_nodes=0)
+        with self.assertRaises(ValueError):
+            ClusterSpec(redundancy=2, searchable_copies=3)
+        with self.assertRaises(ValueError):
+            ClusterSpec(feeding_concurrency=1.5)
+
+    def test_parse_cluster_spec(self):
+        spec = start_vespa.parse_cluster_spec(["--content-nodes", "4", "--redundancy", "3"])
+        self.assertEqual((1, 4, 3, None), (spec.container_nodes, spec.content_nodes, spec.redundancy,
+                                           spec.searchable_copies))
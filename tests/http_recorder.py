@@ -0,0 +1,167 @@
+"""A pytest plugin that records the latency of every HTTP call the test session makes to Marqo.
+
+Both the Marqo python client (`marqo._httprequests.HttpRequests`) and the raw `requests` calls in
+`MarqoTestCase` end up in `requests.Session.request`, so that is the single place we wrap.
+
+Enable it by pointing the MARQO_API_TESTS_HTTP_REPORT environment variable at a JSON file, e.g.:
+
+    MARQO_API_TESTS_HTTP_REPORT=http_report.json pytest tests/api_tests
+
+At the end of the session the JSON summary (p50/p95/p99 per endpoint and per test class) is written to that
+path, and the same summary in CSV form is written next to it with a `.csv` extension.
+"""
+import csv
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from tests import utilities
+
+HTTP_REPORT_ENV_VAR = "MARQO_API_TESTS_HTTP_REPORT"
+
+# Sub-paths of /indexes/{index_name}/documents that are actions rather than document IDs
+_DOCUMENT_ACTIONS = {"delete-all", "delete-batch", "get-batch"}
+
+
+def path_template(url: str) -> str:
+    """Returns the path of url with index names and document IDs replaced by placeholders,
+    so calls to different indexes are grouped under the same endpoint.
+
+    E.g. http://localhost:8882/indexes/my_index/documents/doc_1?x=y -> /indexes/{index_name}/documents/{document_id}
+    """
+    segments = urlsplit(url).path.strip("/").split("/")
+    if len(segments) >= 2 and segments[0] == "indexes":
+        segments[1] = "{index_name}"
+        if len(segments) >= 4 and segments[2] == "documents" and segments[3] not in _DOCUMENT_ACTIONS:
+            segments[3] = "{document_id}"
+    return "/" + "/".join(segments)
+
+
+def _body_size(data, json_body) -> int:
+    if data is None and json_body is not None:
+        data = json.dumps(json_body)
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, bytes):
+        return len(data)
+    # Files and generators are not measured
+    return 0
+
+
+class CurrentTestClassTracker:
+    """Keeps track of the test class that is currently running, so recorded calls can be attributed to it."""
+
+    current_class = "session"
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        # setUpClass/tearDownClass run inside the first/last test of the class, so they are attributed to it.
+        # Keyed by module as well, the same as index leases, as some class names are used in more than one module
+        self.current_class = f"{item.module.__name__}.{item.cls.__qualname__}" if item.cls is not None \
+            else item.module.__name__
+        yield
+        self.current_class = "session"
+
+
+class HttpRecorder(CurrentTestClassTracker):
+    """Wraps `requests.Session.request` for the lifetime of the session and records one entry per call
+    made to base_url."""
+
+    def __init__(self, base_url: str, report_path: str):
+        self.base_url = base_url.rstrip("/")
+        self.report_path = report_path
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._original_request = None
+
+    def install(self) -> None:
+        original_request = requests.Session.request
+        recorder = self
+
+        def recording_request(session, method, url, *args, **kwargs):
+            if not str(url).startswith(recorder.base_url):
+                return original_request(session, method, url, *args, **kwargs)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = original_request(session, method, url, *args, **kwargs)
+                return response
+            finally:
+                recorder.record(
+                    method=method, url=str(url), response=response, wall_time=time.perf_counter() - start,
+                    bytes_sent=_body_size(kwargs.get("data"), kwargs.get("json"))
+                )
+
+        self._original_request = original_request
+        requests.Session.request = recording_request
+
+    def uninstall(self) -> None:
+        if self._original_request is not None:
+            requests.Session.request = self._original_request
+            self._original_request = None
+
+    def record(self, method: str, url: str, response: Optional[requests.Response], wall_time: float,
+               bytes_sent: int) -> None:
+        entry = {
+            "method": method.upper(),
+            "path": path_template(url),
+            "status": response.status_code if response is not None else None,
+            "bytes_sent": bytes_sent,
+            "bytes_received": len(response.content) if response is not None else 0,
+            "wall_time": wall_time,
+            "test_class": self.current_class,
+        }
+        with self._lock:
+            self.records.append(entry)
+
+    def summary(self) -> Dict[str, Dict[str, Dict]]:
+        by_endpoint: Dict[str, List[Dict]] = {}
+        by_class: Dict[str, List[Dict]] = {}
+        for entry in self.records:
+            by_endpoint.setdefault(f"{entry['method']} {entry['path']}", []).append(entry)
+            by_class.setdefault(entry["test_class"], []).append(entry)
+        return {
+            "by_endpoint": {key: self._summarise(entries) for key, entries in sorted(by_endpoint.items())},
+            "by_class": {key: self._summarise(entries) for key, entries in sorted(by_class.items())},
+        }
+
+    @staticmethod
+    def _summarise(entries: List[Dict]) -> Dict:
+        summary = utilities.summarise_latencies([entry["wall_time"] for entry in entries])
+        summary["total_s"] = sum(entry["wall_time"] for entry in entries)
+        summary["errors"] = sum(1 for entry in entries if entry["status"] is None or entry["status"] >= 400)
+        summary["bytes_sent"] = sum(entry["bytes_sent"] for entry in entries)
+        summary["bytes_received"] = sum(entry["bytes_received"] for entry in entries)
+        return summary
+
+    def write_report(self) -> Tuple[str, str]:
+        summary = self.summary()
+        with open(self.report_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+        csv_path = os.path.splitext(self.report_path)[0] + ".csv"
+        columns = ["count", "errors", "total_s", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                   "bytes_sent", "bytes_received"]
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["group", "key"] + columns)
+            for group, rows in summary.items():
+                for key, row in rows.items():
+                    writer.writerow([group, key] + [row[column] for column in columns])
+        return self.report_path, csv_path
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        # trylast, so the index pool deletion in conftest.py is still recorded
+        self.uninstall()
+        if self.records:
+            json_path, csv_path = self.write_report()
+            print(f"\nHTTP latency report written to {json_path} and {csv_path}")
@@ -2,9 +2,15 @@
 
 Pass its settings to local_marqo_settings.
 """
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Set
+from urllib.parse import urlsplit
+import hashlib
 import json
+import os
+import threading
 import time
+import uuid
 
 import unittest
 from marqo.utils import construct_authorized_url
@@ -13,10 +19,244 @@ from marqo.errors import MarqoWebError
 import requests
 
 
+class IndexPool:
+    """A session-wide pool of indexes that are shared between test classes.
+
+    Indexes are keyed by a fingerprint of their settings (everything except `indexName`), so classes
+    asking for identical settings reuse the same index instead of paying a Vespa redeploy on every
+    create and delete. Each distinct index is created at most once per session and all pooled
+    indexes are deleted in a single batch call at the end of the session (see conftest.py).
+    """
+
+    def __init__(self):
+        # fingerprint -> names of the pooled indexes with these settings
+        self._indexes: Dict[str, List[str]] = {}
+        # index name -> name of the test class currently holding a lease on it
+        self._leases: Dict[str, str] = {}
+
+    @staticmethod
+    def fingerprint(index_settings: Dict) -> str:
+        """Returns a stable hash of the index settings, ignoring `indexName` and key order."""
+        settings = {key: value for key, value in index_settings.items() if key != "indexName"}
+        canonical = json.dumps(settings, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def lease(self, holder: str, index_settings_list: List[Dict]) -> List[str]:
+        """Leases one index per settings dict to `holder`, creating any missing indexes in one batch.
+
+        Args:
+            holder: name of the test class taking the lease
+            index_settings_list: index settings in camelCase, without `indexName`
+
+        Returns:
+            The names of the leased indexes, in the same order as index_settings_list
+        """
+        leased_names = []
+        to_create = []
+        for index_settings in index_settings_list:
+            fingerprint = self.fingerprint(index_settings)
+            candidates = self._indexes.setdefault(fingerprint, [])
+            free_names = [name for name in candidates if name not in self._leases]
+            if free_names:
+                index_name = free_names[0]
+            else:
+                index_name = f"pool_{fingerprint[:10]}_{uuid.uuid4().hex[:8]}"
+                to_create.append({**index_settings, "indexName": index_name})
+                candidates.append(index_name)
+            self._leases[index_name] = holder
+            leased_names.append(index_name)
+
+        if to_create:
+            try:
+                MarqoTestCase.create_indexes(to_create)
+            except MarqoWebError:
+                for index_settings in to_create:
+                    self._forget(index_settings["indexName"])
+                raise
+        return leased_names
+
+    def release(self, holder: str) -> List[str]:
+        """Returns all indexes leased by `holder` to the pool. The caller is responsible for
+        leaving them empty."""
+        released = [name for name, lease_holder in self._leases.items() if lease_holder == holder]
+        for index_name in released:
+            del self._leases[index_name]
+        return released
+
+    def delete_all(self) -> None:
+        """Deletes every pooled index in a single batch call."""
+        index_names = [name for names in self._indexes.values() for name in names]
+        if index_names:
+            MarqoTestCase.delete_indexes(index_names)
+        self._indexes.clear()
+        self._leases.clear()
+
+    def _forget(self, index_name: str) -> None:
+        self._leases.pop(index_name, None)
+        for names in self._indexes.values():
+            if index_name in names:
+                names.remove(index_name)
+
+
+class IndexWriteTracker:
+    """Tracks which indexes have had documents written to them since they were last cleared.
+
+    Both the Marqo python client and raw `requests` calls in the tests go through `requests.Session.request`, which
+    is wrapped once per process. Any non-GET request to /indexes/{index_name}/documents[/...] (add, update,
+    delete-batch, delete by ID) marks the index dirty, whether or not it succeeds. delete-all empties the index,
+    so it does not.
+    """
+
+    _WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self):
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+        self._original_request = None
+
+    def install(self) -> None:
+        if self._original_request is not None:
+            return
+        original_request = requests.Session.request
+        tracker = self
+
+        def tracking_request(session, method, url, *args, **kwargs):
+            tracker.record(method, str(url))
+            return original_request(session, method, url, *args, **kwargs)
+
+        self._original_request = original_request
+        requests.Session.request = tracking_request
+
+    def uninstall(self) -> None:
+        if self._original_request is not None:
+            requests.Session.request = self._original_request
+            self._original_request = None
+
+    def record(self, method: str, url: str) -> None:
+        if method.upper() not in self._WRITE_METHODS:
+            return
+        segments = urlsplit(url).path.strip("/").split("/")
+        if len(segments) >= 3 and segments[0] == "indexes" and segments[2] == "documents":
+            if len(segments) >= 4 and segments[3] == "delete-all":
+                return
+            self.mark_dirty([segments[1]])
+
+    def mark_dirty(self, index_names: Iterable[str]) -> None:
+        with self._lock:
+            self._dirty.update(index_names)
+
+    def pop_dirty(self, index_names: Iterable[str]) -> List[str]:
+        """Returns the dirty indexes among index_names and marks them clean."""
+        with self._lock:
+            dirty = [name for name in index_names if name in self._dirty]
+            self._dirty.difference_update(dirty)
+        return dirty
+
+    def discard(self, index_names: Iterable[str]) -> None:
+        with self._lock:
+            self._dirty.difference_update(index_names)
+
+
+class ModelManager:
+    """Ejects models between test classes, concurrently.
+
+    By default every loaded model is ejected after each test class. Loaded models are shared by every index using
+    them though, so ejecting eagerly makes the next class that uses the same model pay for reloading it (seconds
+    for a CLIP model). Setting MARQO_API_TESTS_MODEL_MEMORY_THRESHOLD (a percentage) opts in to only ejecting a
+    class's own models, and only when the CPU or any CUDA device memory used is above the threshold.
+    """
+
+    # The model Marqo uses for indexes created without a `model`
+    DEFAULT_MODEL = "hf/e5-base-v2"
+    MEMORY_THRESHOLD_ENV_VAR = "MARQO_API_TESTS_MODEL_MEMORY_THRESHOLD"
+
+    def __init__(self, memory_threshold_percent: Optional[float] = None):
+        if memory_threshold_percent is None and os.environ.get(self.MEMORY_THRESHOLD_ENV_VAR):
+            memory_threshold_percent = float(os.environ[self.MEMORY_THRESHOLD_ENV_VAR])
+        # None ejects every loaded model after each class
+        self.memory_threshold_percent = memory_threshold_percent
+
+    @classmethod
+    def models_in_settings(cls, index_settings_list: List[Dict]) -> Set[str]:
+        return {index_settings.get("model", cls.DEFAULT_MODEL) for index_settings in index_settings_list}
+
+    @staticmethod
+    def _get(path: str) -> Dict:
+        r = requests.get(f"{MarqoTestCase._MARQO_URL}/{path}")
+        try:
+            r.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise MarqoWebError(e)
+        return r.json()
+
+    @staticmethod
+    def _parse_percent(value) -> float:
+        # Marqo reports percentages as strings such as "42.0 %"
+        return float(str(value).replace("%", "").strip())
+
+    def loaded_models(self) -> List[Dict]:
+        """Returns the loaded models as dicts with `model_name` and `model_device`."""
+        return self._get("models").get("models", [])
+
+    def memory_used_percent(self) -> float:
+        """Returns the highest memory usage of the CPU and the CUDA devices, in percent."""
+        usages = [self._parse_percent(self._get("device/cpu")["memory_used_percent"])]
+        try:
+            usages.extend(self._parse_percent(device["memory_used_percent"])
+                          for device in self._get("device/cuda").get("cuda_devices", []))
+        except MarqoWebError:
+            # CUDA is not available on this instance
+            pass
+        return max(usages)
+
+    def eject(self, models: List[Dict]) -> None:
+        """Ejects the given loaded models concurrently. Models that are no longer loaded are ignored."""
+        def eject_model(model: Dict):
+            r = requests.delete(f"{MarqoTestCase._MARQO_URL}/models",
+                                params={"model_name": model["model_name"], "model_device": model["model_device"]})
+            if r.status_code == 404:
+                # Ejected concurrently or by Marqo's own cache eviction
+                return
+            try:
+                r.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                raise MarqoWebError(e)
+
+        if not models:
+            return
+        with ThreadPoolExecutor(max_workers=len(models)) as executor:
+            list(executor.map(eject_model, models))
+
+    def release(self, model_names: Iterable[str]) -> List[Dict]:
+        """Ejects the loaded models among model_names if memory usage is above the threshold, or regardless of
+        memory usage if there is no threshold.
+
+        Returns:
+            The ejected models
+        """
+        model_names = set(model_names)
+        to_eject = [model for model in self.loaded_models() if model["model_name"] in model_names]
+        if not to_eject:
+            return []
+        if self.memory_threshold_percent is not None and self.memory_used_percent() < self.memory_threshold_percent:
+            return []
+        self.eject(to_eject)
+        return to_eject
+
+
 class MarqoTestCase(unittest.TestCase):
 
     indexes_to_delete = []
+    leased_indexes = []
     _MARQO_URL = "http://localhost:8882"
+    index_pool = IndexPool()
+    write_tracker = IndexWriteTracker()
+    model_manager = ModelManager()
+    used_models: Set[str] = set()
+    # Set by the local_media_server fixture in conftest.py when MARQO_API_TESTS_LOCAL_MEDIA is set
+    media_server = None
+    # Index name -> index type of every index created through create_indexes (including pooled indexes)
+    index_types: Dict[str, str] = {}
 
     @classmethod
     def setUpClass(cls) -> None:
@@ -27,25 +267,42 @@ class MarqoTestCase(unittest.TestCase):
         cls.authorized_url = cls.client_settings["url"]
         # A list with index names to be cleared in each setUp call and to be deleted in tearDownClass call
         cls.indexes_to_delete: List[str] = []
+        # A list with index names leased from the shared index pool. These are cleared like
+        # indexes_to_delete, but returned to the pool after tearDownClass instead of being deleted
+        cls.leased_indexes: List[str] = []
+        # Models of the indexes this class created or leased, candidates for ejection in tearDownClass
+        cls.used_models: Set[str] = set()
+        cls.client = Client(**cls.client_settings)
+        cls.write_tracker.install()
+
+    @classmethod
+    def use_marqo_at(cls, url: str) -> None:
+        """Points the class's client at the Marqo running at url, e.g. one returned by
+        utilities.rerun_marqo_with_env_vars. Index helpers such as create_indexes keep using _MARQO_URL."""
+        cls.client_settings = {"url": url}
+        cls.authorized_url = url
         cls.client = Client(**cls.client_settings)
 
     @classmethod
     def tearDownClass(cls) -> None:
-        # A function that will be automatically called after each test call
-        # This removes all the loaded models to save memory space.
-        cls.removeAllModels()
+        # Eject the models this class used if Marqo is running low on memory
+        cls.release_models()
         if cls.indexes_to_delete:
             cls.delete_indexes(cls.indexes_to_delete)
 
     def setUp(self) -> None:
-        if self.indexes_to_delete:
-            self.clear_indexes(self.indexes_to_delete)
+        # Only indexes that had documents written to them since they were last cleared need clearing
+        self.clear_dirty_indexes(self.indexes_to_delete + self.leased_indexes)
 
     @classmethod
     def create_indexes(cls, index_settings_with_name: List[Dict]):
         """A function to call the internal Marqo API to create a batch of indexes.
          Use camelCase for the keys.
         """
+        if cls is not MarqoTestCase:
+            cls.used_models.update(ModelManager.models_in_settings(index_settings_with_name))
+        for index_settings in index_settings_with_name:
+            MarqoTestCase.index_types[index_settings["indexName"]] = index_settings.get("type", "unstructured")
 
         r = requests.post(f"{cls._MARQO_URL}/batch/indexes/create", data=json.dumps(index_settings_with_name))
 
@@ -54,6 +311,57 @@ class MarqoTestCase(unittest.TestCase):
         except requests.exceptions.HTTPError as e:
             raise MarqoWebError(e)
 
+    @classmethod
+    def is_unstructured(cls, index_name: str) -> bool:
+        """Whether index_name, created or leased in this session, is an unstructured index. Use this rather than
+        the index name, as pooled index names do not say what type the index is."""
+        return cls.index_types[index_name] == "unstructured"
+
+    @classmethod
+    def media_url(cls, url: str) -> str:
+        """Returns the local copy of a remote media URL if the local media server is running, otherwise url.
+
+        Call it at test or setUpClass time, not at import time, as the server starts with the session.
+        """
+        if cls.media_server is None:
+            return url
+        return cls.media_server.rewrite(url)
+
+    @classmethod
+    def lease_indexes(cls, index_settings: List[Dict]) -> List[str]:
+        """Leases indexes with the given settings from the session-wide index pool.
+
+        Use this instead of create_indexes when the test class does not need to delete, recreate or otherwise
+        own the index. Settings use camelCase keys and must not contain `indexName`; the pooled index names are
+        returned in the same order as the settings. Leased indexes are cleared in each setUp call and returned
+        to the pool after tearDownClass, or straight away if setUpClass fails after leasing them.
+        """
+        index_names = cls.index_pool.lease(cls.lease_holder(), index_settings)
+        cls.used_models.update(ModelManager.models_in_settings(index_settings))
+        if not cls.leased_indexes:
+            # Class cleanups also run when setUpClass raises, unlike tearDownClass
+            cls.addClassCleanup(cls.release_indexes)
+        cls.leased_indexes = cls.leased_indexes + index_names
+        return index_names
+
+    @classmethod
+    def lease_holder(cls) -> str:
+        """The name leases are held under, unique across test modules."""
+        return f"{cls.__module__}.{cls.__qualname__}"
+
+    @classmethod
+    def release_indexes(cls) -> None:
+        """Clears the indexes leased by this class and returns them to the pool."""
+        released = cls.index_pool.release(cls.lease_holder())
+        try:
+            cls.clear_dirty_indexes(released)
+        except MarqoWebError:
+            # An index we cannot clear must not be handed to another class
+            for index_name in released:
+                cls.index_pool._forget(index_name)
+            cls.delete_indexes(released)
+        cls.leased_indexes = []
+
     @classmethod
     def delete_indexes(cls, index_names: List[str]):
         r = requests.post(f"{cls._MARQO_URL}/batch/indexes/delete", data=json.dumps(index_names))
@@ -62,29 +370,47 @@ class MarqoTestCase(unittest.TestCase):
             r.raise_for_status()
         except requests.exceptions.HTTPError as e:
             raise MarqoWebError(e)
+        cls.write_tracker.discard(index_names)
 
     @classmethod
     def clear_indexes(cls, index_names: List[str]):
-        for index_name in index_names:
+        """Deletes all documents of the given indexes, sending the delete-all requests concurrently."""
+        def clear_index(index_name: str):
             r = requests.delete(f"{cls._MARQO_URL}/indexes/{index_name}/documents/delete-all")
             try:
                 r.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 raise MarqoWebError(e)
 
+        if not index_names:
+            return
+        with ThreadPoolExecutor(max_workers=len(index_names)) as executor:
+            futures = [executor.submit(clear_index, index_name) for index_name in index_names]
+        for future in futures:
+            future.result()
+
+    @classmethod
+    def clear_dirty_indexes(cls, index_names: List[str]) -> None:
+        """Clears the indexes among index_names that had documents written to them since they were last cleared."""
+        dirty = cls.write_tracker.pop_dirty(index_names)
+        try:
+            cls.clear_indexes(dirty)
+        except MarqoWebError:
+            cls.write_tracker.mark_dirty(dirty)
+            raise
+
+    @classmethod
+    def release_models(cls) -> None:
+        """Ejects every loaded model, or with a memory threshold set only the models used by this class's indexes
+        if Marqo is under memory pressure, see ModelManager."""
+        if cls.model_manager.memory_threshold_percent is None:
+            cls.removeAllModels()
+        elif cls.used_models:
+            cls.model_manager.release(cls.used_models)
 
     @classmethod
     def removeAllModels(cls) -> None:
         # A function that can be called to remove loaded models in Marqo.
         # Use it whenever you think there is a risk of OOM problem.
         # E.g., add it into the `tearDown` function to remove models between test cases.
-        client = Client(**cls.client_settings)
-        index_names_list: List[str] = [item["indexName"] for item in client.get_indexes()["results"]]
-        for index_name in index_names_list:
-            loaded_models = client.index(index_name).get_loaded_models().get("models", [])
-            for model in loaded_models:
-                try:
-                    client.index(index_name).eject_model(model_name=model["model_name"], model_device=model["model_device"])
-                except MarqoWebError:
-                    pass
-
+        cls.model_manager.eject(cls.model_manager.loaded_models())
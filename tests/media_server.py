@@ -0,0 +1,203 @@
+"""A local HTTP server for the images, audio and video the tests index.
+
+Many tests index media hosted on S3 or GitHub, which makes them slow and impossible to run offline. MediaServer
+serves the files in `assets/` plus generated audio/video/image fixtures from the test machine, and
+MarqoTestCase.media_url rewrites the remote URLs the tests use to their local copies while a server is running.
+
+It runs for the whole session when the MARQO_API_TESTS_LOCAL_MEDIA environment variable is set (see conftest.py).
+Marqo runs in docker, so URLs are built with the host name Marqo can reach the test machine on, set with
+MARQO_API_TESTS_MEDIA_HOST (`host.docker.internal` by default, which the start scripts map to the docker host).
+
+The server can also simulate a slow or unreliable network: per-request latency, a bandwidth cap and a rate of
+injected errors can be changed at any time, which is how benchmarks.media_download measures Marqo's media
+download path under controlled network conditions.
+"""
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+LOCAL_MEDIA_ENV_VAR = "MARQO_API_TESTS_LOCAL_MEDIA"
+MEDIA_HOST_ENV_VAR = "MARQO_API_TESTS_MEDIA_HOST"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+# Remote media used by the tests -> path of the local copy served by MediaServer
+LOCAL_COPIES = {
+    "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_statue.png": "assets/ai_hippo_statue.png",
+    "https://marqo-assets.s3.amazonaws.com/tests/images/ai_hippo_realistic.png": "assets/ai_hippo_realistic.png",
+    "https://marqo-ecs-50-audio-test-dataset.s3.amazonaws.com/audios/marqo-audio-test.mp3": "generated/tone.mp3",
+    "https://marqo-k400-video-test-dataset.s3.amazonaws.com/videos/---QUuC4vJs_000084_000094.mp4":
+        "generated/video.mp4",
+}
+RAW_GITHUB_ASSETS_PREFIX = "https://raw.githubusercontent.com/marqo-ai/marqo-api-tests/mainline/assets/"
+
+
+def write_tone_mp3(path: str, duration_s: int = 3, frequency: int = 440) -> bool:
+    """Generates a sine tone MP3 with ffmpeg. Returns False if ffmpeg is not installed."""
+    if shutil.which("ffmpeg") is None:
+        return False
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", f"sine=frequency={frequency}:duration={duration_s}", "-codec:a", "libmp3lame", path],
+        check=True
+    )
+    return True
+
+
+def write_test_video(path: str, duration_s: int = 3) -> bool:
+    """Generates a test pattern video with ffmpeg. Returns False if ffmpeg is not installed."""
+    if shutil.which("ffmpeg") is None:
+        return False
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", f"testsrc=duration={duration_s}:size=320x240:rate=10", "-pix_fmt", "yuv420p", path],
+        check=True
+    )
+    return True
+
+
+class _MediaRequestHandler(SimpleHTTPRequestHandler):
+    server: "_MediaHTTPServer"
+
+    def translate_path(self, path: str) -> str:
+        path = path.split("?", 1)[0].split("#", 1)[0]
+        for prefix, directory in (("/generated/", self.server.media.generated_dir), ("/assets/", ASSETS_DIR)):
+            if path.startswith(prefix):
+                relative = os.path.normpath(path[len(prefix):]).lstrip(os.sep)
+                if relative.startswith(".."):
+                    break
+                return os.path.join(directory, relative)
+        return os.path.join(self.server.media.generated_dir, "does_not_exist")
+
+    def do_GET(self):
+        media = self.server.media
+        media.record_request()
+        if media.latency_s:
+            time.sleep(media.latency_s)
+        if media.error_rate and media.rng.random() < media.error_rate:
+            media.record_error()
+            self.send_error(media.error_status, "Injected error")
+            return
+        super().do_GET()
+
+    def copyfile(self, source, outputfile):
+        chunk_size = 64 * 1024
+        media = self.server.media
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            if media.bandwidth_bytes_per_s:
+                time.sleep(len(chunk) / media.bandwidth_bytes_per_s)
+            outputfile.write(chunk)
+            media.record_bytes(len(chunk))
+
+    def log_message(self, *args):
+        pass
+
+
+class _MediaHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, media: "MediaServer"):
+        self.media = media
+        super().__init__(server_address, _MediaRequestHandler)
+
+
+class MediaServer:
+    """Serves `assets/` under /assets/ and generated fixtures under /generated/.
+
+    Args:
+        public_host: the host name Marqo uses to reach this server. Defaults to MARQO_API_TESTS_MEDIA_HOST or
+            host.docker.internal
+        port: the port to listen on. 0 picks a free port
+        latency_s: delay added before every response
+        bandwidth_bytes_per_s: cap on the rate response bodies are written at. None for no cap
+        error_rate: fraction of requests answered with error_status instead of the file
+        error_status: HTTP status of injected errors
+        seed: seed for the error injection
+    """
+
+    def __init__(self, public_host: Optional[str] = None, port: int = 0, latency_s: float = 0.0,
+                 bandwidth_bytes_per_s: Optional[float] = None, error_rate: float = 0.0, error_status: int = 503,
+                 seed: Optional[int] = None):
+        self.public_host = public_host or os.environ.get(MEDIA_HOST_ENV_VAR, "host.docker.internal")
+        self.port = port
+        self.latency_s = latency_s
+        self.bandwidth_bytes_per_s = bandwidth_bytes_per_s
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.generated_dir = tempfile.mkdtemp(prefix="marqo_api_tests_media_")
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._server: Optional[_MediaHTTPServer] = None
+
+    def start(self) -> "MediaServer":
+        write_tone_mp3(os.path.join(self.generated_dir, "tone.mp3"))
+        write_test_video(os.path.join(self.generated_dir, "video.mp4"))
+        self._server = _MediaHTTPServer(("0.0.0.0", self.port), self)
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        shutil.rmtree(self.generated_dir, ignore_errors=True)
+
+    def url(self, path: str) -> str:
+        """Returns the URL Marqo can fetch a served path, e.g. `assets/ai_hippo_statue.png`, from."""
+        return f"http://{self.public_host}:{self.port}/{path.lstrip('/')}"
+
+    def local_path(self, path: str) -> Optional[str]:
+        if path.startswith("assets/"):
+            return os.path.join(ASSETS_DIR, path[len("assets/"):])
+        if path.startswith("generated/"):
+            return os.path.join(self.generated_dir, path[len("generated/"):])
+        return None
+
+    def rewrite(self, url: str) -> str:
+        """Returns the local URL for a remote media URL used by the tests, or url unchanged if there is no local
+        copy of it."""
+        path = LOCAL_COPIES.get(url)
+        if path is None and url.startswith(RAW_GITHUB_ASSETS_PREFIX):
+            path = "assets/" + url[len(RAW_GITHUB_ASSETS_PREFIX):]
+        if path is None or not os.path.isfile(self.local_path(path)):
+            return url
+        return self.url(path)
+
+    def generate_image(self, width: int, height: int) -> str:
+        """Generates a noise PNG of the given size (noise does not compress, so the size on the wire is
+        predictable) and returns its URL."""
+        from PIL import Image
+
+        name = f"image_{width}x{height}.png"
+        file_path = os.path.join(self.generated_dir, name)
+        if not os.path.isfile(file_path):
+            Image.effect_noise((width, height), 64).convert("RGB").save(file_path)
+        return self.url(f"generated/{name}")
+
+    def record_request(self) -> None:
+        with self._stats_lock:
+            self.stats["requests"] = self.stats.get("requests", 0) + 1
+
+    def record_error(self) -> None:
+        with self._stats_lock:
+            self.stats["injected_errors"] = self.stats.get("injected_errors", 0) + 1
+
+    def record_bytes(self, num_bytes: int) -> None:
+        with self._stats_lock:
+            self.stats["bytes_sent"] = self.stats.get("bytes_sent", 0) + num_bytes
+
+    def reset_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            stats, self.stats = self.stats, {}
+        return stats
@@ -0,0 +1,140 @@
+"""Loads every model the collected tests use before the first test runs.
+
+The first test of each class otherwise pays for loading its index's model, which can take many seconds for CLIP
+models and makes the timing of that test meaningless. The models are found by statically scanning the test modules
+for the index settings passed to `create_indexes` and `lease_indexes`, so nothing has to be kept in sync by hand.
+
+Enable it by setting the MARQO_API_TESTS_PREWARM_MODELS environment variable (see conftest.py). Each distinct
+model is loaded once with a cheap `embed` call on an index leased from the shared index pool, one model at a
+time as Marqo rejects requests that try to update its model cache while another one is, and the load time per
+model is reported at the start of the session. Marqo only loads the model of
+the index an embed call is made on, so each model needs an index of its own. Where a test leases an index with
+the model using literal settings, the same settings are leased, so the test later reuses that index instead of
+the pool creating one just for pre-warming.
+"""
+import ast
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from marqo import Client
+
+from tests.marqo_test import MarqoTestCase, ModelManager
+
+PREWARM_ENV_VAR = "MARQO_API_TESTS_PREWARM_MODELS"
+
+_INDEX_CREATING_CALLS = {"create_indexes", "lease_indexes"}
+# Models that cannot be loaded from their name alone
+_NOT_LOADABLE = {"no_model"}
+
+
+def _constant_items(node: ast.Dict) -> Dict[str, Optional[object]]:
+    """Returns the string keys of a dict literal, with their value if it is a constant and None otherwise."""
+    items = {}
+    for key, value in zip(node.keys, node.values):
+        if isinstance(key, ast.Constant) and isinstance(key.value, str):
+            items[key.value] = value.value if isinstance(value, ast.Constant) else None
+    return items
+
+
+def _index_settings_with_models(source: str) -> Iterator[Tuple[str, ast.Dict, str]]:
+    """Yields the name of the call, the dict literal and the model of the index settings passed to
+    create_indexes/lease_indexes.
+
+    Index settings without a `model` use Marqo's default model. Models whose name is not a literal, custom models
+    (with `modelProperties`) and `no_model` are skipped.
+    """
+    for call in ast.walk(ast.parse(source)):
+        if not isinstance(call, ast.Call):
+            continue
+        function_name = getattr(call.func, "attr", getattr(call.func, "id", None))
+        if function_name not in _INDEX_CREATING_CALLS:
+            continue
+        for node in (node for arg in call.args for node in ast.walk(arg)):
+            if not isinstance(node, ast.Dict):
+                continue
+            items = _constant_items(node)
+            # Field definitions in allFields also have a `type`, index settings have an index type or name
+            if items.get("type") not in ("structured", "unstructured") and "indexName" not in items:
+                continue
+            if "modelProperties" in items:
+                continue
+            model = items.get("model", ModelManager.DEFAULT_MODEL)
+            if isinstance(model, str) and model not in _NOT_LOADABLE:
+                yield function_name, node, model
+
+
+def models_in_source(source: str) -> Set[str]:
+    """Returns the models of the index settings dict literals passed to create_indexes/lease_indexes."""
+    return {model for _, _, model in _index_settings_with_models(source)}
+
+
+def leased_settings_in_source(source: str) -> Dict[str, Dict]:
+    """Returns model -> the first index settings passed to lease_indexes with that model that are entirely
+    literal, i.e. that the pool can hand out again to the test."""
+    leased_settings = {}
+    for function_name, node, model in _index_settings_with_models(source):
+        if function_name != "lease_indexes" or model in leased_settings:
+            continue
+        try:
+            leased_settings[model] = ast.literal_eval(node)
+        except ValueError:
+            # Some of the settings are only known at run time
+            continue
+    return leased_settings
+
+
+def models_in_files(paths: Iterable[str]) -> Set[str]:
+    models = set()
+    for path in set(paths):
+        with open(path) as f:
+            models.update(models_in_source(f.read()))
+    return models
+
+
+def leased_settings_in_files(paths: Iterable[str]) -> Dict[str, Dict]:
+    leased_settings = {}
+    for path in sorted(set(paths)):
+        with open(path) as f:
+            for model, index_settings in leased_settings_in_source(f.read()).items():
+                leased_settings.setdefault(model, index_settings)
+    return leased_settings
+
+
+def prewarm_models(models: Iterable[str], leased_settings: Optional[Dict[str, Dict]] = None,
+                   holder: str = "model_prewarm") -> Dict[str, Dict]:
+    """Loads the given models one at a time, each with one embed call on an index leased from the shared pool.
+
+    Marqo only lets one request update its model cache at a time and rejects the others, so loading the models
+    concurrently would leave all but one of them cold.
+
+    Args:
+        models: the models to load
+        leased_settings: model -> index settings a test leases, see leased_settings_in_source. Models without
+            any are loaded on a minimal unstructured index
+
+    Returns:
+        model -> {"load_s": seconds the embed call took, "error": None or why the model could not be loaded}
+    """
+    models = sorted(models)
+    if not models:
+        return {}
+    leased_settings = leased_settings or {}
+    client = Client(url=MarqoTestCase._MARQO_URL)
+    index_names = MarqoTestCase.index_pool.lease(holder, [
+        leased_settings.get(model, {"type": "unstructured", "model": model}) for model in models
+    ])
+
+    load_times = {}
+    try:
+        for model, index_name in zip(models, index_names):
+            start = time.perf_counter()
+            try:
+                client.index(index_name).embed(content="warm up")
+                error = None
+            except Exception as e:
+                error = str(e)
+            load_times[model] = {"load_s": time.perf_counter() - start, "error": error}
+        return load_times
+    finally:
+        # embed does not write documents, so the indexes can go straight back to the pool
+        MarqoTestCase.index_pool.release(holder)
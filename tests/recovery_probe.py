@@ -0,0 +1,142 @@
+"""Measures how long Marqo takes to recover after its container is stopped with a signal and started again.
+
+Used by tests/application_tests/test_start_stop.py to check that Marqo recovers with its data intact, and by
+benchmarks.recovery to report recovery times. Instead of sleeping a fixed 10s between checks, the probe polls with
+a backoff that starts small, grows while Marqo is down and starts small again once Marqo answers, so the reported
+times are precise to the current poll interval (recorded with every timing).
+"""
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+from marqo.errors import BackendCommunicationError, MarqoWebError
+
+SIGNALS = ("SIGTERM", "SIGINT", "SIGKILL")
+
+
+def is_container_stopped(container_name: str) -> bool:
+    result = subprocess.run(["docker", "inspect", "-f", "{{.State.Status}}", container_name], capture_output=True,
+                            text=True)
+    return result.stdout.strip() == "exited"
+
+
+def stop_container(container_name: str, sig: str) -> None:
+    """Stops the container with a signal. SIGTERM is what `docker stop` sends, SIGINT what ctrl + C sends."""
+    if sig == "SIGTERM":
+        command = ["docker", "stop", container_name]
+    elif sig == "SIGINT":
+        command = ["docker", "kill", "--signal=SIGINT", container_name]
+    elif sig == "SIGKILL":
+        command = ["docker", "kill", container_name]
+    else:
+        raise ValueError(f"bad option used for sig: {sig}. Must be one of {SIGNALS}")
+    result = subprocess.run(command, check=True, capture_output=True)
+    assert container_name in str(result.stdout)
+
+
+def is_recovering_error(error: Exception) -> bool:
+    """Whether a search error is expected while Marqo restarts (most of the time a 500, sometimes a 429)."""
+    if "exceeds your S2Search free tier limit" in str(error):
+        return False
+    if isinstance(error, (BackendCommunicationError, requests.exceptions.RequestException)):
+        return True
+    return isinstance(error, MarqoWebError) and error.status_code in (429, 500)
+
+
+class RecoveryProbe:
+    """Stops the container, starts it again and times the recovery.
+
+    Args:
+        client: a Marqo client pointing at the container
+        url: the URL of Marqo in the container
+        index_name: index searched with query once Marqo is back
+        query: the search query
+        expected_hits: the hits the search must return once Marqo has recovered; None accepts any successful search
+        container_name: the docker container Marqo runs in
+        timeout_s: how long to wait for each of stopping and recovering
+        initial_interval_s, max_interval_s, multiplier: the polling backoff
+    """
+
+    def __init__(self, client, url: str, index_name: str, query: str, expected_hits: Optional[List[Dict]] = None,
+                 container_name: str = "marqo", timeout_s: float = 400, initial_interval_s: float = 0.05,
+                 max_interval_s: float = 1.0, multiplier: float = 1.5):
+        self.client = client
+        self.url = url
+        self.index_name = index_name
+        self.query = query
+        self.expected_hits = expected_hits
+        self.container_name = container_name
+        self.timeout_s = timeout_s
+        self.initial_interval_s = initial_interval_s
+        self.max_interval_s = max_interval_s
+        self.multiplier = multiplier
+
+    def _poll(self, check: Callable[[], bool], start: float, description: str) -> float:
+        """Calls check with backoff until it returns True. Returns the interval slept before the last poll, 0 if the
+        first poll succeeded."""
+        interval, last_interval = self.initial_interval_s, 0.0
+        while not check():
+            if time.perf_counter() - start > self.timeout_s:
+                raise TimeoutError(f"Timeout waiting for {description} after {self.timeout_s}s")
+            time.sleep(interval)
+            last_interval = interval
+            interval = min(self.max_interval_s, interval * self.multiplier)
+        return last_interval
+
+    def _is_listening(self) -> bool:
+        try:
+            return requests.get(self.url, timeout=1).ok
+        except requests.exceptions.RequestException:
+            return False
+
+    def _search(self) -> Optional[Dict]:
+        try:
+            return self.client.index(self.index_name).search(q=self.query)
+        except Exception as e:
+            if not is_recovering_error(e):
+                raise
+            return None
+
+    def run(self, sig: str) -> Dict[str, float]:
+        """Stops the container with sig, checks Marqo is unreachable, starts the container and waits until the
+        search returns expected_hits.
+
+        Returns:
+            seconds until the container exited (stop_s) and, from `docker start`, until Marqo answered HTTP
+            (time_to_ready_s), the first search succeeded (time_to_first_search_s) and the first search returned
+            the expected hits (time_to_first_correct_search_s), with the poll interval each was measured at
+        """
+        timings = {}
+        start = time.perf_counter()
+        stop_container(self.container_name, sig)
+        self._poll(lambda: is_container_stopped(self.container_name), start,
+                   f"container {self.container_name} to stop")
+        timings["stop_s"] = time.perf_counter() - start
+
+        try:
+            self.client.index(self.index_name).search(q=self.query)
+            raise AssertionError("Marqo is still accessible despite docker stopping!")
+        except BackendCommunicationError:
+            pass
+
+        start = time.perf_counter()
+        start_result = subprocess.run(["docker", "start", self.container_name], check=True, capture_output=True)
+        assert self.container_name in str(start_result.stdout)
+
+        timings["ready_poll_interval_s"] = self._poll(self._is_listening, start, "Marqo to answer HTTP")
+        timings["time_to_ready_s"] = time.perf_counter() - start
+
+        first_search = {}
+
+        def search_is_correct() -> bool:
+            result = self._search()
+            if result is None:
+                return False
+            first_search.setdefault("time_to_first_search_s", time.perf_counter() - start)
+            return self.expected_hits is None or result["hits"] == self.expected_hits
+
+        timings["search_poll_interval_s"] = self._poll(search_is_correct, start, "Marqo to restart")
+        timings["time_to_first_correct_search_s"] = time.perf_counter() - start
+        timings.update(first_search)
+        return timings
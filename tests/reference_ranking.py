@@ -0,0 +1,163 @@
+"""Vectorised reference implementation of Marqo's score modifiers and reciprocal rank fusion (RRF).
+
+Given the raw scores of a search and the documents they belong to, computes the scores and orderings Marqo
+should return, for thousands of documents at once, so ranking correctness can be checked on production-sized
+result sets instead of with per-document assertions:
+
+    expected = apply_score_modifiers(raw_scores, documents, score_modifiers)
+    mismatches = ranking_mismatches(hit_ids, hit_scores, doc_ids, expected, expected, limit=limit)
+
+Semantics, as pinned down by test_dict_score_modifiers.py and test_hybrid_search.py:
+- score modifiers: score * prod(value * weight over multiply_score_by fields) + sum(value * weight over
+  add_to_score fields). Fields, or keys of map fields (`field.key`), a document does not have are skipped.
+- RRF: alpha / (k + tensor rank) + (1 - alpha) / (k + lexical rank), with 1-based ranks and a document
+  contributing nothing for a list it is not in. A list with a weight of 0 (alpha 0 or 1) is left out entirely.
+  Documents with tied scores can be returned in any order, so RRF scores are computed as a range, from the best
+  to the worst rank of each tie.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_ALPHA = 0.5
+DEFAULT_RRF_K = 60
+
+
+def field_values(documents: Sequence[Dict], field_name: str) -> np.ndarray:
+    """Returns the value of field_name for every document as floats, NaN where the document does not have it.
+
+    A field name of the form `field.key` reads `key` of map field `field` if there is no field called
+    `field.key` itself.
+    """
+    map_field, _, key = field_name.partition(".")
+    values = np.full(len(documents), np.nan)
+    for i, doc in enumerate(documents):
+        value = doc.get(field_name)
+        if value is None and key and isinstance(doc.get(map_field), dict):
+            value = doc[map_field].get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[i] = value
+    return values
+
+
+def apply_score_modifiers(scores: Sequence[float], documents: Sequence[Dict],
+                          score_modifiers: Optional[Dict[str, List[Dict]]]) -> np.ndarray:
+    """Returns the scores Marqo computes from the raw scores of documents with score_modifiers applied.
+
+    Args:
+        scores: the raw score of every document, in the same order as documents
+        documents: the indexed documents
+        score_modifiers: as passed to search, e.g. {"multiply_score_by": [{"field_name": "boost", "weight": 2}],
+            "add_to_score": [{"field_name": "ratings.stars", "weight": 0.1}]}
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    score_modifiers = score_modifiers or {}
+    multiplier = np.ones(len(documents))
+    for modifier in score_modifiers.get("multiply_score_by", []):
+        weighted = field_values(documents, modifier["field_name"]) * modifier.get("weight", 1)
+        multiplier *= np.where(np.isnan(weighted), 1.0, weighted)
+    addend = np.zeros(len(documents))
+    for modifier in score_modifiers.get("add_to_score", []):
+        weighted = field_values(documents, modifier["field_name"]) * modifier.get("weight", 1)
+        addend += np.where(np.isnan(weighted), 0.0, weighted)
+    return scores * multiplier + addend
+
+
+def tie_rank_bounds(scores: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the best and worst 1-based rank each score can have, for scores in descending order.
+
+    Scores that are equal share the ranks of their tie, e.g. [3, 2, 2, 1] -> ([1, 2, 2, 4], [1, 3, 3, 4]).
+    """
+    negated = -np.asarray(scores, dtype=np.float64)
+    return (np.searchsorted(negated, negated, side="left") + 1,
+            np.searchsorted(negated, negated, side="right"))
+
+
+def reciprocal_rank_fusion(tensor_ids: Sequence[str], tensor_scores: Sequence[float],
+                           lexical_ids: Sequence[str], lexical_scores: Sequence[float],
+                           alpha: float = DEFAULT_ALPHA, k: int = DEFAULT_RRF_K
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fuses a tensor and a lexical ranking the way hybrid search with rankingMethod rrf does.
+
+    Args:
+        tensor_ids, tensor_scores: the hits of the tensor retrieval, in descending score order
+        lexical_ids, lexical_scores: the hits of the lexical retrieval, in descending score order
+
+    Returns:
+        the ids of the fused documents, and the lowest and highest RRF score each can have given ties in its
+        rankings, ordered by descending highest score
+    """
+    ranked_lists = [(weight, np.asarray(ids, dtype=object), scores)
+                    for weight, ids, scores in ((alpha, tensor_ids, tensor_scores),
+                                                (1 - alpha, lexical_ids, lexical_scores))
+                    if weight > 0 and len(ids)]
+    if not ranked_lists:
+        return np.array([], dtype=object), np.array([]), np.array([])
+    fused_ids, inverse = np.unique(np.concatenate([ids for _, ids, _ in ranked_lists]), return_inverse=True)
+    lower, upper = np.zeros(len(fused_ids)), np.zeros(len(fused_ids))
+    offset = 0
+    for weight, ids, scores in ranked_lists:
+        best_rank, worst_rank = tie_rank_bounds(scores)
+        positions = inverse[offset:offset + len(ids)]
+        np.add.at(upper, positions, weight / (k + best_rank))
+        np.add.at(lower, positions, weight / (k + worst_rank))
+        offset += len(ids)
+    order = np.argsort(-upper, kind="stable")
+    return fused_ids[order], lower[order], upper[order]
+
+
+def ranking_mismatches(hit_ids: Sequence[str], hit_scores: Sequence[float], expected_ids: Sequence[str],
+                       expected_lower: Sequence[float], expected_upper: Sequence[float], limit: int,
+                       considered_ids: Optional[Sequence[str]] = None, rtol: float = 1e-4,
+                       atol: float = 1e-6) -> List[str]:
+    """Compares the hits Marqo returned against the expected scores of every candidate document.
+
+    Checks that every hit is a candidate with a score within its expected range, that the hits are in descending
+    score order, and that no considered candidate left out of a full page of hits (or any considered candidate,
+    for a page with fewer than limit hits) is expected to score higher than the last hit. Ties may be returned in
+    any order.
+
+    Args:
+        considered_ids: the candidates the search is guaranteed to rank, all of expected_ids by default. Tensor
+            search only ranks the documents its approximate nearest neighbour retrieval finds, so pass the ids of
+            the same search without score modifiers there
+
+    Returns:
+        a description of every mismatch, empty if the hits are correct
+    """
+    hit_ids = np.asarray(hit_ids, dtype=object)
+    hit_scores = np.asarray(hit_scores, dtype=np.float64)
+    expected_ids = np.asarray(expected_ids, dtype=object)
+    expected_lower = np.asarray(expected_lower, dtype=np.float64)
+    expected_upper = np.asarray(expected_upper, dtype=np.float64)
+    mismatches = []
+
+    position = {doc_id: i for i, doc_id in enumerate(expected_ids)}
+    candidate = np.array([doc_id in position for doc_id in hit_ids], dtype=bool)
+    mismatches += [f"hit {rank} ({doc_id}) is not a candidate" for rank, doc_id in enumerate(hit_ids)
+                   if not candidate[rank]]
+    indices = np.array([position[doc_id] for doc_id in hit_ids[candidate]], dtype=int)
+    lower, upper = expected_lower[indices], expected_upper[indices]
+    tolerance = atol + rtol * np.abs(hit_scores[candidate])
+    wrong = (hit_scores[candidate] < lower - tolerance) | (hit_scores[candidate] > upper + tolerance)
+    for rank, doc_id, score, low, high in zip(np.flatnonzero(candidate)[wrong], hit_ids[candidate][wrong],
+                                              hit_scores[candidate][wrong], lower[wrong], upper[wrong]):
+        expected = f"{low}" if low == high else f"between {low} and {high}"
+        mismatches.append(f"hit {rank} ({doc_id}) scored {score}, expected {expected}")
+
+    increases = np.flatnonzero(np.diff(hit_scores) > atol + rtol * np.abs(hit_scores[1:]))
+    mismatches += [f"hit {rank + 1} ({hit_ids[rank + 1]}) scored {hit_scores[rank + 1]}, more than hit {rank} "
+                   f"({hit_scores[rank]})" for rank in increases]
+
+    left_out = ~np.isin(expected_ids, hit_ids)
+    if considered_ids is not None:
+        left_out &= np.isin(expected_ids, np.asarray(considered_ids, dtype=object))
+    if len(hit_ids) < limit:
+        mismatches += [f"candidate {doc_id} is missing from a page of {len(hit_ids)} hits"
+                       for doc_id in expected_ids[left_out]]
+    elif len(hit_ids):
+        last_score = hit_scores[-1]
+        outranking = left_out & (expected_lower > last_score + atol + rtol * abs(last_score))
+        mismatches += [f"candidate {doc_id} is expected to score at least {low}, more than the last hit "
+                       f"({last_score})" for doc_id, low in zip(expected_ids[outranking], expected_lower[outranking])]
+    return mismatches
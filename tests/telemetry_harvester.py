@@ -0,0 +1,123 @@
+"""A pytest plugin that runs every Marqo client call with server telemetry enabled and aggregates it.
+
+Enable it by pointing the MARQO_API_TESTS_TELEMETRY_REPORT environment variable at a JSON file, e.g.:
+
+    MARQO_API_TESTS_TELEMETRY_REPORT=telemetry_report.json pytest tests/api_tests
+
+Every request sent through `marqo._httprequests.HttpRequests` gets `telemetry=True` appended. The `telemetry`
+object is removed from the response before it is returned to the test, so assertions are unaffected, unless the
+client was created with `return_telemetry=True`, in which case the test asked for it and it is left in place.
+
+For each endpoint the report contains the client-side wall time, the server time, the overhead (wall time minus
+server time, i.e. network, serialisation and client processing) and the per-phase `timesMs` breakdown.
+Telemetry phases can be nested (e.g. `a.b` and `a.b.c`), so the server time is the sum of the phases that are
+not nested under another reported phase. Compare reports from two images phase by phase to find regressions.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List
+
+import pytest
+from marqo._httprequests import HttpRequests
+
+from tests import utilities
+from tests.http_recorder import CurrentTestClassTracker, path_template
+
+TELEMETRY_REPORT_ENV_VAR = "MARQO_API_TESTS_TELEMETRY_REPORT"
+
+
+def server_time_ms(times_ms: Dict[str, float]) -> float:
+    """Sums the telemetry phases that are not nested under another phase in times_ms."""
+    return sum(
+        duration for phase, duration in times_ms.items()
+        if not any(phase.startswith(other + ".") for other in times_ms if other != phase)
+    )
+
+
+class TelemetryHarvester(CurrentTestClassTracker):
+    """Wraps `HttpRequests` for the lifetime of the session and records the telemetry of every response."""
+
+    def __init__(self, report_path: str):
+        self.report_path = report_path
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._originals = {}
+
+    def install(self) -> None:
+        original_construct_path = HttpRequests._construct_path
+        original_send_request = HttpRequests.send_request
+        harvester = self
+
+        def construct_path_with_telemetry(http_requests, path, index_name=""):
+            url = original_construct_path(http_requests, path, index_name)
+            if http_requests.config.use_telemetry:
+                return url
+            return url + ("&" if "?" in url else "?") + "telemetry=True"
+
+        def harvesting_send_request(http_requests, http_operation, path, *args, **kwargs):
+            start = time.perf_counter()
+            result = original_send_request(http_requests, http_operation, path, *args, **kwargs)
+            wall_time = time.perf_counter() - start
+            if isinstance(result, dict) and "telemetry" in result:
+                telemetry = result["telemetry"] if http_requests.config.use_telemetry else result.pop("telemetry")
+                harvester.record(http_operation, path, wall_time, telemetry)
+            return result
+
+        self._originals = {"_construct_path": original_construct_path, "send_request": original_send_request}
+        HttpRequests._construct_path = construct_path_with_telemetry
+        HttpRequests.send_request = harvesting_send_request
+
+    def uninstall(self) -> None:
+        for name, original in self._originals.items():
+            setattr(HttpRequests, name, original)
+        self._originals = {}
+
+    def record(self, http_operation: str, path: str, wall_time: float, telemetry: Dict) -> None:
+        times_ms = telemetry.get("timesMs", {}) if isinstance(telemetry, dict) else {}
+        entry = {
+            "endpoint": f"{http_operation.upper()} {path_template(path)}",
+            "test_class": self.current_class,
+            "wall_time": wall_time,
+            "server_time": server_time_ms(times_ms) / 1000,
+            "times_ms": times_ms,
+        }
+        with self._lock:
+            self.records.append(entry)
+
+    def summary(self) -> Dict:
+        by_endpoint: Dict[str, List[Dict]] = {}
+        for entry in self.records:
+            by_endpoint.setdefault(entry["endpoint"], []).append(entry)
+
+        endpoints = {}
+        for endpoint, entries in sorted(by_endpoint.items()):
+            phases: Dict[str, List[float]] = {}
+            for entry in entries:
+                for phase, duration in entry["times_ms"].items():
+                    phases.setdefault(phase, []).append(duration / 1000)
+            endpoints[endpoint] = {
+                "wall_time": utilities.summarise_latencies([entry["wall_time"] for entry in entries]),
+                "server_time": utilities.summarise_latencies([entry["server_time"] for entry in entries]),
+                "overhead": utilities.summarise_latencies(
+                    [entry["wall_time"] - entry["server_time"] for entry in entries]),
+                "phases": {phase: utilities.summarise_latencies(durations)
+                           for phase, durations in sorted(phases.items())},
+            }
+        return {
+            "marqo_image_name": os.environ.get("MARQO_IMAGE_NAME"),
+            "testing_configuration": os.environ.get("TESTING_CONFIGURATION"),
+            "by_endpoint": endpoints,
+        }
+
+    def write_report(self) -> str:
+        with open(self.report_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return self.report_path
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.uninstall()
+        if self.records:
+            print(f"\nTelemetry report written to {self.write_report()}")
@@ -3,54 +3,92 @@ import subprocess
 import time
 import typing
 
+import pytest
+
+from tests import container_pool
+
 
 def disallow_environments(disallowed_configurations: typing.List[str]):
-    """This construct wraps a test to ensure that it does not run for disallowed 
+    """This construct marks a test (method or class) to ensure that it does not run for disallowed
     testing environments.
 
-    It figures by examining the "TESTING_CONFIGURATION" environment variable.
+    It figures by examining the "TESTING_CONFIGURATION" environment variable. The marker is evaluated in
+    conftest.pytest_collection_modifyitems, so the test is reported as skipped, and a class whose tests are all
+    skipped never runs setUpClass (and so never creates its indexes or loads its models).
 
     Args:
         disallowed_configurations: if the environment variable
         "TESTING_CONFIGURATION" matches a configuration in
         disallowed_configurations, then the test will be skipped
     """
-    def decorator(function):
-        def wrapper(*args, **kwargs):
-            if os.environ["TESTING_CONFIGURATION"] in disallowed_configurations:
-                return
-            else:
-                result = function(*args, **kwargs)
-                return result
-        return wrapper
-    return decorator
+    return pytest.mark.disallow_environments(list(disallowed_configurations))
 
 
 def allow_environments(allowed_configurations: typing.List[str]):
-    def decorator(function):
-        def wrapper(*args, **kwargs):
-            if os.environ["TESTING_CONFIGURATION"] not in allowed_configurations:
-                return
-            else:
-                result = function(*args, **kwargs)
-                return result
-        return wrapper
-    return decorator
+    """The opposite of disallow_environments: the test is skipped unless "TESTING_CONFIGURATION" matches a
+    configuration in allowed_configurations."""
+    return pytest.mark.allow_environments(list(allowed_configurations))
 
 
 def classwide_decorate(decorator, allowed_configurations):
+    """Applies disallow_environments/allow_environments to every test of a class.
+
+    Markers on a class already apply to all of its tests, so this is the same as decorating the class directly."""
     def decorate(cls):
-        for method in dir(cls):
-            if method.startswith("test"):
-                setattr(cls, method, (decorator(allowed_configurations))(getattr(cls, method)))
-        return cls
+        return decorator(allowed_configurations)(cls)
     return decorate
 
 
-def rerun_marqo_with_env_vars(env_vars: list = [], calling_class: str = ""):
+def environment_skip_reason(item, testing_configuration: str) -> typing.Optional[str]:
+    """Returns why a collected test must be skipped in testing_configuration, or None if it can run."""
+    for marker in item.iter_markers("disallow_environments"):
+        if testing_configuration in marker.args[0]:
+            return f"not run with TESTING_CONFIGURATION={testing_configuration}"
+    for marker in item.iter_markers("allow_environments"):
+        if testing_configuration not in marker.args[0]:
+            return f"only run with TESTING_CONFIGURATION in {marker.args[0]}"
+    return None
+
+
+START_SCRIPTS = {
+    "CPU_LOCAL_MARQO": "start_local_marqo.sh",
+    "CPU_DOCKER_MARQO": "start_docker_marqo.sh",
+    "CUDA_DOCKER_MARQO": "start_cuda_docker_marqo.sh",
+}
+_marqo_containers: typing.Optional[container_pool.MarqoContainerPool] = None
+
+
+def get_marqo_containers() -> container_pool.MarqoContainerPool:
+    """The pool of Marqo containers started with the start script appropriate for the current test config."""
+    global _marqo_containers
+    if _marqo_containers is None:
+        test_config = os.environ["TESTING_CONFIGURATION"]
+        if test_config not in START_SCRIPTS:
+            raise RuntimeError(f"Invalid testing configuration: {test_config}. "
+                               f"Must be one of {tuple(START_SCRIPTS)} to run the application tests."
+                               f"If you are using a 'CUSTOM', please only run the tests under 'tests/api_tests'")
+        # Pooled containers share the Vespa started for the default container, and with it its indexes
+        shares_vespa = test_config == "CPU_LOCAL_MARQO"
+        default_max_containers = container_pool.DEFAULT_MAX_CONTAINERS if shares_vespa \
+            else container_pool.DEFAULT_MAX_DOCKER_CONTAINERS
+        _marqo_containers = container_pool.MarqoContainerPool(
+            start_script=f"{os.environ['MARQO_API_TESTS_ROOT']}/scripts/{START_SCRIPTS[test_config]}",
+            image_name=os.environ['MARQO_IMAGE_NAME'],
+            max_containers=int(os.environ.get(container_pool.MAX_CONTAINERS_ENV_VAR, default_max_containers)),
+            script_env={"MARQO_REUSE_VESPA": "true"} if shares_vespa else None,
+            shares_vespa=shares_vespa,
+        )
+    return _marqo_containers
+
+
+def rerun_marqo_with_env_vars(env_vars: list = [], calling_class: str = "") -> str:
     """
-        Given a list of env vars / flags, stop and rerun Marqo using the start script appropriate
-        for the current test config
+        Given a list of env vars / flags, return the URL of a Marqo started with them, using the start script
+        appropriate for the current test config. Point the test class at it with `use_marqo_at`.
+
+        The default `marqo` container is left running. Each configuration runs in its own container from
+        tests/container_pool.py, which is reused if the same configuration is asked for again, so only new
+        configurations pay for a Marqo start.
 
         Ensure that:
         1. Flags are separate items from variable itself (eg, ['-e', 'MARQO_MODELS_TO_PRELOAD=["hf/all_datasets_v4_MiniLM-L6"]'])
@@ -62,51 +100,23 @@ def rerun_marqo_with_env_vars(env_vars: list = [], calling_class: str = ""):
         raise RuntimeError(
             f"Rerun Marqo function should only be called by `TestEnvVarChanges` to ensure other API tests are not affected. Given calling class is {calling_class}")
 
-    # Stop Marqo
-    print("Attempting to stop marqo.")
-    subprocess.run(["docker", "stop", "marqo"], check=True, capture_output=True)
-    print("Marqo stopped.")
+    return get_marqo_containers().acquire(env_vars)
 
-    # Rerun the appropriate start script
-    test_config = os.environ["TESTING_CONFIGURATION"]
 
-    if test_config == "CPU_LOCAL_MARQO":
-        start_script_name = "start_local_marqo.sh"
-    elif test_config == "CPU_DOCKER_MARQO":
-        start_script_name = "start_docker_marqo.sh"
-    elif test_config == "CUDA_DOCKER_MARQO":
-        start_script_name = "start_cuda_docker_marqo.sh"
-    else:
-        raise RuntimeError(f"Invalid testing configuration: {test_config}. "
-                           f"Must be one of ('CPU_LOCAL_MARQO', 'CPU_DOCKER_MARQO', "
-                           f"'CUDA_DOCKER_MARQO') to run the application tests."
-                           f"If you are using a 'CUSTOM', please only run the tests under 'tests/api_tests'")
-    full_script_path = f"{os.environ['MARQO_API_TESTS_ROOT']}/scripts/{start_script_name}"
-
-    run_process = subprocess.Popen(
-        [
-            "bash",  # command: run
-            full_script_path,  # script to run
-            os.environ['MARQO_IMAGE_NAME'],  # arg $1 in script
-        ] + env_vars,  # args $2 onwards
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        universal_newlines=True
-    )
-
-    # Read and print the output line by line (in real time)
-    for line in run_process.stdout:
-        print(line, end='')
-
-    # Wait for the process to complete
-    run_process.wait()
-    return True
+def remove_marqo_containers() -> None:
+    """Removes the containers started by rerun_marqo_with_env_vars in this session, if any, and the indexes
+    created with them."""
+    if _marqo_containers is not None:
+        try:
+            _marqo_containers.release()
+        finally:
+            container_pool.remove_pooled_containers()
 
 
-def rerun_marqo_with_default_config(calling_class: str = ""):
+def rerun_marqo_with_default_config(calling_class: str = "") -> str:
     # Do not send any env vars
-    # This should act like running the start script at the beginning
-    rerun_marqo_with_env_vars(env_vars=[], calling_class=calling_class)
+    # This returns the URL of the Marqo started at the beginning
+    return rerun_marqo_with_env_vars(env_vars=[], calling_class=calling_class)
 
 
 docker_log_failure_message = "Failed to fetch docker logs for Marqo"
@@ -206,4 +216,29 @@ def control_marqo_os(
             text=True
         )
     time.sleep(10)
-    print(command_output.stdout)
\ No newline at end of file
+    print(command_output.stdout)
+
+
+def percentile(values: typing.Sequence[float], q: float) -> float:
+    """Returns the q-th percentile (0 <= q <= 100) of values, linearly interpolating between closest ranks.
+
+    Returns NaN for an empty sequence.
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarise_latencies(latencies: typing.Sequence[float]) -> typing.Dict[str, float]:
+    """Summarises a sequence of latencies in seconds as count, mean and p50/p95/p99 in milliseconds."""
+    return {
+        "count": len(latencies),
+        "mean_ms": 1000 * sum(latencies) / len(latencies) if latencies else float("nan"),
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p95_ms": 1000 * percentile(latencies, 95),
+        "p99_ms": 1000 * percentile(latencies, 99),
+    }